@@ -1,4 +1,17 @@
+import functools
+import hashlib
+import itertools
 import logging
+import os
+import pickle
+import pkgutil
+import sys
+from importlib import resources
+from string import Template
+from collections.abc import MutableMapping
+from typing import Any, Iterator
+
+import Utils
 
 from .DataValidation import DataValidation, ValidationError
 from .Helpers import load_data_file as helpers_load_data_file
@@ -36,26 +49,340 @@ class ManualFile:
         return contents
 
 
-game_table = ManualFile('game.json', dict).load() #dict
-item_table = convert_to_list(ManualFile('items.json', list).load(), 'data') #list
-location_table = convert_to_list(ManualFile('locations.json', list).load(), 'data') #list
-region_table = ManualFile('regions.json', dict).load() #dict
-category_table = ManualFile('categories.json', dict).load() #dict
-option_table = ManualFile('options.json', dict).load() #dict
-meta_table = ManualFile('meta.json', dict).load() #dict
+######################
+# Location templates
+######################
+# A locations.json entry with a "template" key stands for one location per combination of its "for_each" values,
+# so generated location lists stay short on disk. Each for_each axis maps placeholder names to lists of values:
+# the lists of one axis are zipped together and the axes are combined in order, the first axis being the outermost loop.
+# Strings in the template use $name placeholders (string.Template) so they don't clash with the {Function()} requires syntax.
+# "when" entries add fields to the combinations matching all the values in their "if".
+# The templates are expanded as soon as locations.json is loaded rather than lazily, since the location ids and name
+# groups are class attributes of the world that Archipelago reads at import. The data snapshot keeps the expanded table.
+
+@functools.lru_cache(maxsize=None)
+def _get_location_template(value: str) -> Template:
+    return Template(value)
+
+def fill_location_template(value: Any, bindings: dict[str, Any]) -> Any:
+    if isinstance(value, str):
+        # interned since the same regions and categories are repeated across most of the generated locations
+        return sys.intern(_get_location_template(value).substitute(bindings) if "$" in value else value)
+    if isinstance(value, list):
+        return [fill_location_template(v, bindings) for v in value]
+    if isinstance(value, dict):
+        return {k: fill_location_template(v, bindings) for k, v in value.items()}
+    return value
+
+def expand_location_template(entry: dict) -> Iterator[dict]:
+    axes = []
+    for axis in entry.get("for_each", []):
+        if len({len(values) for values in axis.values()}) > 1:
+            raise ValueError(f"The for_each values of {', '.join(axis.keys())} in the location template {entry['template'].get('name')} must all have the same length.")
+        axes.append([dict(zip(axis.keys(), values)) for values in zip(*axis.values())])
+
+    for combination in itertools.product(*axes):
+        bindings = {}
+        for axis_bindings in combination:
+            bindings.update(axis_bindings)
+
+        location = fill_location_template(entry["template"], bindings)
+        for extra in entry.get("when", []):
+            if all(bindings.get(name) == value for name, value in extra.get("if", {}).items()):
+                location.update(fill_location_template(extra.get("add", {}), bindings))
+
+        yield location
+
+def expand_location_templates(location_table: list) -> list:
+    """Returns the location table with every template entry replaced by the locations it generates, in order."""
+    return [location for entry in location_table for location in (expand_location_template(entry) if "template" in entry else (entry,))]
+
+
+######################
+# Compact records
+######################
+# Every generator process keeps its own item_table and location_table, so their entries are stored as slotted records
+# instead of dicts: the usual properties live in fixed slots and anything else goes to a dict that only exists when needed.
+# Strings are interned and the lists of names (categories, place_item, ...) are stored as tuples shared between records,
+# so those can't be changed in place, assign a new list to the property instead.
+# Records still read and write like dicts (record["name"], record.get("category", []), "victory" in record, ...) for the hooks and the client.
+
+_shared_tuples: dict[tuple, tuple] = {}
+
+def _share_names(value: Any) -> Any:
+    if not isinstance(value, (list, tuple)):
+        return value
+
+    names = tuple(value)
+    try:
+        shared = _shared_tuples.get(names)
+    except TypeError: # unhashable, so not a list of names
+        return value
+
+    if shared is None:
+        if not all(isinstance(v, str) for v in names):
+            return value
+        shared = _shared_tuples[names] = tuple(sys.intern(v) for v in names)
+    return shared
+
+class ManualRecord(MutableMapping):
+    __slots__ = ("_extra",)
+    _fields: tuple[str, ...] = ()
+    _field_set: frozenset[str] = frozenset()
+    _name_list_fields: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls.__slots__
+        cls._field_set = frozenset(cls.__slots__)
+
+    def __init__(self, values: dict | None = None):
+        self._extra = None
+        if values:
+            for key, value in values.items():
+                self.__setitem__(key, value)
+
+    @classmethod
+    def from_compiled(cls, values: dict) -> "ManualRecord":
+        """Builds a record from an entry of compiled_data.py, whose strings and tuples are already shared constants of that module"""
+        record = cls.__new__(cls)
+        record._extra = None
+        for key, value in values.items():
+            if key in cls._field_set:
+                setattr(record, key, value)
+            else:
+                record.__setitem__(key, value)
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._field_set:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            elif key in self._name_list_fields:
+                value = _share_names(value)
+            elif key == "requires" and value == []:
+                value = ()
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._field_set:
+            try:
+                delattr(self, key)
+                return
+            except AttributeError:
+                pass
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+            return
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._fields:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._field_set:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ManualRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def to_dict(self) -> dict:
+        """A plain dict copy of the record, the tuples of names are turned back into lists."""
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in self.items()}
+
+class ManualItemRecord(ManualRecord):
+    __slots__ = ("name", "category", "count", "id", "progression", "progression_skip_balancing", "useful", "trap", "filler",
+                 "value", "early", "local", "local_early")
+    _name_list_fields = frozenset(("category",))
 
-# Removal of schemas in root of tables
-region_table.pop('$schema', '')
-category_table.pop('$schema', '')
+class ManualLocationRecord(ManualRecord):
+    __slots__ = ("victory", "name", "region", "category", "requires", "id", "place_item", "place_item_category",
+                 "dont_place_item", "dont_place_item_category", "hint_entrance", "prehint")
+    _name_list_fields = frozenset(("category", "place_item", "place_item_category", "dont_place_item", "dont_place_item_category"))
 
-# hooks
-game_table = after_load_game_file(game_table)
-item_table = after_load_item_file(item_table)
-location_table = after_load_location_file(location_table)
-region_table = after_load_region_file(region_table)
-category_table = after_load_category_file(category_table)
-option_table = after_load_option_file(option_table)
-meta_table = after_load_meta_file(meta_table)
+def manual_record_to_json(value: Any) -> Any:
+    """json.dump(s) default= for data that contains records."""
+    if isinstance(value, ManualRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+######################
+# Data snapshot
+######################
+# The tables below are the result of parsing every json file and running the hooks on them, which is the same every
+# time as long as the files and the code building the tables don't change. So after the first load they are pickled to the user's cache and reused.
+
+data_snapshot_files = ['game.json', 'items.json', 'locations.json', 'regions.json', 'categories.json', 'options.json', 'meta.json']
+data_snapshot_sources = ['Data.py', 'Helpers.py', 'Items.py', 'Locations.py'] # the code that parses the files and builds on the tables, on top of the hooks package
+data_snapshot_tables = ['game_table', 'item_table', 'location_table', 'region_table', 'category_table', 'option_table', 'meta_table']
+
+def get_hooks_sources() -> list[str]:
+    """Every module of the hooks package, hooks/Data.py can import any of them"""
+    try:
+        return sorted(f"hooks/{entry.name}" for entry in resources.files(__package__).joinpath("hooks").iterdir() if entry.name.endswith(".py"))
+    except (OSError, TypeError) as ex:
+        logging.debug(f"Manual: Could not list the hooks package, only hooks/Data.py is part of the data snapshot key. {type(ex).__name__}: {ex}")
+        return ['hooks/Data.py']
+
+def get_data_snapshot_key() -> str:
+    """Hash of everything the tables are built from: the data/*.json files, the source of the modules in data_snapshot_sources and the hooks package"""
+    hasher = hashlib.sha256(b"manual_data_snapshot")
+
+    for filename in [*["data/" + f for f in data_snapshot_files], *data_snapshot_sources, *get_hooks_sources()]:
+        try:
+            contents = pkgutil.get_data(__name__, filename)
+        except OSError:
+            contents = None
+
+        hasher.update(filename.encode())
+        hasher.update(contents if contents is not None else b"<missing>")
+
+    return hasher.hexdigest()
+
+def get_data_snapshot_path(key: str) -> str:
+    return Utils.cache_path("manual", "data_snapshots", f"{key}.pickle")
+
+def load_data_snapshot(key: str) -> dict | None:
+    try:
+        with open(get_data_snapshot_path(key), 'rb') as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as ex:
+        logging.debug(f"Manual: Could not load the data snapshot, the json files will be parsed instead. {type(ex).__name__}: {ex}")
+        return None
+
+    if not isinstance(snapshot, dict) or any(table not in snapshot for table in data_snapshot_tables):
+        return None
+
+    return snapshot
+
+def save_data_snapshot(key: str, tables: dict):
+    path = get_data_snapshot_path(key)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so other processes never load a partially written snapshot
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as ex:
+        logging.debug(f"Manual: Could not save the data snapshot. {type(ex).__name__}: {ex}")
+
+
+def load_data_tables() -> dict:
+    """Parses the data/*.json files and runs the hooks/Data.py hooks on them, returns the tables by their name in data_snapshot_tables"""
+    game_table = ManualFile('game.json', dict).load() #dict
+    item_table = convert_to_list(ManualFile('items.json', list).load(), 'data') #list
+    location_table = expand_location_templates(convert_to_list(ManualFile('locations.json', list).load(), 'data')) #list
+    region_table = ManualFile('regions.json', dict).load() #dict
+    category_table = ManualFile('categories.json', dict).load() #dict
+    option_table = ManualFile('options.json', dict).load() #dict
+    meta_table = ManualFile('meta.json', dict).load() #dict
+
+    # Removal of schemas in root of tables
+    region_table.pop('$schema', '')
+    category_table.pop('$schema', '')
+
+    # hooks
+    game_table = after_load_game_file(game_table)
+    item_table = after_load_item_file(item_table)
+    location_table = after_load_location_file(location_table)
+    region_table = after_load_region_file(region_table)
+    category_table = after_load_category_file(category_table)
+    option_table = after_load_option_file(option_table)
+    meta_table = after_load_meta_file(meta_table)
+
+    return {
+        'game_table': game_table,
+        'item_table': [ManualItemRecord(item) for item in item_table],
+        'location_table': [ManualLocationRecord(location) for location in location_table],
+        'region_table': region_table,
+        'category_table': category_table,
+        'option_table': option_table,
+        'meta_table': meta_table
+    }
+
+
+######################
+# Compiled data
+######################
+# DataCompiler.py can write the tables to compiled_data.py ahead of time, as constants Python loads without parsing any json.
+# When that module is there and was compiled from the current sources (the same key as the snapshot), it's used instead of
+# the snapshot and the json files. Items.py and Locations.py then add the ids and build their lookups as usual.
+
+try:
+    from . import compiled_data
+except ImportError:
+    compiled_data = None
+
+def load_tables(key: str) -> tuple[dict, bool]:
+    """Returns the tables from compiled_data.py, else the data snapshot, else the json files, and whether it came to parsing the json files"""
+    if compiled_data is not None:
+        if getattr(compiled_data, 'source_key', None) == key:
+            tables = {table: getattr(compiled_data, table) for table in data_snapshot_tables}
+            tables['item_table'] = [ManualItemRecord.from_compiled(item) for item in tables['item_table']]
+            tables['location_table'] = [ManualLocationRecord.from_compiled(location) for location in tables['location_table']]
+            return tables, False
+
+        logging.warning("Manual: compiled_data.py was compiled from different sources and is ignored. Run DataCompiler.py again to update it.")
+
+    snapshot = load_data_snapshot(key)
+    if snapshot is not None:
+        return snapshot, False
+
+    return load_data_tables(), True
+
+data_snapshot_key = get_data_snapshot_key()
+data_tables, data_tables_parsed = load_tables(data_snapshot_key)
+
+game_table = data_tables['game_table'] #dict
+item_table = data_tables['item_table'] #list
+location_table = data_tables['location_table'] #list
+region_table = data_tables['region_table'] #dict
+category_table = data_tables['category_table'] #dict
+option_table = data_tables['option_table'] #dict
+meta_table = data_tables['meta_table'] #dict
 
 # seed all of the tables for validation
 DataValidation.game_table = game_table
@@ -80,6 +407,10 @@ except ValidationError as e: validation_errors.append(e)
 # If there are any validation errors, display all of them at once
 ############
 
+if len(validation_errors) == 0 and data_tables_parsed:
+    # snapshot the tables before Items.py, Locations.py and the rest of the apworld start modifying them
+    save_data_snapshot(data_snapshot_key, data_tables)
+
 if len(validation_errors) > 0:
     logging.error("\nValidationError(s): \n\n%s\n\n" % ("\n".join([' - ' + str(validation_error) for validation_error in validation_errors])))
     print("\n\nYou can close this window.\n")
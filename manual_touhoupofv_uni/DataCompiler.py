@@ -0,0 +1,71 @@
+"""Compiles the data folder into compiled_data.py, which the apworld then imports instead of parsing the json files.
+
+Run it from an Archipelago source checkout whenever the data folder, the hooks or the modules building the tables change:
+    python -m worlds.manual_touhoupofv_uni.DataCompiler
+A compiled_data.py that doesn't match the current files anymore is ignored with a warning, so forgetting to run it is never wrong, only slower.
+"""
+import argparse
+import importlib.util
+import os
+import pprint
+import py_compile
+from typing import Any, Optional
+
+from . import Data
+
+COMPILED_DATA_PATH = os.path.join(os.path.dirname(__file__), "compiled_data.py")
+
+
+def get_compiled_values() -> dict[str, Any]:
+    """Every value compiled_data.py defines, by name"""
+    # a fresh load, Items.py and Locations.py already added the ids and the filler item and victory location to the imported tables
+    tables = Data.load_data_tables()
+
+    return {
+        "source_key": Data.data_snapshot_key,
+        **{table: tables[table] for table in Data.data_snapshot_tables if table not in ("item_table", "location_table")},
+        "item_table": [dict(item) for item in tables["item_table"]],
+        "location_table": [dict(location) for location in tables["location_table"]]
+    }
+
+def write_compiled_data(values: dict[str, Any], path: str = COMPILED_DATA_PATH) -> None:
+    lines = [
+        "# Generated by DataCompiler.py from the data folder and the hooks, don't edit it by hand.",
+        "# Data.py ignores it once those files or the code building the tables change, run DataCompiler.py again to update it.",
+        ""
+    ]
+    for name, value in values.items():
+        lines.append(f"{name} = {pprint.pformat(value, width=160, sort_dicts=False)}")
+        lines.append("")
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    os.replace(temp_path, path)
+
+def check_compiled_data(values: dict[str, Any], path: str = COMPILED_DATA_PATH) -> None:
+    """Imports the written module on its own and makes sure every value survived the round trip"""
+    spec = importlib.util.spec_from_file_location("compiled_data_check", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    for name, value in values.items():
+        if getattr(module, name, None) != value:
+            raise ValueError(f"{name} can't be written as Python literals, so the data can't be compiled. Did a hooks/Data.py hook add something that isn't json?")
+
+def main(args: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile this Manual world's data folder into compiled_data.py.")
+    parser.add_argument("--output", default=COMPILED_DATA_PATH, help="where to write the module, it's only imported from the apworld's folder")
+    parsed = parser.parse_args(args)
+
+    values = get_compiled_values()
+    write_compiled_data(values, parsed.output)
+    check_compiled_data(values, parsed.output)
+    # write the bytecode now so the first import doesn't have to parse the whole module
+    py_compile.compile(parsed.output, doraise=True)
+
+    print(f"Compiled {len(values['item_table'])} items and {len(values['location_table'])} locations to {parsed.output}")
+
+
+if __name__ == "__main__":
+    main()
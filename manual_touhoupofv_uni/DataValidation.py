@@ -1,6 +1,7 @@
 import logging
 import re
 import json
+from collections import Counter
 from worlds.AutoWorld import World
 from BaseClasses import MultiWorld, ItemClassification
 
@@ -14,80 +15,95 @@ class DataValidation():
     location_table = []
     region_table = {}
 
+    # lookups shared by the checks below, rebuilt by buildIndexes() at the start of each generation validation
+    item_names: set[str] = set()
+    item_categories: set[str] = set()
+    connected_region_names: set[str] = set()
 
-    @staticmethod
-    def checkItemNamesInLocationRequires():
-        for location in DataValidation.location_table:
-            if "requires" not in location:
-                continue
 
-            if isinstance(location["requires"], str):
-                # parse user written statement into list of each item
-                for item in re.findall(r'\|[^|]+\|', location["requires"]):
-                    if item.lower() == "or" or item.lower() == "and" or item == ")" or item == "(":
-                        continue
-                    else:
-                        # if it's a category, validate that the category exists
-                        if '@' in item:
-                            item = item.replace("|", "")
-                            item_parts = item.split(":")
-                            item_name = item
-
-                            if len(item_parts) > 1:
-                                item_name = item_parts[0]
-
-                            item_name = item_name[1:]
-                            item_category_exists = len([item for item in DataValidation.item_table if item_name in item.get('category', [])]) > 0
+    @staticmethod
+    def buildIndexes():
+        DataValidation.item_names = set()
+        DataValidation.item_categories = set()
+        DataValidation.connected_region_names = set()
 
-                            if not item_category_exists:
-                                raise ValidationError("Item category %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
+        for item in DataValidation.item_table:
+            DataValidation.item_names.add(item["name"])
+            DataValidation.item_categories.update(item.get("category", []))
 
-                            continue
+        for region in DataValidation.region_table.values():
+            DataValidation.connected_region_names.update(region.get("connects_to") or [])
 
+    @staticmethod
+    def _checkItemNamesInRequires(requires, requirer_type: str, requirer_name: str):
+        if isinstance(requires, str):
+            # parse user written statement into list of each item
+            for item in re.findall(r'\|[^|]+\|', requires):
+                if item.lower() == "or" or item.lower() == "and" or item == ")" or item == "(":
+                    continue
+                else:
+                    # if it's a category, validate that the category exists
+                    if '@' in item:
                         item = item.replace("|", "")
-
                         item_parts = item.split(":")
                         item_name = item
 
                         if len(item_parts) > 1:
                             item_name = item_parts[0]
 
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
+                        item_name = item_name[1:]
 
-                        if not item_exists:
-                            raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
+                        if item_name not in DataValidation.item_categories:
+                            raise ValidationError("Item category %s is required by %s %s but is misspelled or does not exist." % (item_name, requirer_type, requirer_name))
 
-            else:  # item access is in dict form
-                for item in location["requires"]:
-                    # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
-                    if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
-                        or_items = item
+                        continue
 
-                        if isinstance(item, dict):
-                            or_items = item["or"]
+                    item = item.replace("|", "")
 
-                        for or_item in or_items:
-                            or_item_parts = or_item.split(":")
-                            or_item_name = or_item
+                    item_parts = item.split(":")
+                    item_name = item
 
-                            if len(or_item_parts) > 1:
-                                or_item_name = or_item_parts[0]
+                    if len(item_parts) > 1:
+                        item_name = item_parts[0]
 
-                            item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == or_item_name]) > 0
+                    if item_name not in DataValidation.item_names:
+                        raise ValidationError("Item %s is required by %s %s but is misspelled or does not exist." % (item_name, requirer_type, requirer_name))
 
-                            if not item_exists:
-                                raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (or_item_name, location["name"]))
-                    else:
-                        item_parts = item.split(":")
-                        item_name = item
+        else:  # item access is in dict form
+            for item in requires:
+                # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
+                if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
+                    or_items = item
 
-                        if len(item_parts) > 1:
-                            item_name = item_parts[0]
+                    if isinstance(item, dict):
+                        or_items = item["or"]
+
+                    for or_item in or_items:
+                        or_item_parts = or_item.split(":")
+                        or_item_name = or_item
+
+                        if len(or_item_parts) > 1:
+                            or_item_name = or_item_parts[0]
 
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
+                        if or_item_name not in DataValidation.item_names:
+                            raise ValidationError("Item %s is required by %s %s but is misspelled or does not exist." % (or_item_name, requirer_type, requirer_name))
+                else:
+                    item_parts = item.split(":")
+                    item_name = item
+
+                    if len(item_parts) > 1:
+                        item_name = item_parts[0]
 
-                        if not item_exists:
-                            raise ValidationError("Item %s is required by location %s but is misspelled or does not exist." % (item_name, location["name"]))
+                    if item_name not in DataValidation.item_names:
+                        raise ValidationError("Item %s is required by %s %s but is misspelled or does not exist." % (item_name, requirer_type, requirer_name))
+
+    @staticmethod
+    def checkItemNamesInLocationRequires():
+        for location in DataValidation.location_table:
+            if "requires" not in location:
+                continue
+
+            DataValidation._checkItemNamesInRequires(location["requires"], "location", location["name"])
 
     @staticmethod
     def checkItemNamesInRegionRequires():
@@ -97,87 +113,52 @@ class DataValidation():
             if "requires" not in region:
                 continue
 
-            if isinstance(region["requires"], str):
-                # parse user written statement into list of each item
-                for item in re.findall(r'\|[^|]+\|', region["requires"]):
-                    if item.lower() == "or" or item.lower() == "and" or item == ")" or item == "(":
-                        continue
-                    else:
-                        # if it's a category, validate that the category exists
-                        if '@' in item:
-                            item = item.replace("|", "")
-                            item_parts = item.split(":")
-                            item_name = item
-
-                            if len(item_parts) > 1:
-                                item_name = item_parts[0]
+            DataValidation._checkItemNamesInRequires(region["requires"], "region", region_name)
 
-                            item_name = item_name[1:]
-                            item_category_exists = len([item for item in DataValidation.item_table if item_name in item.get('category', [])]) > 0
-
-                            if not item_category_exists:
-                                raise ValidationError("Item category %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
-
-                            continue
-
-                        item = item.replace("|", "")
-
-                        item_parts = item.split(":")
-                        item_name = item
-
-                        if len(item_parts) > 1:
-                            item_name = item_parts[0]
-
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
-
-                        if not item_exists:
-                            raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
-
-            else:  # item access is in dict form
-                for item in region["requires"]:
-                    # if the require entry is an object with "or" or a list of items, treat it as a standalone require of its own
-                    if (isinstance(item, dict) and "or" in item and isinstance(item["or"], list)) or (isinstance(item, list)):
-                        or_items = item
-
-                        if isinstance(item, dict):
-                            or_items = item["or"]
-
-                        for or_item in or_items:
-                            or_item_parts = or_item.split(":")
-                            or_item_name = or_item
-
-                            if len(or_item_parts) > 1:
-                                or_item_name = or_item_parts[0]
+    @staticmethod
+    def checkRegionNamesInLocations():
+        for location in DataValidation.location_table:
+            if "region" not in location or location["region"] in ["Menu", "Manual"]:
+                continue
 
-                            item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == or_item_name]) > 0
+            if location["region"] not in DataValidation.region_table:
+                raise ValidationError("Region %s is set for location %s, but the region is misspelled or does not exist." % (location["region"], location["name"]))
 
-                            if not item_exists:
-                                raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (or_item_name, region_name))
-                    else:
-                        item_parts = item.split(":")
-                        item_name = item
+    @staticmethod
+    def _mapRequiresToFirstRequirer(requirers) -> tuple[dict[str, str], list[tuple[str, str]]]:
+        # maps every |piped| segment of the json requires to the first requirer name using it, so each requires is only serialized once
+        first_requirer = {}
+        serialized = []
 
-                        if len(item_parts) > 1:
-                            item_name = item_parts[0]
+        for requirer_name, requires in requirers:
+            # convert to json so we don't have to guess the data type
+            requires_json = json.dumps(requires)
+            serialized.append((requirer_name, requires_json))
 
-                        item_exists = len([item["name"] for item in DataValidation.item_table if item["name"] == item_name]) > 0
+            for segment in requires_json.split("|")[1:-1]:
+                first_requirer.setdefault(segment, requirer_name)
 
-                        if not item_exists:
-                            raise ValidationError("Item %s is required by region %s but is misspelled or does not exist." % (item_name, region_name))
+        return first_requirer, serialized
 
     @staticmethod
-    def checkRegionNamesInLocations():
-        for location in DataValidation.location_table:
-            if "region" not in location or location["region"] in ["Menu", "Manual"]:
-                continue
+    def _findFirstRequirer(item_name: str, first_requirer: dict[str, str], serialized: list[tuple[str, str]]) -> str | None:
+        if "|" not in item_name:
+            return first_requirer.get(item_name)
 
-            region_exists = len([name for name in DataValidation.region_table if name == location["region"]]) > 0
+        # names containing a pipe can't be looked up by segment, so fall back to a plain search
+        for requirer_name, requires_json in serialized:
+            if '|{}|'.format(item_name) in requires_json:
+                return requirer_name
 
-            if not region_exists:
-                raise ValidationError("Region %s is set for location %s, but the region is misspelled or does not exist." % (location["region"], location["name"]))
+        return None
 
     @staticmethod
     def checkItemsThatShouldBeRequired():
+        location_requirers = DataValidation._mapRequiresToFirstRequirer(
+            (location["name"], location["requires"]) for location in DataValidation.location_table if "requires" in location)
+        region_requirers = DataValidation._mapRequiresToFirstRequirer(
+            (region_name, region["requires"]) for region_name, region in DataValidation.region_table.items() if "requires" in region)
+
         for item in DataValidation.item_table:
             # if the item is already progression, no need to check
             if "progression" in item and item["progression"]:
@@ -188,38 +169,12 @@ class DataValidation():
                 continue
 
             # check location requires for the presence of item name
-            for location in DataValidation.location_table:
-                if "requires" not in location:
-                    continue
-
-                # convert to json so we don't have to guess the data type
-                location_requires = json.dumps(location["requires"])
-
-                # if boolean, else legacy
-                if isinstance(location_requires, str):
-                    if '|{}|'.format(item["name"]) in location_requires:
-                        raise ValidationError("Item %s is required by location %s, but the item is not marked as progression." % (item["name"], location["name"]))
-                else:
-                    if item["name"] in location_requires:
-                        raise ValidationError("Item %s is required by location %s, but the item is not marked as progression." % (item["name"], location["name"]))
+            if (location_name := DataValidation._findFirstRequirer(item["name"], *location_requirers)) is not None:
+                raise ValidationError("Item %s is required by location %s, but the item is not marked as progression." % (item["name"], location_name))
 
             # check region requires for the presence of item name
-            for region_name in DataValidation.region_table:
-                region = DataValidation.region_table[region_name]
-
-                if "requires" not in region:
-                    continue
-
-                # convert to json so we don't have to guess the data type
-                region_requires = json.dumps(region["requires"])
-
-                # if boolean, else legacy
-                if isinstance(region_requires, str):
-                    if '|{}|'.format(item["name"]) in region_requires:
-                        raise ValidationError("Item %s is required by region %s, but the item is not marked as progression." % (item["name"], region_name))
-                else:
-                    if item["name"] in region_requires:
-                        raise ValidationError("Item %s is required by region %s, but the item is not marked as progression." % (item["name"], region_name))
+            if (region_name := DataValidation._findFirstRequirer(item["name"], *region_requirers)) is not None:
+                raise ValidationError("Item %s is required by region %s, but the item is not marked as progression." % (item["name"], region_name))
 
     @staticmethod
     def _checkLocationRequiresForItemValueWithRegex(values_requested: dict[str, int], requires) -> dict[str, int]:
@@ -297,34 +252,32 @@ class DataValidation():
                 continue
 
             for connecting_region in region["connects_to"]:
-                region_exists = len([name for name in DataValidation.region_table if name == connecting_region]) > 0
-
-                if not region_exists:
+                if connecting_region not in DataValidation.region_table:
                     raise ValidationError("Region %s connects to a region %s, which is misspelled or does not exist." % (region_name, connecting_region))
 
     @staticmethod
     def checkForDuplicateItemNames():
-        for item in DataValidation.item_table:
-            name_count = len([i for i in DataValidation.item_table if i["name"] == item["name"]])
+        name_counts = Counter(item["name"] for item in DataValidation.item_table)
 
-            if name_count > 1:
+        for item in DataValidation.item_table:
+            if name_counts[item["name"]] > 1:
                 raise ValidationError("Item %s is defined more than once." % (item["name"]))
 
     @staticmethod
     def checkForDuplicateLocationNames():
-        for location in DataValidation.location_table:
-            name_count = len([l for l in DataValidation.location_table if l["name"] == location["name"]])
+        name_counts = Counter(location["name"] for location in DataValidation.location_table)
 
-            if name_count > 1:
+        for location in DataValidation.location_table:
+            if name_counts[location["name"]] > 1:
                 raise ValidationError("Location %s is defined more than once." % (location["name"]))
 
     @staticmethod
     def checkForDuplicateRegionNames():
         # this currently does nothing because the region name is a dict key, which will never be non-unique / limited to 1
-        for region_name in DataValidation.region_table:
-            name_count = len([r for r in DataValidation.region_table if r == region_name])
+        name_counts = Counter(region_name for region_name in DataValidation.region_table)
 
-            if name_count > 1:
+        for region_name in DataValidation.region_table:
+            if name_counts[region_name] > 1:
                 raise ValidationError("Region %s is defined more than once." % (region_name))
 
     @staticmethod
@@ -340,12 +293,12 @@ class DataValidation():
 
             if "items" in starting_block:
                 for item_name in starting_block["items"]:
-                    if not item_name in [item["name"] for item in DataValidation.item_table]:
+                    if not item_name in DataValidation.item_names:
                         raise ValidationError("Item %s is set as a starting item, but is misspelled or is not defined." % (item_name))
 
             if "item_categories" in starting_block:
                 for category_name in starting_block["item_categories"]:
-                    if len([item for item in DataValidation.item_table if "category" in item and category_name in item["category"]]) == 0:
+                    if category_name not in DataValidation.item_categories:
                         raise ValidationError("Item category %s is set as a starting item category, but is misspelled or is not defined on any items." % (category_name))
 
     @staticmethod
@@ -372,10 +325,11 @@ class DataValidation():
             if not place_item and not place_item_category:
                 continue
 
-            if place_item and type(place_item) is not list:
+            # the location records store their lists of names as tuples
+            if place_item and not isinstance(place_item, (list, tuple)):
                 raise ValidationError("One of your location has an incorrectly formatted place_item.\n   The items, even just one, must be inside [].")
 
-            if place_item_category and type(place_item_category) is not list:
+            if place_item_category and not isinstance(place_item_category, (list, tuple)):
                 raise ValidationError("One of your location has an incorrectly formatted place_item_category.\n   The categories, even just one, must be inside [].")
 
     @staticmethod
@@ -385,11 +339,11 @@ class DataValidation():
                 continue
 
             # don't bother checking for valid items if the syntax is wrong
-            if type(place_item) is not list:
+            if not isinstance(place_item, (list, tuple)):
                 continue
 
             for item_name in place_item:
-                if not item_name in [item["name"] for item in DataValidation.item_table]:
+                if not item_name in DataValidation.item_names:
                     raise ValidationError("Item %s is placed (using place_item) on a location, but is misspelled or is not defined." % (item_name))
 
     @staticmethod
@@ -399,11 +353,11 @@ class DataValidation():
                 continue
 
             # don't bother checking for valid item categories if the syntax is wrong
-            if type(place_item_category) is not list:
+            if not isinstance(place_item_category, (list, tuple)):
                 continue
 
             for category_name in place_item_category:
-                if len([item for item in DataValidation.item_table if "category" in item and category_name in item["category"]]) == 0:
+                if category_name not in DataValidation.item_categories:
                     raise ValidationError("Item category %s is placed (using place_item_category) on a location, but is misspelled or is not defined." % (category_name))
 
     @staticmethod
@@ -431,9 +385,7 @@ class DataValidation():
         nonstarting_regions = [region for region in DataValidation.region_table if not DataValidation.region_table[region].get("starting")]
 
         for nonstarter in nonstarting_regions:
-            regions_that_connect_to = [region for region in DataValidation.region_table if "connects_to" in DataValidation.region_table[region] and nonstarter in DataValidation.region_table[region]["connects_to"]]
-
-            if len(regions_that_connect_to) == 0:
+            if nonstarter not in DataValidation.connected_region_names:
                 raise ValidationError("The region '%s' is set as a non-starting region, but has no regions that connect to it. It will be inaccessible." % nonstarter)
 
 
@@ -453,6 +405,9 @@ def runPreFillDataValidation(world: World, multiworld: MultiWorld):
 def runGenerationDataValidation(cls) -> None:
     validation_errors = []
 
+    # build the name and category lookups once so every check below stays linear
+    DataValidation.buildIndexes()
+
     # check that requires have correct item names in locations and regions
     try: DataValidation.checkItemNamesInLocationRequires()
     except ValidationError as e: validation_errors.append(e)
@@ -56,6 +56,17 @@ def clamp(value, min, max):
     else:
         return value
 
+def state_independent(func):
+    """Decorator for requires functions whose result never depends on the CollectionState, only on the player's options
+    or on what was generated before set_rules (like the item counts).\n
+    set_rules calls those once per player and folds their result into the rules, so they are never called during fill.\n
+    A CollectionState argument still gets a value, but since there is no state yet, using it raises a TypeError."""
+    func.state_independent = True
+    return func
+
+def is_state_independent(func) -> bool:
+    return getattr(func, "state_independent", False)
+
 def is_category_enabled(multiworld: MultiWorld, player: int, category_name: str) -> bool:
     from .Data import category_table
     """Check if a category has been disabled by a yaml option."""
@@ -111,17 +122,32 @@ def is_location_enabled(multiworld: MultiWorld, player: int, location: "ManualLo
 
     return _is_manualobject_enabled(multiworld, player, location)
 
+def get_disabled_categories(multiworld: MultiWorld, player: int) -> frozenset[str]:
+    """Returns every item, location and categories.json category disabled for the player, by a yaml option or by before_is_category_enabled.\n
+    It's computed once per player the first time it's needed, so the hook should only depend on the player's options."""
+    world = multiworld.worlds[player]
+    if getattr(world, "disabled_categories", None) is None:
+        from .Data import category_table
+        categories = set(category_table.keys()) | set(world.category_item_names.keys()) | set(world.location_name_groups.keys())
+        world.disabled_categories = frozenset(category for category in categories if not is_category_enabled(multiworld, player, category))
+        world.known_categories = frozenset(categories)
+
+    return world.disabled_categories
+
 def _is_manualobject_enabled(multiworld: MultiWorld, player: int, object: Any) -> bool:
     """Internal method: Check if a Manual Object has any category disabled by a yaml option.
     \nPlease use the proper is_'item/location'_enabled or is_'item/location'_name_enabled methods instead.
     """
-    enabled = True
-    for category in object.get("category", []):
-        if not is_category_enabled(multiworld, player, category):
-            enabled = False
-            break
+    categories = object.get("category", [])
+    if not categories:
+        return True
+
+    disabled_categories = get_disabled_categories(multiworld, player)
+    if multiworld.worlds[player].known_categories.issuperset(categories):
+        return disabled_categories.isdisjoint(categories)
 
-    return enabled
+    # a category that was added after the disabled categories were computed
+    return all(is_category_enabled(multiworld, player, category) for category in categories)
 
 def get_items_for_player(multiworld: MultiWorld, player: int, includePrecollected: bool = False) -> List[Item]:
     """Return list of items of a player including placed items"""
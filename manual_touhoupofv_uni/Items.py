@@ -1,5 +1,8 @@
-from BaseClasses import Item
-from .Data import item_table
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+from BaseClasses import Item, ItemClassification
+from .Data import item_table, ManualItemRecord
 from .Game import filler_item_name, starting_index
 
 
@@ -10,6 +13,7 @@ from .Game import filler_item_name, starting_index
 item_id_to_name: dict[int, str] = {}
 item_name_to_item: dict[str, dict] = {}
 item_name_groups: dict[str, str] = {}
+category_item_names: dict[str, tuple[str, ...]] = {}
 advancement_item_names: set[str] = set()
 lastItemId = -1
 
@@ -17,9 +21,9 @@ count = starting_index
 
 # add the filler item to the list of items for lookup
 if filler_item_name:
-    item_table.append({
+    item_table.append(ManualItemRecord({
         "name": filler_item_name
-    })
+    }))
 
 # add sequential generated ids to the lists
 for key, val in enumerate(item_table):
@@ -60,6 +64,13 @@ for item in item_table:
             item_name_groups[group_name] = []
         item_name_groups[group_name].append(item_name)
 
+# Inverted index of the items' categories, unlike item_name_groups it only contains the real categories
+category_item_lists: dict[str, list[str]] = {}
+for item in item_table:
+    for c in item.get("category", []):
+        category_item_lists.setdefault(c, []).append(item["name"])
+category_item_names.update((c, tuple(names)) for c, names in category_item_lists.items())
+
 item_id_to_name[None] = "__Victory__"
 item_name_to_id = {name: id for id, name in item_id_to_name.items()}
 
@@ -71,3 +82,76 @@ item_name_to_id = {name: id for id, name in item_id_to_name.items()}
 
 class ManualItem(Item):
     game = "Manual"
+
+
+class ManualItemPool:
+    """One player's item pool indexed by item name and classification.\n
+    Taking an item out is O(1) and leaves a hole instead of shifting the list, so to_list() returns the
+    remaining items in their original order, the same as repeated list.remove() calls would."""
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self.items: list[Optional[Item]] = []
+        self.positions_by_name: dict[str, deque[int]] = {}
+        self.positions_by_classification: dict[ItemClassification, list[int]] = {}
+        self.removed_count = 0
+
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.items) - self.removed_count
+
+    def __iter__(self) -> Iterator[Item]:
+        return (item for item in self.items if item is not None)
+
+    def append(self, item: Item) -> None:
+        position = len(self.items)
+        self.items.append(item)
+        self.positions_by_name.setdefault(item.name, deque()).append(position)
+        self.positions_by_classification.setdefault(item.classification, []).append(position)
+
+    def count(self, item_name: str) -> int:
+        return len(self.positions_by_name.get(item_name, ()))
+
+    def take(self, item_name: str) -> Optional[Item]:
+        """Removes and returns the first remaining item with that name, or None if there is none left."""
+        positions = self.positions_by_name.get(item_name)
+        if not positions:
+            return None
+
+        position = positions.popleft()
+        item = self.items[position]
+        self.items[position] = None
+        self.removed_count += 1
+        return item
+
+    def remove(self, item: Item) -> Item:
+        """Removes the first remaining item with the same name as the given one, like list.remove() would, and returns it."""
+        removed = self.take(item.name)
+        if removed is None:
+            raise ValueError(f"Item {item.name} is not in the item pool.")
+        return removed
+
+    def remove_names(self, item_names: Iterable[str]) -> list[Item]:
+        """Removes one item per name, so a name has to be repeated to remove more copies of it."""
+        removed = []
+        for item_name in item_names:
+            item = self.take(item_name)
+            if item is None:
+                raise ValueError(f"Item {item_name} is not in the item pool.")
+            removed.append(item)
+        return removed
+
+    def get_items(self, item_names: Iterable[str]) -> list[Item]:
+        """Returns the remaining items with any of those names, in pool order."""
+        positions = sorted(position for item_name in set(item_names) for position in self.positions_by_name.get(item_name, ()))
+        return [self.items[position] for position in positions]
+
+    def get_items_by_classification(self, *classifications: ItemClassification) -> list[Item]:
+        """Returns the remaining items with exactly one of those classifications, in pool order."""
+        positions = sorted(position for classification in set(classifications) for position in self.positions_by_classification.get(classification, ())
+                           if self.items[position] is not None)
+        return [self.items[position] for position in positions]
+
+    def to_list(self) -> list[Item]:
+        return [item for item in self.items if item is not None]
@@ -1,5 +1,5 @@
 from BaseClasses import Location
-from .Data import location_table
+from .Data import location_table, ManualLocationRecord
 from .Game import starting_index
 
 
@@ -34,23 +34,28 @@ for key, _ in enumerate(location_table):
 
 if not victory_names:
     # Add the game completion location, which will have the Victory item assigned to it automatically
-    location_table.append({
+    location_table.append(ManualLocationRecord({
         "id": count + 1,
         "name": "__Manual Game Complete__",
         "region": "Manual",
         "requires": []
         # "category": custom_victory_location["category"] if "category" in custom_victory_location else []
-    })
+    }))
     victory_names.append("__Manual Game Complete__")
 
 location_id_to_name: dict[int, str] = {}
 location_name_to_location: dict[str, dict] = {}
 location_name_groups: dict[str, list[str]] = {}
+region_locations: dict[str, list[dict]] = {}
 
 for item in location_table:
     location_id_to_name[item["id"]] = item["name"]
     location_name_to_location[item["name"]] = item
 
+    if item["region"] not in region_locations:
+        region_locations[item["region"]] = []
+    region_locations[item["region"]].append(item)
+
     for c in item.get("category", []):
         if c not in location_name_groups:
             location_name_groups[c] = []
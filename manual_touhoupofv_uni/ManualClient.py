@@ -1,17 +1,16 @@
 from __future__ import annotations
 import asyncio
+import bisect
 import os
-import re
 import sys
-import time
 import typing
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Optional
 
 import requests
 from worlds import AutoWorldRegister, network_data_package
 from worlds.LauncherComponents import icon_paths
-import json
 import traceback
+from collections import Counter
 
 
 import ModuleUpdate
@@ -38,7 +37,7 @@ class ManualClientCommandProcessor(ClientCommandProcessor):
     def _cmd_resync(self) -> bool:
         """Manually trigger a resync."""
         self.output("Syncing items.")
-        self.ctx.syncing = True
+        self.ctx.request_sync()
         return True
 
     @mark_raw
@@ -51,14 +50,155 @@ class ManualClientCommandProcessor(ClientCommandProcessor):
         )
         if usable:
             location_id = self.ctx.location_names_to_id[location_name]
-            self.ctx.locations_checked.append(location_id)
-            self.ctx.syncing = True
+            self.ctx.queue_location_checks([location_id])
         else:
             self.output(response)
             return False
 
 
 
+class ManualTrackerModel:
+    """The counts and categories behind the Manual tab's tracker, without any widgets.\n
+    Received items are counted from each ReceivedItems delta instead of from the whole items_received list,
+    and the ids whose count changed are kept until the UI takes them with pop_changed_items() to patch only those rows."""
+
+    def __init__(self, get_item_categories: Callable[[int], Iterable[str]]):
+        self.get_item_categories = get_item_categories
+        self.reset()
+
+    def reset(self) -> None:
+        self.item_categories: dict[int, tuple[str, ...]] = {}
+        self.location_categories: dict[int, tuple[str, ...]] = {}
+        self.category_locations: dict[str, list[int]] = {}
+        self.reachable_locations: set[int] = set()
+        self.category_reachable_counts: Counter[str] = Counter()
+        self.changed_reachable_locations: set[int] = set()
+        self.reset_items()
+
+    def reset_items(self) -> None:
+        self.item_counts: Counter[int] = Counter()
+        self.category_items: dict[str, set[int]] = {}
+        self.category_counts: Counter[str] = Counter()
+        self.total_count = 0
+        self.changed_items: set[int] = set()
+        self.received_source: Optional[list] = None
+        self.received_index = 0
+
+    def categories_of_item(self, item_id: int) -> tuple[str, ...]:
+        categories = self.item_categories.get(item_id)
+        if categories is None:
+            categories = self.item_categories[item_id] = tuple(self.get_item_categories(item_id))
+        return categories
+
+    def receive_items(self, items_received: list) -> None:
+        """Counts what was added to items_received since the last call. Starts over if the list was replaced or shrank, like on a reconnect."""
+        if items_received is not self.received_source or len(items_received) < self.received_index:
+            previous_items = set(self.item_counts) | self.changed_items
+            self.reset_items()
+            self.changed_items = previous_items
+            self.received_source = items_received
+
+        for network_item in items_received[self.received_index:]:
+            item_id = getattr(network_item, "item", None)
+            if item_id is None: # only count actual network items
+                continue
+
+            if not self.item_counts[item_id]:
+                for category in self.categories_of_item(item_id):
+                    self.category_items.setdefault(category, set()).add(item_id)
+            self.item_counts[item_id] += 1
+            self.category_counts.update(self.categories_of_item(item_id))
+            self.total_count += 1
+            self.changed_items.add(item_id)
+
+        self.received_index = len(items_received)
+
+    def pop_changed_items(self) -> set[int]:
+        changed_items = self.changed_items
+        self.changed_items = set()
+        return changed_items
+
+    def index_locations(self, location_ids: Iterable[int], get_location_categories: Callable[[int], Iterable[str]]) -> None:
+        """Indexes the locations by category, each category's location ids are sorted"""
+        self.location_categories = {}
+        self.category_locations = {}
+        for location_id in sorted(location_ids):
+            categories = self.location_categories[location_id] = tuple(get_location_categories(location_id))
+            for category in categories:
+                self.category_locations.setdefault(category, []).append(location_id)
+
+        self.category_reachable_counts = Counter(category for location_id in self.reachable_locations
+                                                 for category in self.location_categories.get(location_id, ()))
+
+    def remove_location(self, location_id: int) -> None:
+        categories = self.location_categories.pop(location_id, ())
+        for category in categories:
+            self.category_locations[category].remove(location_id)
+
+        if location_id in self.reachable_locations:
+            self.category_reachable_counts.subtract(categories)
+
+    def set_reachable_locations(self, location_ids: Iterable[int]) -> None:
+        """Diffs the reachable locations against the previous ones, only the locations that changed update the counts"""
+        reachable_locations = set(location_ids)
+        changed_locations = reachable_locations ^ self.reachable_locations
+
+        for location_id in changed_locations:
+            categories = self.location_categories.get(location_id, ())
+            if location_id in reachable_locations:
+                self.category_reachable_counts.update(categories)
+            else:
+                self.category_reachable_counts.subtract(categories)
+
+        self.reachable_locations = reachable_locations
+        self.changed_reachable_locations |= changed_locations
+
+    def pop_changed_reachable_locations(self) -> set[int]:
+        changed_locations = self.changed_reachable_locations
+        self.changed_reachable_locations = set()
+        return changed_locations
+
+
+class ManualSearchIndex:
+    """Lowercased names by id with an index of their trigrams, built once per connection for the search box.\n
+    A query only substring-tests the names that contain all of its trigrams,
+    and typing more characters only narrows the previous query's matches."""
+    gram_size = 3
+
+    def __init__(self, names: dict[int, str]):
+        self.names = {id: name.lower() for id, name in names.items()}
+        self.all_ids = frozenset(self.names)
+        self.grams: dict[str, set[int]] = {}
+        for id, name in self.names.items():
+            for gram in self.get_grams(name):
+                self.grams.setdefault(gram, set()).add(id)
+
+        self.last_query = ""
+        self.last_matches = self.all_ids
+
+    @classmethod
+    def get_grams(cls, text: str) -> set[str]:
+        return {text[i:i + cls.gram_size] for i in range(len(text) - cls.gram_size + 1)}
+
+    def search(self, query: str) -> frozenset[int]:
+        """The ids whose name contains the query, ignoring case"""
+        query = query.lower()
+
+        if query == self.last_query:
+            return self.last_matches
+
+        if self.last_query and self.last_query in query:
+            # every name containing the new query also contained the previous one
+            candidates = self.last_matches
+        elif len(query) >= self.gram_size:
+            gram_ids = sorted((self.grams.get(gram, set()) for gram in self.get_grams(query)), key=len)
+            candidates = gram_ids[0].intersection(*gram_ids[1:])
+        else:
+            candidates = self.all_ids
+
+        self.last_query = query
+        self.last_matches = frozenset(id for id in candidates if query in self.names[id]) if query else self.all_ids
+        return self.last_matches
 
 
 class ManualContext(SuperContext):
@@ -72,14 +212,16 @@ class ManualContext(SuperContext):
     region_table = {}
     category_table = {}
 
-    tracker_reachable_locations = []
-    tracker_reachable_events = []
+    tracker_reachable_locations: set[int] = set()
+    tracker_reachable_events: set[str] = set()
 
     set_deathlink = False
     last_death_link = 0
     deathlink_out = False
 
     search_term = ""
+    item_search_index: Optional[ManualSearchIndex] = None
+    location_search_index: Optional[ManualSearchIndex] = None
 
     colors = {
         'location_default': [219/255, 218/255, 213/255, 1],
@@ -104,6 +246,10 @@ class ManualContext(SuperContext):
 
         self.send_index: int = 0
         self.syncing = False
+        self.goal_requested = False
+        self.locations_checked: set[int] = set() # checked here, but not sent yet
+        self.outbound_requested = asyncio.Event()
+        self.tracker_model = ManualTrackerModel(self.get_tracker_item_categories)
         self.game = game
         self.username = player_name
 
@@ -144,6 +290,23 @@ class ManualContext(SuperContext):
         from .Game import game_name  # This will at least give us the name of a manual they've installed
         return Utils.persistent_load().get("client", {}).get("last_manual_game", game_name)
 
+    def request_outbound(self) -> None:
+        """Wakes game_watcher_manual up to send whatever is pending"""
+        self.outbound_requested.set()
+
+    def queue_location_checks(self, location_ids: Iterable[int]) -> None:
+        """Queues the locations for the next LocationChecks, checks made in quick succession are sent together"""
+        self.locations_checked.update(location_ids)
+        self.request_outbound()
+
+    def request_sync(self) -> None:
+        self.syncing = True
+        self.request_outbound()
+
+    def request_goal(self) -> None:
+        self.goal_requested = True
+        self.request_outbound()
+
     def get_location_by_name(self, name) -> dict[str, Any]:
         location = self.location_table.get(name)
         if not location:
@@ -165,6 +328,9 @@ class ManualContext(SuperContext):
         name = self.item_names.lookup_in_game(id)
         return self.get_item_by_name(name)
 
+    def get_tracker_item_categories(self, id) -> tuple[str, ...]:
+        return tuple(self.get_item_by_id(id).get("category") or ("(No Category)",))
+
     def update_ids(self, data_package) -> None:
         self.location_names_to_id = data_package['location_name_to_id']
         self.item_names_to_id = data_package['item_name_to_id']
@@ -181,6 +347,18 @@ class ManualContext(SuperContext):
     def clear_search(self):
         self.search_term = ""
 
+    def build_search_indexes(self):
+        self.item_search_index = ManualSearchIndex({id: name for name, id in self.item_names_to_id.items()})
+        self.location_search_index = ManualSearchIndex({id: name for name, id in self.location_names_to_id.items()})
+
+    def search_item_ids(self) -> Optional[frozenset[int]]:
+        """The ids of the items matching the search, or None when there is no search"""
+        return self.item_search_index.search(self.search_term) if self.search_term else None
+
+    def search_location_ids(self) -> Optional[frozenset[int]]:
+        """The ids of the locations matching the search, or None when there is no search"""
+        return self.location_search_index.search(self.search_term) if self.search_term else None
+
     @property
     def endpoints(self):
         if self.server:
@@ -205,11 +383,19 @@ class ManualContext(SuperContext):
                         self.ui.enable_death_link()
                         self.set_deathlink = True
                         self.last_death_link = 0
+                        self.request_outbound()
                     logger.info(f"Slot data: {args['slot_data']}")
 
+                # syncs and checks requested while disconnected are sent once connected again
+                if self.syncing or self.locations_checked or self.goal_requested:
+                    self.request_outbound()
+
+            self.tracker_model.reset()
+            self.build_search_indexes()
             self.ui.build_tracker_and_locations_table()
             self.ui.request_update_tracker_and_locations_table(update_highlights=True)
         elif cmd in {"ReceivedItems"}:
+            self.tracker_model.receive_items(self.items_received)
             self.ui.request_update_tracker_and_locations_table(update_highlights=True)
         elif cmd in {"RoomUpdate"}:
             self.ui.request_update_tracker_and_locations_table(update_highlights=False)
@@ -220,11 +406,12 @@ class ManualContext(SuperContext):
         self.ui.death_link_button.background_color = self.colors['deathlink_received']
 
     def on_tracker_updated(self, reachable_locations: list[str]):
-        self.tracker_reachable_locations = reachable_locations
+        self.tracker_reachable_locations = {self.location_names_to_id[name] for name in reachable_locations if name in self.location_names_to_id}
+        self.tracker_model.set_reachable_locations(self.tracker_reachable_locations)
         self.ui.request_update_tracker_and_locations_table(update_highlights=True)
 
     def on_tracker_events(self, events: list[str]):
-        self.tracker_reachable_events = events
+        self.tracker_reachable_events = set(events)
         if events:
             self.ui.request_update_tracker_and_locations_table(update_highlights=True)
 
@@ -267,20 +454,21 @@ class ManualContext(SuperContext):
             from kvui import GameManager
             ui = GameManager
 
+        from kivy.app import App
+        from kivy.clock import Clock
         from kivy.metrics import dp
+        from kivy.uix.behaviors import ButtonBehavior
         from kivy.uix.button import Button
         from kivy.uix.boxlayout import BoxLayout
         from kivy.uix.dropdown import DropDown
         from kivy.uix.gridlayout import GridLayout
         from kivy.uix.label import Label
         from kivy.uix.layout import Layout
-        from kivy.uix.scrollview import ScrollView
+        from kivy.uix.recycleview import RecycleView
         from kivy.uix.spinner import Spinner, SpinnerOption
         from kivy.uix.textinput import TextInput
-        from kivy.uix.treeview import TreeView, TreeViewNode, TreeViewLabel
-        from kivy.core.window import Window
         from kivy.lang import Builder
-        from kivy.properties import ColorProperty
+        from kivy.properties import BooleanProperty, ColorProperty, NumericProperty, StringProperty
 
         class ManualTabLayout(BoxLayout):
             pass
@@ -291,19 +479,6 @@ class ManualContext(SuperContext):
         class TrackerAndLocationsLayout(GridLayout):
             pass
 
-        class TrackerLayoutScrollable(ScrollView):
-            pass
-
-        class LocationsLayoutScrollable(ScrollView):
-            pass
-
-        class TreeViewButton(Button, TreeViewNode):
-            victory: bool = False
-            id: int = None
-
-        class TreeViewScrollView(ScrollView, TreeViewNode):
-            pass
-
         class GameSelectOption(SpinnerOption):
             background_color = self.colors['game_select_button']
 
@@ -322,11 +497,66 @@ class ManualContext(SuperContext):
             pos: self.pos
             size: self.size
 
+<ManualTrackerView>:
+    viewclass: "ManualItemRow"
+    bar_width: 10
+    do_scroll_x: False
+    RecycleBoxLayout:
+        default_size: None, dp(30)
+        default_size_hint: 1, None
+        size_hint_y: None
+        height: self.minimum_height
+        orientation: "vertical"
+
+<ManualCategoryRow>:
+    text_size: self.size
+    halign: "left"
+    valign: "middle"
+    padding: dp(10), 0
+    canvas.before:
+        Color:
+            rgba: root.background_color
+        Rectangle:
+            pos: self.pos
+            size: self.size
+
+<ManualItemRow>:
+    text_size: self.size
+    halign: "left"
+    valign: "middle"
+    padding: dp(30), 0
+
         """)
 
         class ManualControlsStyledLayout(BoxLayout):
             background_color = ColorProperty()
 
+        # The tracker and the locations are each a RecycleView over a flat list of rows, category headers included.
+        # Only the rows on screen exist as widgets, so searching or collapsing a category only changes the list's data.
+        class ManualTrackerView(RecycleView):
+            pass
+
+        class ManualCategoryRow(ButtonBehavior, Label):
+            panel = StringProperty("")
+            category = StringProperty("")
+            background_color = ColorProperty([0, 0, 0, 0])
+
+            def on_release(self):
+                App.get_running_app().toggle_category(self.panel, self.category)
+
+        class ManualItemRow(Label):
+            pass
+
+        class ManualLocationRow(Button):
+            location_id = NumericProperty(0)
+            victory = BooleanProperty(False)
+
+            def on_release(self):
+                if self.victory:
+                    App.get_running_app().victory_button_callback(self)
+                else:
+                    App.get_running_app().location_button_callback(self.location_id, self)
+
         class ManualManager(ui):
             base_title = "Archipelago Manual Client"
             listed_items = {"(No Category)": []}
@@ -337,8 +567,24 @@ class ManualContext(SuperContext):
             active_item_accordion = 0
             active_location_accordion = 0
 
-            update_requested_time: Optional[float] = None
+            update_requested: bool = False
             update_requested_highlights: bool = False
+            update_trigger = None
+
+            # the rows behind both panels, kept by id so an update only changes the rows of what changed
+            items_view: Optional[ManualTrackerView] = None
+            locations_view: Optional[ManualTrackerView] = None
+            items_received_label: Optional[Label] = None
+            locations_remaining_label: Optional[Label] = None
+            item_rows: dict[str, dict[int, dict[str, Any]]] = {}
+            bold_item_rows: list[dict[str, Any]] = []
+            item_category_texts: dict[str, str] = {}
+            bold_item_categories: set[str] = set()
+            location_rows: dict[int, dict[str, Any]] = {}
+            victory_categories: set[str] = set()
+            victory_row: dict[str, Any] = {}
+            # which categories are open in each panel, kept when the panels are rebuilt
+            expanded_categories: dict[str, set[str]] = {"items": set(), "locations": set()}
 
             ctx: ManualContext
 
@@ -412,6 +658,7 @@ class ManualContext(SuperContext):
                     self.death_link_button.background_color = self.ctx.colors['deathlink_primed']
                 else:
                     self.ctx.deathlink_out = True
+                    self.ctx.request_outbound()
                     self.death_link_button.text = "Death Link: Sent"
                     self.death_link_button.background_color = self.ctx.colors['deathlink_sent']
 
@@ -422,9 +669,9 @@ class ManualContext(SuperContext):
                     if hint["finding_player"] == self.ctx.slot:
                         if hint["location"] in self.ctx.missing_locations:
                             location = self.ctx.get_location_by_id(hint["location"])
-                            location["category"] = location.get("category", [])
-                            if "(Hinted)" not in location["category"]:
-                                location["category"].append("(Hinted)")
+                            if "(Hinted)" not in location.get("category", []):
+                                # assigned instead of appended, the world's location records share their category tuples
+                                location["category"] = [*location.get("category", []), "(Hinted)"]
                                 rebuild = True
 
                 if rebuild:
@@ -443,6 +690,13 @@ class ManualContext(SuperContext):
             def build_tracker_and_locations_table(self):
                 self.controls_panel.clear_widgets()
                 self.tracker_and_locations_panel.clear_widgets()
+                self.items_view = None
+                self.locations_view = None
+                self.item_rows = {}
+                self.bold_item_rows = []
+                self.item_category_texts = {}
+                self.bold_item_categories = set()
+                self.location_rows = {}
 
                 if not self.ctx.server or not self.ctx.auth:
                     self.tracker_and_locations_panel.add_widget(
@@ -479,397 +733,324 @@ class ManualContext(SuperContext):
                             if category not in self.listed_items:
                                 self.listed_items[category] = []
 
+                for category in self.listed_items:
+                    self.item_rows[category] = {}
 
-                # Items are not received on connect, so don't bother attempting to work with received items here
+                # Items are not received on connect, their rows are added by the next update from what the tracker model counted so far
+                self.ctx.tracker_model.changed_items.update(self.ctx.tracker_model.item_counts)
 
                 if not self.ctx.location_table and not hasattr(AutoWorldRegister.world_types[self.ctx.game], 'location_name_to_location'):
                     raise Exception("The apworld for %s is too outdated for this client. Please update it." % (self.ctx.game))
 
-                for location_id in self.ctx.missing_locations:
-                    # holy nesting, wow
-                    location_name = self.ctx.location_names.lookup_in_game(location_id)
-                    location = self.ctx.get_location_by_name(location_name)
+                def get_listed_categories(location_id: int) -> tuple[str, ...]:
+                    location = self.ctx.get_location_by_id(location_id)
 
                     if not location:
-                        continue
+                        return ()
 
                     if "category" in location and len(location["category"]) > 0:
-                        for category in location["category"]:
-                            category_settings = self.ctx.category_table.get(category) or getattr(AutoWorldRegister.world_types[self.ctx.game], "category_table", {}).get(category, {})
-                            if "hidden" in category_settings and category_settings["hidden"]:
-                                continue
-                            if category not in self.location_categories:
-                                self.location_categories.append(category)
+                        return tuple(category for category in location["category"] if not (
+                            self.ctx.category_table.get(category) or getattr(AutoWorldRegister.world_types[self.ctx.game], "category_table", {}).get(category, {})
+                        ).get("hidden"))
+                    else: # leave it in the generic category
+                        return ("(No Category)",)
 
-                            if category not in self.listed_locations:
-                                self.listed_locations[category] = []
+                self.ctx.tracker_model.index_locations(self.ctx.missing_locations, get_listed_categories)
 
-                            self.listed_locations[category].append(location_id)
-                    else: # leave it in the generic category
-                        self.listed_locations["(No Category)"].append(location_id)
+                for category, location_ids in self.ctx.tracker_model.category_locations.items():
+                    if category not in self.location_categories:
+                        self.location_categories.append(category)
+
+                    # already sorted, and kept up to date by the model as locations get checked
+                    self.listed_locations[category] = location_ids
+
+                for location_id in self.ctx.tracker_model.location_categories:
+                    self.location_rows[location_id] = {
+                        "viewclass": "ManualLocationRow", "text": self.ctx.location_names.lookup_in_game(location_id),
+                        "location_id": location_id, "victory": False, "background_color": self.location_color(location_id)
+                    }
 
                 victory_location =  self.ctx.goal_location
-                victory_categories = set(victory_location.get("category", []))
+                self.victory_categories = set(victory_location.get("category", []))
 
-                for category in victory_categories:
+                for category in self.victory_categories:
                     if category not in self.location_categories:
                         self.location_categories.append(category)
 
                     if category not in self.listed_locations:
                         self.listed_locations[category] = []
 
-                if not victory_categories:
-                    victory_categories.add("(No Category)")
+                if not self.victory_categories:
+                    self.victory_categories.add("(No Category)")
+
+                # The Victory location can be marked at any point, so it's listed in its categories along with the missing locations
+                victory_text = "VICTORY! (seed finished)" if victory_location["name"] == "__Manual Game Complete__" else "GOAL: " + victory_location["name"]
+                self.victory_row = {
+                    "viewclass": "ManualLocationRow", "text": victory_text,
+                    "location_id": 0, "victory": True, "background_color": self.ctx.colors['location_default']
+                }
+
+                items_panel = BoxLayout(orientation="vertical")
+                self.items_received_label = Label(text="Items Received (%d)" % (len(self.ctx.items_received)), size_hint_y=None, height=dp(30), bold=True)
+                self.items_view = ManualTrackerView()
+                items_panel.add_widget(self.items_received_label)
+                items_panel.add_widget(self.items_view)
+
+                locations_panel = BoxLayout(orientation="vertical")
+                self.locations_remaining_label = Label(text="Remaining Locations (%d)" % (len(self.ctx.missing_locations) + 1), size_hint_y=None, height=dp(30), bold=True)
+                self.locations_view = ManualTrackerView()
+                locations_panel.add_widget(self.locations_remaining_label)
+                locations_panel.add_widget(self.locations_view)
+
+                self.refresh_item_rows()
+                self.refresh_location_rows()
+
+                self.tracker_and_locations_panel.add_widget(items_panel)
+                self.tracker_and_locations_panel.add_widget(locations_panel)
+            def check_for_requested_update(self, *args):
+                # the trigger already waited 0.25 seconds after the last request, in case there were multiple update requests coming in
+                if self.update_requested:
+                    self.update_requested = False
+                    self.update_tracker_and_locations_table(self.update_requested_highlights)
+                    self.update_requested_highlights = False
 
-                for category in self.listed_locations:
-                    self.listed_locations[category].sort()
+            def request_update_tracker_and_locations_table(self, update_highlights=False):
+                self.update_requested = True
+                self.update_requested_highlights = update_highlights or self.update_requested_highlights # if any of the requests wanted highlights, do highlight
 
-                items_length = len(self.ctx.items_received)
-                tracker_panel_scrollable = TrackerLayoutScrollable(do_scroll=(False, True), bar_width=10)
-                tracker_panel = TreeView(root_options=dict(text="Items Received (%d)" % (items_length)), size_hint_y=None)
-                tracker_panel.bind(minimum_height=tracker_panel.setter('height'))
+                # restarted by every request, so it only fires once the requests stop coming in
+                if not self.update_trigger:
+                    self.update_trigger = Clock.create_trigger(self.check_for_requested_update, 0.25)
+                self.update_trigger.cancel()
+                self.update_trigger()
+
+            def category_row(self, panel: str, category_name: str, text: str, index: int, **properties) -> dict[str, Any]:
+                expanded = category_name in self.expanded_categories[panel]
+                row = {
+                    "viewclass": "ManualCategoryRow", "panel": panel, "category": category_name,
+                    "text": ("- " if expanded else "+ ") + text, "bold": False,
+                    # treeviewlabels used to alternate their colors, the headers keep doing it
+                    "background_color": self.ctx.colors['category_even_default'] if index % 2 == 0 else self.ctx.colors['category_odd_default']
+                }
+                row.update(properties)
+                return row
+
+            def toggle_category(self, panel: str, category_name: str):
+                self.expanded_categories[panel] ^= {category_name}
+
+                if panel == "items":
+                    self.refresh_item_rows()
+                else:
+                    self.refresh_location_rows()
 
-                # Since items_received is not available on connect, don't bother building item labels here
-                for item_category in sorted(self.listed_items.keys()):
-                    category_tree = tracker_panel.add_node(
-                        TreeViewLabel(text = "%s (%s)" % (item_category, len(self.listed_items[item_category])))
-                    )
+            def update_item_rows(self, update_highlights=False):
+                # Only the rows of items whose count changed since the last update are patched
+                model = self.ctx.tracker_model
+                model.receive_items(self.ctx.items_received)
+                changed_items = model.pop_changed_items()
 
-                    category_scroll = tracker_panel.add_node(TreeViewScrollView(size_hint=(1, None), size=(Window.width / 2, 250)), category_tree)
-                    category_layout = GridLayout(cols=1, size_hint_y=None)
-                    category_layout.bind(minimum_height = category_layout.setter('height'))
-                    category_scroll.add_widget(category_layout)
+                if not self.items_view:
+                    return
 
-                locations_length = len(self.ctx.missing_locations)
-                locations_panel_scrollable = LocationsLayoutScrollable(do_scroll=(False, True), bar_width=10)
-                locations_panel = TreeView(root_options=dict(text="Remaining Locations (%d)" % (locations_length + 1)), size_hint_y=None)
-                locations_panel.bind(minimum_height=locations_panel.setter('height'))
+                # bolding only lasts until the next update
+                for item_row in self.bold_item_rows:
+                    item_row["bold"] = False
+                self.bold_item_rows = []
 
-                # This seems like a redundant copy of the same check above?
-                if not self.ctx.location_table and not hasattr(AutoWorldRegister.world_types[self.ctx.game], 'location_name_to_location'):
-                    raise Exception("The apworld for %s is too outdated for this client. Please update it." % (self.ctx.game))
+                for item_id in sorted(changed_items):
+                    item_name = self.ctx.item_names.lookup_in_game(item_id)
+                    item_count = model.item_counts[item_id]
 
-                for location_category in sorted(self.listed_locations.keys()):
-                    locations_in_category = len(self.listed_locations[location_category])
-
-                    if (location_category in victory_categories) or \
-                        (not victory_categories and location_category == "(No Category)"):
-                        locations_in_category += 1
-
-                    category_tree = locations_panel.add_node(
-                        TreeViewLabel(text = "%s (%s)" % (location_category, locations_in_category))
-                    )
-
-                    category_scroll = locations_panel.add_node(TreeViewScrollView(size_hint=(1, None), size=(Window.width / 2, 250)), category_tree)
-                    category_layout = GridLayout(cols=1, size_hint_y=None)
-                    category_layout.bind(minimum_height = category_layout.setter('height'))
-                    category_scroll.add_widget(category_layout)
-
-                    for location_id in self.listed_locations[location_category]:
-                        location_button = TreeViewButton(text=self.ctx.location_names.lookup_in_game(location_id), size_hint=(None, None), height=30, width=400)
-                        location_button.bind(on_release=lambda *args, loc_id=location_id: self.location_button_callback(loc_id, *args))
-                        location_button.id = location_id
-                        category_layout.add_widget(location_button)
-
-                    # if this is the category that Victory is in, display the Victory button
-                    # if ("category" in victory_location_data and location_category in victory_location_data["category"]) or \
-                    #     ("category" not in victory_location_data and location_category == "(No Category)"):
-                    if location_category in victory_categories:
-                        # Add the Victory location to be marked at any point, which is why locations length has 1 added to it above
-                        victory_text = "VICTORY! (seed finished)" if victory_location["name"] == "__Manual Game Complete__" else "GOAL: " + victory_location["name"]
-                        location_button = TreeViewButton(text=victory_text, size_hint=(None, None), height=dp(30), width=dp(400))
-                        location_button.victory = True
-                        location_button.bind(on_release=self.victory_button_callback)
-                        category_layout.add_widget(location_button)
-
-                tracker_panel_scrollable.add_widget(tracker_panel)
-                locations_panel_scrollable.add_widget(locations_panel)
-                self.tracker_and_locations_panel.add_widget(tracker_panel_scrollable)
-                self.tracker_and_locations_panel.add_widget(locations_panel_scrollable)
-
-            def check_for_requested_update(self):
-                current_time = time.time()
-
-                # wait 0.25 seconds before executing update, in case there are multiple update requests coming in
-                if self.update_requested_time and current_time - self.update_requested_time >= 0.25:
-                    self.update_requested_time = None
-                    self.update_tracker_and_locations_table(self.update_requested_highlights)
-                    self.update_requested_highlights = False
+                    for category_name in model.categories_of_item(item_id):
+                        if category_name not in self.item_rows:
+                            continue
 
-            def request_update_tracker_and_locations_table(self, update_highlights=False):
-                self.update_requested_time = time.time()
-                self.update_requested_highlights = update_highlights or self.update_requested_highlights # if any of the requests wanted highlights, do highlight
+                        category_rows = self.item_rows[category_name]
+                        listed_items = self.listed_items[category_name]
 
-            def update_tracker_and_locations_table(self, update_highlights=False):
-                items_length = len(self.ctx.items_received)
-                locations_length = len(self.ctx.missing_locations)
+                        if not item_count: # the items were reset, like on a reconnect
+                            if item_id in category_rows:
+                                listed_items.remove(item_id)
+                                del category_rows[item_id]
+                            continue
+
+                        if item_id not in category_rows:
+                            bisect.insort(listed_items, item_id)
+                            category_rows[item_id] = {"viewclass": "ManualItemRow"}
+
+                        item_row = category_rows[item_id]
+                        item_row["text"] = "%s (%s)" % (item_name, item_count)
+                        item_row["bold"] = update_highlights
 
-                if self.ctx.search_term:
-                    items_length = len([
-                        i for i in self.ctx.items_received
-                            if self.ctx.search_term.lower() in self.ctx.item_names.lookup_in_game(i.item).lower()
-                    ])
-
-                    locations_length = len([
-                        l for l in self.ctx.missing_locations
-                            if self.ctx.search_term.lower() in self.ctx.location_names.lookup_in_game(l).lower()
-                    ])
-
-                for _, child in enumerate(self.tracker_and_locations_panel.children):
-                    #
-                    # Structure of items:
-                    # TrackerLayoutScrollable -> TreeView -> TreeViewLabel, TreeViewScrollView -> GridLayout -> Label
-                    #        item tracker     -> category -> category label, category scroll   -> label col  -> item
-                    #
-                    if type(child) is TrackerLayoutScrollable:
-                        treeview = child.children[0] # TreeView
-                        treeview_nodes = treeview.iterate_all_nodes()
-
-                        items_received_label = next(treeview_nodes) # always the first node
-                        items_received_label.text = "Items Received (%s)" % (items_length)
+                        if update_highlights:
+                            self.bold_item_rows.append(item_row)
 
-                        # loop for each category in listed items and get the label + scrollview
-                        for x in range(0, len(self.item_categories)):
-                            category_label = next(treeview_nodes) # TreeViewLabel for category
-                            category_scrollview = next(treeview_nodes) # TreeViewScrollView for housing category's grid layout
-
-                            old_category_text = category_label.text
-
-                            if type(category_label) is TreeViewLabel and type(category_scrollview) is TreeViewScrollView:
-                                category_grid = category_scrollview.children[0] # GridLayout
-
-                                category_name = re.sub(r"\s\(\d+\)$", "", category_label.text)
-                                category_count = 0
-                                category_unique_name_count = 0
-
-                                existing_item_labels = []
-                                bold_item_labels = []
-
-                                # for items that were already listed, determine if the qty changed. if it did, add them to the list to be bolded
-                                for item in category_grid.children:
-                                    if type(item) is Label:
-                                        # Get the item name from the item Label, minus quantity, then do a lookup for count
-                                        old_item_text = item.text
-                                        item_name = re.sub(r"\s\(\d+\)$", "", item.text)
-                                        item_id = self.ctx.item_names_to_id[item_name]
-                                        item_count = len(list(i for i in self.ctx.items_received if i.item == item_id))
+                self.refresh_item_rows(update_highlights)
 
-                                        # if the player is searching for text and the item name doesn't contain it, skip it
-                                        if self.ctx.search_term and not self.ctx.search_term.lower() in item_name.lower():
-                                            item.width = 0
-                                            item.height = 0
-                                            item.opacity = 0
-                                        else:
-                                            item.width = dp(400)
-                                            item.height = dp(30)
-                                            item.opacity = 1
-
-                                            if item_count > 0:
-                                                category_count += item_count
-                                                category_unique_name_count += 1
-
-                                        # Update the label quantity
-                                        item.text="%s (%s)" % (item_name, item_count)
-
-                                        if update_highlights and (old_item_text != item.text):
-                                            bold_item_labels.append(item_name)
-
-                                        existing_item_labels.append(item_name)
-
-                                # instead of reusing existing item listings, clear it all out and re-draw with the sorted list
-                                category_grid.clear_widgets()
-                                self.listed_items[category_name].clear()
-                                category_count = 0
-                                category_unique_name_count = 0
-
-                                # Label (for all item listings)
-                                sorted_items_received = sorted([
-                                    i.item for i in self.ctx.items_received
-                                ])
-
-                                for network_item in sorted_items_received:
-                                    item_name = self.ctx.item_names.lookup_in_game(network_item)
-                                    item_data = self.ctx.get_item_by_name(item_name)
-
-                                    # if the player is searching for text and the item name doesn't contain it, skip it
-                                    if self.ctx.search_term and not self.ctx.search_term.lower() in item_name.lower():
-                                        continue
-
-                                    if "category" not in item_data or not item_data["category"]:
-                                        item_data["category"] = ["(No Category)"]
-
-                                    if category_name in item_data["category"] and network_item not in self.listed_items[category_name]:
-                                        item_count = len(list(i for i in self.ctx.items_received if i.item == network_item))
-                                        item_text = Label(text="%s (%s)" % (item_name, item_count),
-                                                    size_hint=(None, None), height=dp(30), width=dp(400), bold=True)
-
-                                        # if the item was previously listed and was bold, or if it wasn't previously listed at all, make it bold
-                                        item_text.bold = (update_highlights and (item_name in bold_item_labels or item_name not in existing_item_labels))
-
-                                        category_grid.add_widget(item_text)
-                                        self.listed_items[category_name].append(network_item)
-
-                                        category_count += item_count
-                                        category_unique_name_count += 1
-
-                            scrollview_height = 30 * category_unique_name_count
-
-                            if scrollview_height > 250:
-                                scrollview_height = 250
-
-                            if scrollview_height < 10:
-                                scrollview_height = 50
-
-                            category_name = re.sub(r"\s\(\d+\)$", "", category_label.text)
-                            category_label.text = "%s (%s)" % (category_name, category_count)
+            def refresh_item_rows(self, update_highlights=False):
+                """Rebuilds the items panel's data from the current rows, search and open categories"""
+                if not self.items_view:
+                    return
+
+                model = self.ctx.tracker_model
+                matching_items = self.ctx.search_item_ids()
+                data = []
+
+                for index, category_name in enumerate(sorted(self.listed_items.keys())):
+                    listed_items = self.listed_items[category_name]
+
+                    if matching_items is not None:
+                        listed_items = [item_id for item_id in listed_items if item_id in matching_items]
+                        category_count = sum(model.item_counts[item_id] for item_id in listed_items)
+                    else:
+                        category_count = model.category_counts[category_name]
+
+                    category_text = "%s (%s)" % (category_name, category_count)
 
-                            if update_highlights:
-                                category_label.bold = True if old_category_text != category_label.text else False
+                    if update_highlights:
+                        if self.item_category_texts.get(category_name, category_text) != category_text:
+                            self.bold_item_categories.add(category_name)
+                        else:
+                            self.bold_item_categories.discard(category_name)
+                    self.item_category_texts[category_name] = category_text
 
-                            category_scrollview.size=(Window.width / 2, scrollview_height)
+                    data.append(self.category_row("items", category_name, category_text, index, bold=category_name in self.bold_item_categories))
 
-                    #
-                    # Structure of locations:
-                    # LocationsLayoutScrollable -> TreeView -> TreeViewLabel, TreeViewScrollView -> GridLayout -> Button
-                    #      location tracker     -> category -> category label, category scroll   -> label col  -> location
-                    #
-                    if type(child) is LocationsLayoutScrollable:
-                        treeview = child.children[0] # TreeView
-                        treeview_nodes = treeview.iterate_all_nodes()
-
-                        locations_remaining_label = next(treeview_nodes) # always the first node
-                        locations_remaining_label.text = "Remaining Locations (%d)" % (locations_length)
+                    if category_name in self.expanded_categories["items"]:
+                        category_rows = self.item_rows[category_name]
+                        data.extend(category_rows[item_id] for item_id in listed_items)
 
-                        # loop for each category in listed items and get the label + scrollview
-                        for x in range(0, len(self.location_categories)):
-                            category_label = next(treeview_nodes) # TreeViewLabel for category
-                            category_scrollview = next(treeview_nodes) # TreeViewScrollView for housing category's grid layout
+                items_length = model.total_count
 
-                            if type(category_label) is TreeViewLabel and type(category_scrollview) is TreeViewScrollView:
-                                category_grid = category_scrollview.children[0] # GridLayout
+                if matching_items is not None:
+                    items_length = sum(model.item_counts[item_id] for item_id in matching_items & model.item_counts.keys())
 
-                                category_name = re.sub(r"\s\(\d+\/?(\d+)?\)$", "", category_label.text)
-                                category_count = 0
-                                reachable_count = 0
+                self.items_received_label.text = "Items Received (%s)" % (items_length)
+                self.items_view.data = data
 
-                                buttons_to_remove = []
+            def refresh_location_rows(self):
+                """Rebuilds the locations panel's data from the missing locations, search and open categories"""
+                if not self.locations_view:
+                    return
 
-                                # since victory is handled more briefly below, need to pull show/hide into functions here to reuse
-                                def show_button_during_search(btn: TreeViewButton):
-                                    btn.width = dp(400)
-                                    btn.height = dp(30)
-                                    btn.opacity = 1
-                                    btn.disabled = False
+                model = self.ctx.tracker_model
 
-                                def hide_button_during_search(btn: TreeViewButton):
-                                    btn.width = 0
-                                    btn.height = 0
-                                    btn.opacity = 0
-                                    btn.disabled = True
+                for location_id in model.location_categories.keys() - self.ctx.missing_locations:
+                    model.remove_location(location_id)
+                    del self.location_rows[location_id]
 
-                                # Label (for existing item listings)
-                                for location_button in category_grid.children:
-                                    if type(location_button) is TreeViewButton:
-                                        # should only be true for the victory location button, which has different text
-                                        if location_button.text not in (self.ctx.location_table or AutoWorldRegister.world_types[self.ctx.game].location_name_to_location):
-                                            # if the player is searching for text and the location name doesn't contain it, hide and disable it
-                                            if self.ctx.search_term and not self.ctx.search_term.lower() in location_button.text.lower():
-                                                hide_button_during_search(location_button)
-                                            else:
-                                                show_button_during_search(location_button)
-                                                category_count += 1
+                # only recolor the locations that came in or went out of logic
+                for location_id in model.pop_changed_reachable_locations():
+                    if location_id in self.location_rows:
+                        self.location_rows[location_id]["background_color"] = self.location_color(location_id)
 
-                                                if location_button.victory and "__Victory__" in self.ctx.tracker_reachable_events:
-                                                    location_button.background_color = self.ctx.colors['location_in_logic']
-                                                    reachable_count += 1
+                matching_locations = self.ctx.search_location_ids()
+                victory_matches = not self.ctx.search_term or self.ctx.search_term.lower() in self.victory_row["text"].lower()
+                victory_reachable = "__Victory__" in self.ctx.tracker_reachable_events
+                self.victory_row["background_color"] = self.ctx.colors['location_in_logic'] if victory_reachable else self.ctx.colors['location_default']
+                data = []
 
-                                                continue
+                for index, category_name in enumerate(sorted(self.listed_locations.keys())):
+                    listed_locations = self.listed_locations[category_name]
 
-                                        if location_button.id and location_button.id not in self.ctx.missing_locations:
-                                            import logging
+                    if matching_locations is not None:
+                        listed_locations = [location_id for location_id in listed_locations if location_id in matching_locations]
 
-                                            logging.info("location button being removed: " + location_button.text)
-                                            buttons_to_remove.append(location_button)
-                                            continue
+                    category_rows = [self.location_rows[location_id] for location_id in listed_locations]
 
-                                        was_reachable = False
+                    if category_name in self.victory_categories and victory_matches:
+                        category_rows.append(self.victory_row)
 
-                                        if location_button.text in self.ctx.tracker_reachable_locations:
-                                            location_button.background_color = self.ctx.colors['location_in_logic']
-                                            was_reachable = True
-                                        else:
-                                            location_button.background_color = self.ctx.colors['location_default']
+                    if matching_locations is not None:
+                        reachable_count = sum(1 for location_id in listed_locations if location_id in model.reachable_locations)
+                    else:
+                        reachable_count = model.category_reachable_counts[category_name]
 
-                                        # if the player is searching for text and the location name doesn't contain it, hide and disable it
-                                        if self.ctx.search_term and not self.ctx.search_term.lower() in location_button.text.lower():
-                                            hide_button_during_search(location_button)
-                                        else:
-                                            show_button_during_search(location_button)
+                    category_count = len(category_rows)
+                    if category_name in self.victory_categories and victory_matches and victory_reachable:
+                        reachable_count += 1
 
-                                            if was_reachable:
-                                                reachable_count += 1
+                    count_text = category_count
 
-                                            category_count += 1
+                    if tracker_loaded:
+                        count_text = "{}/{}".format(reachable_count, category_count)
 
-                                for location_button in buttons_to_remove:
-                                    location_button.parent.remove_widget(location_button)
+                    category_row = self.category_row("locations", category_name, "%s (%s)" % (category_name, count_text), index)
 
-                                scrollview_height = 30 * category_count
+                    if reachable_count > 0:
+                        category_row["background_color"] = self.ctx.colors['category_in_logic']
 
-                                if scrollview_height > 250:
-                                    scrollview_height = 250
+                    data.append(category_row)
 
-                                if scrollview_height < 10:
-                                    scrollview_height = 50
+                    if category_name in self.expanded_categories["locations"]:
+                        data.extend(category_rows)
 
-                                count_text = category_count
+                locations_length = len(self.ctx.missing_locations)
 
-                                if tracker_loaded:
-                                    count_text = "{}/{}".format(reachable_count, category_count)
+                if matching_locations is not None:
+                    locations_length = len(matching_locations.intersection(self.ctx.missing_locations))
 
-                                category_name = re.sub(r"\s\(\d+\/?(\d+)?\)$", "", category_label.text)
-                                category_label.text = "%s (%s)" % (category_name, count_text)
+                self.locations_remaining_label.text = "Remaining Locations (%d)" % (locations_length)
+                self.locations_view.data = data
 
-                                if reachable_count > 0:
-                                    # treeviewlabels don't have background color. because #justkivythings.
-                                    category_label.even_color = self.ctx.colors['category_in_logic']
-                                    category_label.odd_color = self.ctx.colors['category_in_logic']
-                                else:
-                                    category_label.even_color = self.ctx.colors['category_even_default']
-                                    category_label.odd_color = self.ctx.colors['category_odd_default']
+            def location_color(self, location_id: int) -> list[float]:
+                if location_id in self.ctx.tracker_model.reachable_locations:
+                    return self.ctx.colors['location_in_logic']
+                return self.ctx.colors['location_default']
 
-                                category_scrollview.size=(Window.width / 2, scrollview_height)
+            def update_tracker_and_locations_table(self, update_highlights=False):
+                self.update_item_rows(update_highlights)
+                self.refresh_location_rows()
 
             def location_button_callback(self, location_id, button):
                 if button.text not in self.ctx.location_names_to_id:
                     raise Exception("Locations were not loaded correctly. Please reconnect your client.")
 
                 if location_id:
-                    self.ctx.locations_checked.append(location_id)
-                    self.ctx.syncing = True
-                    button.parent.remove_widget(button)
-
-                    # message = [{"cmd": 'LocationChecks', "locations": [location_id]}]
-                    # self.ctx.send_msgs(message)
+                    self.ctx.queue_location_checks([location_id])
+                    self.ctx.tracker_model.remove_location(location_id)
+                    self.location_rows.pop(location_id, None)
+                    self.refresh_location_rows()
 
             def victory_button_callback(self, button):
-                self.ctx.items_received.append("__Victory__")
-                self.ctx.syncing = True
+                self.ctx.request_goal()
 
         return ManualManager
 
 async def game_watcher_manual(ctx: ManualContext):
+    # Sleeps until something asks for a message to be sent, so an idle client sends nothing
+    exit_wait = asyncio.create_task(ctx.exit_event.wait())
     while not ctx.exit_event.is_set():
-        if ctx.ui:
-            ctx.ui.check_for_requested_update()
-
-        if ctx.syncing == True:
-            sync_msg = [{'cmd': 'Sync'}]
-            if ctx.locations_checked:
-                sync_msg.append({"cmd": "LocationChecks", "locations": list(ctx.locations_checked)})
-            await ctx.send_msgs(sync_msg)
+        outbound_wait = asyncio.create_task(ctx.outbound_requested.wait())
+        await asyncio.wait((exit_wait, outbound_wait), return_when=asyncio.FIRST_COMPLETED)
+        if ctx.exit_event.is_set():
+            outbound_wait.cancel()
+            break
+
+        # give checks made in quick succession the chance to be sent in the same message
+        await asyncio.sleep(0.1)
+        ctx.outbound_requested.clear()
+
+        if not ctx.server or ctx.slot is None:
+            continue # kept until Connected asks again
+
+        messages = []
+        if ctx.syncing:
+            messages.append({'cmd': 'Sync'})
             ctx.syncing = False
 
+        if ctx.locations_checked:
+            messages.append({"cmd": "LocationChecks", "locations": sorted(ctx.locations_checked)})
+            ctx.locations_checked = set()
+
+        if ctx.goal_requested and not ctx.finished_game:
+            messages.append({"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL})
+            ctx.finished_game = True
+        ctx.goal_requested = False
+
+        if messages:
+            await ctx.send_msgs(messages)
+
         if ctx.set_deathlink:
             ctx.set_deathlink = False
             await ctx.update_death_link(True)
@@ -878,22 +1059,11 @@ async def game_watcher_manual(ctx: ManualContext):
             ctx.deathlink_out = False
             await ctx.send_death()
 
-        sending = []
-        victory = ("__Victory__" in ctx.items_received)
-        ctx.locations_checked = sending
-        message = [{"cmd": 'LocationChecks', "locations": sending}]
-        await ctx.send_msgs(message)
-        if not ctx.finished_game and victory:
-            await ctx.send_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
-            ctx.finished_game = True
-        await asyncio.sleep(0.1)
-
 
 def read_apmanual_file(apmanual_file):
-    from base64 import b64decode
+    from .ManualFile import read_apmanual_file as read_file
 
-    with open(apmanual_file, 'r') as f:
-        return json.loads(b64decode(f.read()))
+    return read_file(apmanual_file)
 
 
 async def main(args):
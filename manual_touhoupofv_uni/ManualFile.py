@@ -0,0 +1,146 @@
+"""Writes and reads the .apmanual files that give the Manual client the game data of its slot.
+
+Version 1 is the whole client data as base64 json, it's still read but no longer written.
+Version 2 starts with APMANUAL and a version byte, followed by a zlib stream of json lines:
+    ["header", new_strings, {"game": ..., "player_name": ..., "player_id": ...}]
+    ["items" or "locations", new_strings, [key, value, key, value, ...]]
+    ["regions" or "categories", new_strings, [name, value]]
+Every string of a record is written as its index in a string table, so a category or region name is only stored once.
+Each line first adds the strings it introduces to the table, so both sides handle one line at a time without holding the whole file.
+Numbers are written as json strings, so they can't be mistaken for string indexes.
+"""
+import json
+import zlib
+from base64 import b64decode
+from collections.abc import Mapping
+from typing import Any, BinaryIO, Iterator
+
+APMANUAL_MAGIC = b"APMANUAL"
+APMANUAL_VERSION = 2
+RECORD_SECTIONS = ("items", "locations")
+NAMED_SECTIONS = ("regions", "categories")
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ManualFileWriter:
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.string_indexes: dict[str, int] = {}
+        self.new_strings: list[str] = []
+        self.compressor = zlib.compressobj(9)
+        self.file.write(APMANUAL_MAGIC + bytes((APMANUAL_VERSION,)))
+
+    def get_string_index(self, text: str) -> int:
+        index = self.string_indexes.get(text)
+        if index is None:
+            index = self.string_indexes[text] = len(self.string_indexes)
+            self.new_strings.append(text)
+        return index
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.get_string_index(value)
+        if value is None or isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return repr(value)
+        if isinstance(value, Mapping):
+            return {key: self.encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.encode(item) for item in value]
+        raise TypeError(f"Object of type {type(value).__name__} can't be written to an apmanual file")
+
+    def write_line(self, kind: str, payload: Any) -> None:
+        # the payload is encoded first, so new_strings holds every string it introduced
+        line = [kind, self.new_strings, payload]
+        self.new_strings = []
+        self.file.write(self.compressor.compress(json.dumps(line, separators=(",", ":")).encode("utf-8") + b"\n"))
+
+    def write_header(self, header: dict[str, Any]) -> None:
+        self.write_line("header", header)
+
+    def write_record(self, section: str, record: Mapping[str, Any]) -> None:
+        payload = []
+        for key, value in record.items():
+            payload.append(self.get_string_index(key))
+            payload.append(self.encode(value))
+        self.write_line(section, payload)
+
+    def write_named(self, section: str, name: str, value: Any) -> None:
+        self.write_line(section, [self.get_string_index(name), self.encode(value)])
+
+    def close(self) -> None:
+        self.file.write(self.compressor.flush())
+
+
+def write_apmanual_file(path: str, data: dict[str, Any]) -> None:
+    """Writes client data, shaped like ManualWorld.client_data(), as a version 2 apmanual file"""
+    with open(path, "wb") as f:
+        writer = ManualFileWriter(f)
+        writer.write_header({key: value for key, value in data.items() if key not in RECORD_SECTIONS + NAMED_SECTIONS})
+
+        for section in RECORD_SECTIONS:
+            for record in data.get(section, {}).values():
+                writer.write_record(section, record)
+
+        for section in NAMED_SECTIONS:
+            for name, value in data.get(section, {}).items():
+                writer.write_named(section, name, value)
+
+        writer.close()
+
+
+def decode(value: Any, strings: list[str]) -> Any:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return strings[value]
+    if isinstance(value, str):
+        return int(value) if value.lstrip("-").isdigit() else float(value)
+    if isinstance(value, dict):
+        return {key: decode(item, strings) for key, item in value.items()}
+    return [decode(item, strings) for item in value]
+
+def iter_apmanual_lines(file: BinaryIO) -> Iterator[list[Any]]:
+    """Decompresses the rest of the file a chunk at a time and yields each line once it's complete"""
+    decompressor = zlib.decompressobj()
+    pending = b""
+    while chunk := file.read(READ_CHUNK_SIZE):
+        pending += decompressor.decompress(chunk)
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield json.loads(line)
+
+    pending += decompressor.flush()
+    for line in pending.split(b"\n"):
+        if line:
+            yield json.loads(line)
+
+def read_apmanual_file(path: str) -> dict[str, Any]:
+    """Reads an apmanual file of any version into client data, shaped like ManualWorld.client_data()"""
+    with open(path, "rb") as f:
+        start = f.read(len(APMANUAL_MAGIC) + 1)
+
+        if not start.startswith(APMANUAL_MAGIC):
+            # version 1, base64 can't start with the magic's version byte
+            return json.loads(b64decode(start + f.read()))
+
+        version = start[-1]
+        if version > APMANUAL_VERSION:
+            raise ValueError(f"{path} is a version {version} apmanual file, this client only reads up to version {APMANUAL_VERSION}. Please update the apworld.")
+
+        data: dict[str, Any] = {section: {} for section in RECORD_SECTIONS + NAMED_SECTIONS}
+        strings: list[str] = []
+
+        for kind, new_strings, payload in iter_apmanual_lines(f):
+            strings.extend(new_strings)
+
+            if kind == "header":
+                data.update(payload)
+            elif kind in RECORD_SECTIONS:
+                record = {strings[payload[i]]: decode(payload[i + 1], strings) for i in range(0, len(payload), 2)}
+                data[kind][record["name"]] = record
+            elif kind in NAMED_SECTIONS:
+                data[kind][strings[payload[0]]] = decode(payload[1], strings)
+
+        return data
@@ -69,3 +69,9 @@ world_description: str = set_world_description("""
 world_webworld: ManualWeb = set_world_webworld(ManualWeb())
 
 enable_region_diagram = bool(meta_table.get("enable_region_diagram", False))
+
+# enable_generation_profiling records per stage timings, allocations and access rule calls in world.generation_profile for debug purposes.
+# true only keeps them on the world, "spoiler" also writes them as json next to the spoiler.
+generation_profiling = meta_table.get("enable_generation_profiling", False)
+enable_generation_profiling = bool(generation_profiling)
+write_generation_profile = generation_profiling == "spoiler"
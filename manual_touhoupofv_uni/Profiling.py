@@ -0,0 +1,178 @@
+import json
+import os
+import time
+import tracemalloc
+from collections import Counter
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from BaseClasses import MultiWorld
+from worlds.AutoWorld import World
+
+from .Meta import enable_generation_profiling, write_generation_profile
+
+#####################
+# Generation profiling
+#####################
+# When enable_generation_profiling is set in meta.json, every profiled stage of a world records its wall time and traced memory delta
+# in world.generation_profile, split between Manual itself ("core") and the hooks/World.py hooks called during that stage.
+# Access rule calls are counted per location and per region once the rules are set.
+# When it's disabled, the decorators below return the functions unchanged so there is no overhead at all.
+# Passing enabled=True forces them on, which is how manual_benchmark.py profiles a world without touching meta.json.
+
+def new_generation_profile() -> dict[str, Any]:
+    return {
+        "stages": {},
+        "hooks_outside_stages": {},
+        "rule_calls": {"locations": Counter(), "regions": Counter()}
+    }
+
+def _get_profile(world: World) -> dict[str, Any]:
+    if world.generation_profile is None:
+        world.generation_profile = new_generation_profile()
+
+    return world.generation_profile
+
+# Tracing slows everything down, so when this module had to start tracemalloc it stops it again once the outermost measurement ends
+_measure_depth = 0
+_started_tracing = False
+
+def _measure_start() -> tuple[float, int]:
+    global _measure_depth, _started_tracing
+    if _measure_depth == 0 and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    _measure_depth += 1
+
+    return time.perf_counter(), tracemalloc.get_traced_memory()[0]
+
+def _measure_end(start: tuple[float, int]) -> tuple[float, int]:
+    global _measure_depth, _started_tracing
+    measured = time.perf_counter() - start[0], tracemalloc.get_traced_memory()[0] - start[1]
+
+    _measure_depth -= 1
+    if _measure_depth == 0 and _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+
+    return measured
+
+def _count_rule_calls(profile: dict[str, Any]) -> int:
+    return sum(profile["rule_calls"]["locations"].values()) + sum(profile["rule_calls"]["regions"].values())
+
+def profile_stage(stage_name: str, enabled: bool = enable_generation_profiling) -> Callable[[Callable], Callable]:
+    """Decorates a ManualWorld method so its calls are recorded under stage_name."""
+    def decorator(func: Callable) -> Callable:
+        if not enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(world: World, *args, **kwargs):
+            profile = _get_profile(world)
+            stage = profile["stages"].setdefault(stage_name, {
+                "calls": 0, "seconds": 0.0, "allocated_bytes": 0, "peak_bytes": 0, "core_seconds": 0.0, "core_allocated_bytes": 0,
+                "rule_calls": 0, "hooks": {}
+            })
+            hooks_before = sum(hook["seconds"] for hook in stage["hooks"].values()), sum(hook["allocated_bytes"] for hook in stage["hooks"].values())
+            rule_calls_before = _count_rule_calls(profile)
+
+            previous_stage = world._profiled_stage
+            world._profiled_stage = stage_name
+            start = _measure_start()
+            tracemalloc.reset_peak()
+            try:
+                return func(world, *args, **kwargs)
+            finally:
+                peak_bytes = tracemalloc.get_traced_memory()[1] - start[1]
+                seconds, allocated_bytes = _measure_end(start)
+                world._profiled_stage = previous_stage
+
+                hooks_seconds = sum(hook["seconds"] for hook in stage["hooks"].values()) - hooks_before[0]
+                hooks_allocated_bytes = sum(hook["allocated_bytes"] for hook in stage["hooks"].values()) - hooks_before[1]
+                stage["calls"] += 1
+                stage["seconds"] += seconds
+                stage["allocated_bytes"] += allocated_bytes
+                stage["peak_bytes"] = max(stage["peak_bytes"], peak_bytes)
+                stage["rule_calls"] += _count_rule_calls(profile) - rule_calls_before
+                stage["core_seconds"] += seconds - hooks_seconds
+                stage["core_allocated_bytes"] += allocated_bytes - hooks_allocated_bytes
+
+        return wrapper
+
+    return decorator
+
+def profile_hook(func: Callable, enabled: bool = enable_generation_profiling) -> Callable:
+    """Wraps a hook so its calls are recorded under the stage of the world it was given, if any."""
+    if not enabled:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        world = next((arg for arg in args if isinstance(arg, World)), None)
+        if world is None or not hasattr(world, "generation_profile"):
+            return func(*args, **kwargs)
+
+        profile = _get_profile(world)
+        if world._profiled_stage is not None:
+            hooks = profile["stages"][world._profiled_stage]["hooks"]
+        else:
+            hooks = profile["hooks_outside_stages"]
+        hook = hooks.setdefault(func.__name__, {"calls": 0, "seconds": 0.0, "allocated_bytes": 0})
+
+        start = _measure_start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds, allocated_bytes = _measure_end(start)
+            hook["calls"] += 1
+            hook["seconds"] += seconds
+            hook["allocated_bytes"] += allocated_bytes
+
+    return wrapper
+
+def profile_hooks(namespace: dict[str, Any], hooks_module_name: str, enabled: bool = enable_generation_profiling) -> dict[str, Callable]:
+    """Replaces every function of the hooks module found in namespace by its profile_hook wrapper.\n
+    Returns the replaced functions by name, so they can be put back."""
+    if not enabled:
+        return {}
+
+    replaced = {}
+    for name, value in list(namespace.items()):
+        if callable(value) and getattr(value, "__module__", None) == hooks_module_name:
+            replaced[name] = value
+            namespace[name] = profile_hook(value, enabled)
+
+    return replaced
+
+def count_rule_calls(world: World, multiworld: MultiWorld, player: int) -> None:
+    """Wraps the player's current location and entrance access rules so every call is counted in the profile.\n
+    Only does something while the world is being profiled."""
+    if world.generation_profile is None:
+        return
+
+    rule_calls = _get_profile(world)["rule_calls"]
+
+    def counted(rule: Callable, counter: Counter, name: str) -> Callable:
+        def counted_rule(state) -> bool:
+            counter[name] += 1
+            return rule(state)
+
+        return counted_rule
+
+    for location in multiworld.get_locations(player):
+        location.access_rule = counted(location.access_rule, rule_calls["locations"], location.name)
+
+    for region in multiworld.get_regions(player):
+        for entrance in region.entrances:
+            entrance.access_rule = counted(entrance.access_rule, rule_calls["regions"], region.name)
+
+def write_profile_next_to_spoiler(world: World, multiworld: MultiWorld, player: int, spoiler_handle) -> Optional[str]:
+    """Writes the world's generation profile as json in the spoiler's folder and returns its path."""
+    if not write_generation_profile or world.generation_profile is None or not getattr(spoiler_handle, "name", None):
+        return None
+
+    path = os.path.join(os.path.dirname(spoiler_handle.name), f"{multiworld.get_out_file_name_base(player)}_GenerationProfile.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(world.generation_profile, f, indent=4)
+
+    return path
@@ -1,3 +1,4 @@
+from typing import Optional
 from BaseClasses import Entrance, MultiWorld, Region
 from .Helpers import is_category_enabled, is_location_enabled
 from .Data import region_table
@@ -20,8 +21,9 @@ regionMap["Manual"] = {
 }
 
 
-def create_regions(world: World, multiworld: MultiWorld, player: int):
+def create_regions(world: World, multiworld: MultiWorld, player: int, location_names_to_keep: Optional[set[str]] = None):
     # Create regions and assign locations to each region
+    # location_names_to_keep, if given, filters locations before they are created; victory locations are always kept
     for region in regionMap:
         if "connects_to" not in regionMap[region]:
             exit_array = None
@@ -33,10 +35,13 @@ def create_regions(world: World, multiworld: MultiWorld, player: int):
             exit_array = None
 
         locations = []
-        for location in world.location_table:
-            if "region" in location and location["region"] == region:
-                if is_location_enabled(multiworld, player, location):
-                    locations.append(location["name"])
+        for location in world.region_locations.get(region, []):
+            if location_names_to_keep is not None and location["name"] not in location_names_to_keep \
+                    and location["name"] not in world.victory_names:
+                continue
+
+            if is_location_enabled(multiworld, player, location):
+                locations.append(location["name"])
 
         new_region = create_region(world, multiworld, player, region, locations, exit_array)
         multiworld.regions += [new_region]
@@ -1,11 +1,11 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
 from enum import IntEnum
 from operator import eq, ge, le
 
 from .Regions import regionMap
 from .hooks import Rules
 from .Helpers import clamp, is_item_enabled, is_option_enabled, get_option_value, convert_string_to_type,\
-    format_to_valid_identifier, format_state_prog_items_key, ProgItemsCat
+    format_to_valid_identifier, format_state_prog_items_key, ProgItemsCat, state_independent, is_state_independent
 
 from BaseClasses import MultiWorld, CollectionState
 from worlds.AutoWorld import World
@@ -101,128 +101,443 @@ def evaluate_postfix(expr: str, location: str) -> bool:
 
     return stack.pop()
 
-def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
-    # this is only called when the area (think, location or region) has a "requires" field that is a string
-    def checkRequireStringForArea(state: CollectionState, area: dict):
-        requires_list = area["requires"]
+# Placeholders substituted for {Function()} calls and |item| requirements while a requires string is compiled.
+# Both are numeric word characters so they behave like the "1"/"0" the old text substitution produced.
+FUNCTION_PLACEHOLDER = "①"
+REQUIREMENT_PLACEHOLDER = "②"
+
+FUNCTION_PATTERN = re.compile(r'\{(\w+)\((.*?)\)\}')
+REQUIREMENT_PATTERN = re.compile(r'\|[^|]+\|')
+
+class RequiresNode:
+    """Base class of the expression tree a requires string is compiled into."""
+    __slots__ = ()
+
+class RequiresConstant(RequiresNode):
+    __slots__ = ("value",)
+
+    def __init__(self, value: bool):
+        self.value = value
+
+class RequiresItem(RequiresNode):
+    """|Item:count|, count is an int or a relative count ('all', 'half', 'N%') resolved against the item counts."""
+    __slots__ = ("name", "count")
+
+    def __init__(self, name: str, count: int | str):
+        self.name = name
+        self.count = count
+
+class RequiresCategory(RequiresNode):
+    """|@Category:count|, count is an int or a relative count ('all', 'half', 'N%') resolved against the item counts."""
+    __slots__ = ("name", "count")
+
+    def __init__(self, name: str, count: int | str):
+        self.name = name
+        self.count = count
+
+class RequiresFunction(RequiresNode):
+    """{Function(args)}, index is the position of the call in ParsedRequires.functions"""
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+class RequiresNot(RequiresNode):
+    __slots__ = ("child",)
+
+    def __init__(self, child: RequiresNode):
+        self.child = child
+
+class RequiresAnd(RequiresNode):
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: RequiresNode, right: RequiresNode):
+        self.left = left
+        self.right = right
+
+class RequiresOr(RequiresNode):
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: RequiresNode, right: RequiresNode):
+        self.left = left
+        self.right = right
+
+class RequiresFunctionCall(NamedTuple):
+    text: str # the full "{Function(args)}" text, used to splice non-boolean results back into the requires
+    name: str
+    args: str
+
+class ParsedRequires(NamedTuple):
+    tree: RequiresNode
+    functions: tuple[RequiresFunctionCall, ...]
+
+def is_relative_count(count: str) -> bool:
+    return count.lower() in ('all', 'half') or (count.endswith('%') and len(count) > 1)
+
+def resolve_relative_count(count: str, available: int) -> int:
+    """Convert an 'all', 'half' or 'N%' count to a number of items based on how many are available"""
+    if count.lower() == 'all':
+        return available
+    elif count.lower() == 'half':
+        return int(available / 2)
+    else:
+        percent = clamp(float(count[:-1]) / 100, 0, 1)
+        return math.ceil(available * percent)
+
+def parse_requirement(requirement: str, area: dict) -> RequiresItem | RequiresCategory:
+    """Parse a single |Item:count| or |@Category:count| requirement into its tree leaf"""
+    is_category = '|@' in requirement
+
+    item = requirement.lstrip('|@$').rstrip('|')
+
+    item_parts = item.split(":")  # type: list[str]
+    item_name = item
+    item_count = "1"
+
+    if len(item_parts) > 1:
+        item_name = item_parts[0].strip()
+        item_count = item_parts[1].strip()
+
+    if is_category:
+        if not is_relative_count(item_count):
+            try:
+                item_count = int(item_count)
+            except ValueError as e:
+                raise ValueError(f"Invalid item count `{item_name}` in {area}.") from e
+        return RequiresCategory(item_name, item_count)
+
+    if not is_relative_count(item_count):
+        item_count = int(item_count)
+    return RequiresItem(item_name, item_count)
+
+def parse_requires_string(requires: str, area: dict) -> ParsedRequires:
+    """Parse a requires string into an expression tree.\n
+    {Function()} calls are only located here, they are called (with the CollectionState) every time the rule is evaluated."""
+    functions: list[RequiresFunctionCall] = []
+    function_leaves: list[RequiresFunction] = []
+    requirement_leaves: list[RequiresNode] = []
+
+    def replace_function(match: re.Match) -> str:
+        text = match.group(0)
+        index = next((i for i, f in enumerate(functions) if f.text == text), None)
+        if index is None:
+            index = len(functions)
+            functions.append(RequiresFunctionCall(text, match.group(1), match.group(2)))
+        function_leaves.append(RequiresFunction(index))
+        return FUNCTION_PLACEHOLDER
+
+    def replace_requirement(match: re.Match) -> str:
+        requirement_leaves.append(parse_requirement(match.group(0), area))
+        return REQUIREMENT_PLACEHOLDER
+
+    requires = FUNCTION_PATTERN.sub(replace_function, requires)
+    requires = REQUIREMENT_PATTERN.sub(replace_requirement, requires)
+    requires = re.sub(r'\s?\bAND\b\s?', '&', requires, 0, re.IGNORECASE)
+    requires = re.sub(r'\s?\bOR\b\s?', '|', requires, 0, re.IGNORECASE)
+
+    postfix = infix_to_postfix(requires, area)
+
+    # infix_to_postfix keeps operands in the order they were written, so the leaves can be consumed in order
+    function_leaves.reverse()
+    requirement_leaves.reverse()
+    stack: list[RequiresNode] = []
+
+    try:
+        for c in postfix:
+            if c == "0":
+                stack.append(RequiresConstant(False))
+            elif c == "1":
+                stack.append(RequiresConstant(True))
+            elif c == FUNCTION_PLACEHOLDER:
+                stack.append(function_leaves.pop())
+            elif c == REQUIREMENT_PLACEHOLDER:
+                stack.append(requirement_leaves.pop())
+            elif c == "&":
+                op2 = stack.pop()
+                op1 = stack.pop()
+                stack.append(RequiresAnd(op1, op2))
+            elif c == "|":
+                op2 = stack.pop()
+                op1 = stack.pop()
+                stack.append(RequiresOr(op1, op2))
+            elif c == "!":
+                op = stack.pop()
+                stack.append(RequiresNot(op))
+    except Exception:
+        raise construct_logic_error(area, LogicErrorSource.EVALUATE_POSTFIX)
+
+    if len(stack) != 1:
+        raise construct_logic_error(area, LogicErrorSource.EVALUATE_STACK_SIZE)
+
+    return ParsedRequires(stack.pop(), tuple(functions))
+
+def fold_requires_tree(node: RequiresNode) -> RequiresNode:
+    """Simplifies the constants out of a requires tree.\n
+    A requires that doesn't depend on the state at all folds down to a single RequiresConstant."""
+    if isinstance(node, RequiresNot):
+        child = fold_requires_tree(node.child)
+        if isinstance(child, RequiresConstant):
+            return RequiresConstant(not child.value)
+        return RequiresNot(child)
+
+    if isinstance(node, (RequiresAnd, RequiresOr)):
+        left = fold_requires_tree(node.left)
+        right = fold_requires_tree(node.right)
+        # True decides an OR and False decides an AND, the other constant leaves only the other side
+        deciding_value = isinstance(node, RequiresOr)
+        for side, other in ((left, right), (right, left)):
+            if isinstance(side, RequiresConstant):
+                return side if side.value == deciding_value else other
+        return type(node)(left, right)
+
+    return node
+
+# stands for the CollectionState in the prepared calls of the requires functions
+STATE_PLACEHOLDER = object()
+
+class NoCollectionState:
+    """Passed as the CollectionState to the @state_independent functions, set_rules calls them before there is any state."""
+    def __getattr__(self, name: str):
+        raise TypeError(f"@state_independent requires functions are called without a CollectionState, so they can't use state.{name}. Remove the decorator if the function needs the state.")
 
+NO_COLLECTION_STATE = NoCollectionState()
+
+def always_accessible(state: CollectionState) -> bool:
+    return True
+
+def never_accessible(state: CollectionState) -> bool:
+    return False
+
+def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
+    def get_items_counts() -> dict:
         # Get the "real" item counts of item in the pool/placed/starting_items
-        items_counts = world.get_item_counts(player, only_progression=True)
+        return world.get_item_counts(player, only_progression=True)
+
+    # turn a requires tree into a closure, function results are passed in since they are all called before evaluating
+    def build_evaluator(node: RequiresNode) -> Callable[[CollectionState, Optional[list]], bool]:
+        if isinstance(node, RequiresConstant):
+            value = node.value
+            return lambda state, results: value
+
+        if isinstance(node, RequiresItem):
+            item_name = node.name
+            item_count = node.count
+
+            if isinstance(item_count, int):
+                return lambda state, results: state.count(item_name, player) >= item_count
+
+            return lambda state, results: state.count(item_name, player) >= \
+                resolve_relative_count(item_count, get_items_counts().get(item_name, 0))
+
+        if isinstance(node, RequiresCategory):
+            category_name = node.name
+            category_items = world.category_item_names.get(category_name, ())
+            item_count = node.count
+
+            if not category_items:
+                return lambda state, results: False
+
+            def checkCategory(state: CollectionState, results) -> bool:
+                required = item_count
+                if not isinstance(required, int):
+                    required = resolve_relative_count(required, world.get_progression_category_counts(player).get(category_name, 0))
+
+                total = 0
+                for name in category_items:
+                    total += state.count(name, player)
+
+                    if total >= required:
+                        return True
+                return False
+
+            return checkCategory
+
+        if isinstance(node, RequiresFunction):
+            index = node.index
+            return lambda state, results: results[index]
+
+        if isinstance(node, RequiresNot):
+            child = build_evaluator(node.child)
+            return lambda state, results: not child(state, results)
+
+        left = build_evaluator(node.left)
+        right = build_evaluator(node.right)
+
+        if isinstance(node, RequiresAnd):
+            return lambda state, results: left(state, results) and right(state, results)
+        return lambda state, results: left(state, results) or right(state, results)
+
+    def convert_req_function_args(state: CollectionState, func, args: list[str], areaName: str):
+        parameters = inspect.signature(func).parameters
+        knownParameters = [World, 'ManualWorld', MultiWorld, CollectionState]
+        index = -1
+        for parameter in parameters.values():
+            target_type = parameter.annotation
+            index += 1
+            if target_type in knownParameters:
+                if target_type in [World, 'ManualWorld']:
+                    args.insert(index, world)
+                elif target_type == MultiWorld:
+                    args.insert(index, multiworld)
+                elif target_type == CollectionState:
+                    args.insert(index, state)
+                continue
+            if parameter.name.lower() == "player":
+                args.insert(index, player)
+                continue
+
+            if index < len(args) and args[index] != "":
+                value = args[index].strip()
+            else:
+                if parameter.default is not inspect.Parameter.empty:
+                    if index < len(args):
+                        args[index] = parameter.default
+                    else:
+                        args.insert(index, parameter.default)
+                    continue
+                else:
+                    if parameter.annotation is inspect.Parameter.empty:
+                        raise Exception(f"A call of the \"{func.__name__}\" function in \"{areaName}\"'s requirement, asks for a value for its argument \"{parameter.name}\" but it's missing.")
+                    else:
+                        raise Exception(f"A call of the \"{func.__name__}\" function in \"{areaName}\"'s requirement, asks for a value of type {target_type} for its argument \"{parameter.name}\" but it's missing.")
+
+            if target_type == str or parameter.annotation is inspect.Parameter.empty: #Don't convert since its already a string or if we don't know the type to convert to
+                args[index] = value
+                continue
+
+            try:
+                value = convert_string_to_type(value, target_type)
+
+            except Exception as e:
+                raise Exception(f"A call of the \"{func.__name__}\" function in \"{areaName}\"'s requirement, asks for a value of type {target_type}\nfor its argument \"{parameter.name}\" but its value \"{value}\" cannot be converted to {target_type} \nOriginal Error:'{e}'")
+
+            args[index] = value
+
+    # prepared calls of the requires functions by (function, raw args): the world, multiworld and player are already in,
+    # the literal arguments are already converted to their annotated types, only the CollectionState is passed in
+    function_call_plans: dict[tuple[Callable, str], Callable[[CollectionState], Any]] = {}
+
+    def get_function_call_plan(function: RequiresFunctionCall, func: Callable, area_name: str) -> Callable[[CollectionState], Any]:
+        plan = function_call_plans.get((func, function.args))
+        if plan is not None:
+            return plan
+
+        func_args = function.args.split(",")
+        if func_args == ['']:
+            func_args.pop()
+
+        convert_req_function_args(STATE_PLACEHOLDER, func, func_args, area_name)
+        state_indexes = [index for index, arg in enumerate(func_args) if arg is STATE_PLACEHOLDER]
+
+        if not state_indexes:
+            plan = lambda state: func(*func_args)
+        elif len(state_indexes) == 1:
+            args_before = func_args[:state_indexes[0]]
+            args_after = func_args[state_indexes[0] + 1:]
+            plan = lambda state: func(*args_before, state, *args_after)
+        else:
+            plan = lambda state: func(*[state if arg is STATE_PLACEHOLDER else arg for arg in func_args])
+
+        function_call_plans[(func, function.args)] = plan
+        return plan
 
+    def call_requires_function(state: CollectionState, function: RequiresFunctionCall, func: Callable, area_type: str, area_name: str):
+        plan = get_function_call_plan(function, func, area_name)
+        try:
+            return plan(state)
+        except Exception as ex:
+            raise RuntimeError(f'A call to the function "{function.name}" in {area_type} "{area_name}"\'s requires raised an Exception. \
+                                \nUnless it was called by another function, it should look something like "{{{function.name}({function.args})}}" in {area_type}s.json. \
+                                \nFull error message: \
+                                \n\n{type(ex).__name__}: {ex}')
+
+    # results of the state independent requires functions, by their "{Function(args)}" text
+    state_independent_results: dict[str, object] = {}
+
+    # this is only called when the area (think, location or region) has a "requires" field that is a string
+    def compileRequireStringForArea(requires: str, area: dict, recursionDepth: int = 0) -> Callable[[CollectionState], bool]:
         # Preparing some variables for exception messages
         area_type = "region" if area.get("is_region",False) else "location"
         area_name = area.get("name", f"unknown with these parameters: {area}")
 
-        if requires_list == "":
-            return True
-
-        def findAndRecursivelyExecuteFunctions(requires_list: str, recursionDepth: int = 0) -> str:
-            found_functions = re.findall(r'\{(\w+)\((.*?)\)\}', requires_list)
+        if recursionDepth > world.rules_functions_maximum_recursion:
+            found_functions = FUNCTION_PATTERN.findall(requires)
             if found_functions:
-                if recursionDepth > world.rules_functions_maximum_recursion:
-                    raise RecursionError(f'One or more functions in {area_type} "{area_name}"\'s requires looped too many time (maximum recursion is {world.rules_functions_maximum_recursion}) \
-                                         \n    As of this Exception the following function(s) are waiting to run: {[f[0] for f in found_functions]} \
-                                         \n    And the currently processed requires look like this: "{requires_list}"')
-                else:
-                    for item in found_functions:
-                        func_name = item[0]
-                        func_args = item[1].split(",")
-                        if func_args == ['']:
-                            func_args.pop()
-
-                        func = globals().get(func_name)
-
-                        if func is None:
-                            func = getattr(Rules, func_name, None)
-
-                        if not callable(func):
-                            raise ValueError(f'Invalid function "{func_name}" in {area_type} "{area_name}".')
-
-                        convert_req_function_args(state, func, func_args, area_name)
-                        try:
-                            result = func(*func_args)
-                        except Exception as ex:
-                            raise RuntimeError(f'A call to the function "{func_name}" in {area_type} "{area_name}"\'s requires raised an Exception. \
-                                                \nUnless it was called by another function, it should look something like "{{{func_name}({item[1]})}}" in {area_type}s.json. \
-                                                \nFull error message: \
-                                                \n\n{type(ex).__name__}: {ex}')
-                        if isinstance(result, bool):
-                            requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", "1" if result else "0")
-                        else:
-                            requires_list = requires_list.replace("{" + func_name + "(" + item[1] + ")}", str(result))
-
-                requires_list = findAndRecursivelyExecuteFunctions(requires_list, recursionDepth + 1)
-            return requires_list
-
-        requires_list = findAndRecursivelyExecuteFunctions(requires_list)
-
-        # parse user written statement into list of each item
-        for item in re.findall(r'\|[^|]+\|', requires_list):
-            require_type = 'item'
-
-            if '|@' in item:
-                require_type = 'category'
-
-            item_base = item
-            item = item.lstrip('|@$').rstrip('|')
-
-            item_parts = item.split(":")  # type: list[str]
-            item_name = item
-            item_count = "1"
-
-
-            if len(item_parts) > 1:
-                item_name = item_parts[0].strip()
-                item_count = item_parts[1].strip()
-
-            total = 0
-
-            if require_type == 'category':
-                category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-                category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
-                if item_count.lower() == 'all':
-                    item_count = category_items_counts
-                elif item_count.lower() == 'half':
-                    item_count = int(category_items_counts / 2)
-                elif item_count.endswith('%') and len(item_count) > 1:
-                    percent = clamp(float(item_count[:-1]) / 100, 0, 1)
-                    item_count = math.ceil(category_items_counts * percent)
-                else:
-                    try:
-                        item_count = int(item_count)
-                    except ValueError as e:
-                        raise ValueError(f"Invalid item count `{item_name}` in {area}.") from e
-
-                for category_item in category_items:
-                    total += state.count(category_item["name"], player)
-
-                    if total >= item_count:
-                        requires_list = requires_list.replace(item_base, "1")
-            elif require_type == 'item':
-                item_current_count = items_counts.get(item_name, 0)
-                if item_count.lower() == 'all':
-                    item_count = item_current_count
-                elif item_count.lower() == 'half':
-                    item_count = int(item_current_count / 2)
-                elif item_count.endswith('%') and len(item_count) > 1:
-                    percent = clamp(float(item_count[:-1]) / 100, 0, 1)
-                    item_count = math.ceil(item_current_count * percent)
+                raise RecursionError(f'One or more functions in {area_type} "{area_name}"\'s requires looped too many time (maximum recursion is {world.rules_functions_maximum_recursion}) \
+                                     \n    As of this Exception the following function(s) are waiting to run: {[f[0] for f in found_functions]} \
+                                     \n    And the currently processed requires look like this: "{requires}"')
+
+        parsed = parse_requires_string(requires, area)
+
+        funcs = []
+        for function in parsed.functions:
+            func = globals().get(function.name)
+
+            if func is None:
+                func = getattr(Rules, function.name, None)
+
+            if not callable(func):
+                raise ValueError(f'Invalid function "{function.name}" in {area_type} "{area_name}".')
+
+            funcs.append(func)
+
+        # State independent functions are called once per player and their results are spliced into the requires,
+        # which is then compiled again without them, the same way the results of the other functions are spliced during fill
+        if any(is_state_independent(func) for func in funcs):
+            folded_requires = requires
+            spliced_text = False
+            for function, func in zip(parsed.functions, funcs):
+                if not is_state_independent(func):
+                    continue
+
+                if function.text not in state_independent_results:
+                    state_independent_results[function.text] = call_requires_function(NO_COLLECTION_STATE, function, func, area_type, area_name)
+                result = state_independent_results[function.text]
+
+                if isinstance(result, bool):
+                    folded_requires = folded_requires.replace(function.text, "1" if result else "0")
                 else:
-                    item_count = int(item_count)
+                    folded_requires = folded_requires.replace(function.text, str(result))
+                    spliced_text = True
+
+            return compileRequireStringForArea(folded_requires, area, recursionDepth + 1 if spliced_text else recursionDepth)
+
+        if not parsed.functions:
+            tree = fold_requires_tree(parsed.tree)
+            if isinstance(tree, RequiresConstant):
+                return always_accessible if tree.value else never_accessible
 
-                total = state.count(item_name, player)
+            evaluator = build_evaluator(tree)
+            return lambda state: evaluator(state, None)
 
-                if total >= item_count:
-                    requires_list = requires_list.replace(item_base, "1")
+        # not folded when functions are left, a non-bool result is spliced into the text where it can combine with its neighbours
+        evaluator = build_evaluator(parsed.tree)
 
-            if total <= item_count:
-                requires_list = requires_list.replace(item_base, "0")
+        # Functions returning something other than a bool are spliced back into the requires as text,
+        # the resulting requires strings are compiled once and then reused
+        spliced_rules: dict[str, Callable[[CollectionState], bool]] = {}
 
-        requires_list = re.sub(r'\s?\bAND\b\s?', '&', requires_list, 0, re.IGNORECASE)
-        requires_list = re.sub(r'\s?\bOR\b\s?', '|', requires_list, 0, re.IGNORECASE)
+        def checkRequireStringWithFunctions(state: CollectionState) -> bool:
+            results = [call_requires_function(state, function, func, area_type, area_name) for function, func in zip(parsed.functions, funcs)]
 
-        requires_string = infix_to_postfix("".join(requires_list), area)
-        return (evaluate_postfix(requires_string, area))
+            if all(isinstance(result, bool) for result in results):
+                return evaluator(state, results)
+
+            spliced_requires = requires
+            for function, result in zip(parsed.functions, results):
+                if isinstance(result, bool):
+                    spliced_requires = spliced_requires.replace(function.text, "1" if result else "0")
+                else:
+                    spliced_requires = spliced_requires.replace(function.text, str(result))
+
+            spliced_rule = spliced_rules.get(spliced_requires)
+            if spliced_rule is None:
+                spliced_rule = compileRequireStringForArea(spliced_requires, area, recursionDepth + 1)
+                spliced_rules[spliced_requires] = spliced_rule
+
+            return spliced_rule(state)
+
+        return checkRequireStringWithFunctions
 
     # this is only called when the area (think, location or region) has a "requires" field that is a dict
     def checkRequireDictForArea(state: CollectionState, area: dict):
@@ -266,20 +581,36 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
 
         return canAccess
 
-    # handle any type of checking needed, then ferry the check off to a dedicated method for that check
-    def fullLocationOrRegionCheck(state: CollectionState, area: dict):
+    # handle any type of requires once, then return the rule that is installed on the location/region
+    def compileLocationOrRegionRule(area: dict) -> Callable[[CollectionState], bool]:
         # if it's not a usable object of some sort, default to true
         if not area:
-            return True
+            return always_accessible
 
         # don't require the "requires" key for locations and regions if they don't need to use it
         if "requires" not in area.keys():
-            return True
+            return always_accessible
 
         if isinstance(area["requires"], str):
-            return checkRequireStringForArea(state, area)
+            if area["requires"] == "":
+                return always_accessible
+            return compileRequireStringForArea(area["requires"], area)
         else:  # item access is in dict form
-            return checkRequireDictForArea(state, area)
+            if not area["requires"]:
+                return always_accessible
+            return lambda state: checkRequireDictForArea(state, area)
+
+    region_rules: dict[str, Callable[[CollectionState], bool]] = {}
+
+    def getRegionRule(region_name: str) -> Callable[[CollectionState], bool]:
+        if region_name not in region_rules:
+            region = regionMap[region_name]
+            if region:
+                region['name'] = region_name
+                region['is_region'] = True
+
+            region_rules[region_name] = compileLocationOrRegionRule(region)
+        return region_rules[region_name]
 
     used_location_names = []
     # Region access rules
@@ -287,21 +618,15 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
         used_location_names.extend([l.name for l in multiworld.get_region(region, player).locations])
         if region != "Menu":
             for exitRegion in multiworld.get_region(region, player).entrances:
-                def fullRegionCheck(state: CollectionState, region=regionMap[region], region_name=exitRegion.name):
-                    region['name'] = region_name
-                    region['is_region'] = True
-
-                    return fullLocationOrRegionCheck(state, region)
-
-                add_rule(world.get_entrance(exitRegion.name), fullRegionCheck)
+                add_rule(world.get_entrance(exitRegion.name), getRegionRule(region))
             entrance_rules = regionMap[region].get("entrance_requires", {})
             for e in entrance_rules:
                 entrance = world.get_entrance(f'{e}To{region}')
-                add_rule(entrance, lambda state, rule={"requires": entrance_rules[e]}: fullLocationOrRegionCheck(state, rule))
+                add_rule(entrance, compileLocationOrRegionRule({"requires": entrance_rules[e]}))
             exit_rules = regionMap[region].get("exit_requires", {})
             for e in exit_rules:
                 exit = world.get_entrance(f'{region}To{e}')
-                add_rule(exit, lambda state, rule={"requires": exit_rules[e]}: fullLocationOrRegionCheck(state, rule))
+                add_rule(exit, compileLocationOrRegionRule({"requires": exit_rules[e]}))
 
     # Location access rules
     for location in world.location_table:
@@ -310,83 +635,30 @@ def set_rules(world: "ManualWorld", multiworld: MultiWorld, player: int):
 
         locFromWorld = multiworld.get_location(location["name"], player)
 
-        locationRegion = regionMap[location["region"]] if "region" in location else None
-
-        if locationRegion:
-            locationRegion['name'] = location['region']
-            locationRegion['is_region'] = True
+        # AP only checks a location's rule once its region is reachable, and the region's requires are already on every entrance
+        # to it, except for Menu which has none. So the region's requires are only checked again if the world asks for it
+        if "region" in location and (world.location_rules_include_region_requires or location["region"] == "Menu"):
+            regionRule = getRegionRule(location["region"])
+        else:
+            regionRule = always_accessible
 
         if "requires" in location: # Location has requires, check them alongside the region requires
-            def checkBothLocationAndRegion(state: CollectionState, location=location, region=locationRegion):
-                locationCheck = fullLocationOrRegionCheck(state, location)
-                regionCheck = True # default to true unless there's a region with requires
-
-                if region:
-                    regionCheck = fullLocationOrRegionCheck(state, region)
-
-                return locationCheck and regionCheck
-
-            set_rule(locFromWorld, checkBothLocationAndRegion)
-        elif "region" in location: # Only region access required, check the location's region's requires
-            def fullRegionCheck(state, region=locationRegion):
-                return fullLocationOrRegionCheck(state, region)
-
-            set_rule(locFromWorld, fullRegionCheck)
-        else: # No location region and no location requires? It's accessible.
-            def allRegionsAccessible(state):
-                return True
-
-            set_rule(locFromWorld, allRegionsAccessible)
+            locationRule = compileLocationOrRegionRule(location)
+
+            if regionRule is always_accessible:
+                set_rule(locFromWorld, locationRule)
+            elif locationRule is always_accessible:
+                set_rule(locFromWorld, regionRule)
+            elif locationRule is never_accessible or regionRule is never_accessible:
+                set_rule(locFromWorld, never_accessible)
+            else:
+                set_rule(locFromWorld, lambda state, locationRule=locationRule, regionRule=regionRule: locationRule(state) and regionRule(state))
+        else: # Only region access required, or no location region and no location requires which means it's accessible.
+            set_rule(locFromWorld, regionRule)
 
     # Victory requirement
     multiworld.completion_condition[player] = lambda state: state.has("__Victory__", player)
 
-    def convert_req_function_args(state: CollectionState, func, args: list[str], areaName: str):
-        parameters = inspect.signature(func).parameters
-        knownParameters = [World, 'ManualWorld', MultiWorld, CollectionState]
-        index = -1
-        for parameter in parameters.values():
-            target_type = parameter.annotation
-            index += 1
-            if target_type in knownParameters:
-                if target_type in [World, 'ManualWorld']:
-                    args.insert(index, world)
-                elif target_type == MultiWorld:
-                    args.insert(index, multiworld)
-                elif target_type == CollectionState:
-                    args.insert(index, state)
-                continue
-            if parameter.name.lower() == "player":
-                args.insert(index, player)
-                continue
-
-            if index < len(args) and args[index] != "":
-                value = args[index].strip()
-            else:
-                if parameter.default is not inspect.Parameter.empty:
-                    if index < len(args):
-                        args[index] = parameter.default
-                    else:
-                        args.insert(index, parameter.default)
-                    continue
-                else:
-                    if parameter.annotation is inspect.Parameter.empty:
-                        raise Exception(f"A call of the \"{func.__name__}\" function in \"{areaName}\"'s requirement, asks for a value for its argument \"{parameter.name}\" but it's missing.")
-                    else:
-                        raise Exception(f"A call of the \"{func.__name__}\" function in \"{areaName}\"'s requirement, asks for a value of type {target_type} for its argument \"{parameter.name}\" but it's missing.")
-
-            if target_type == str or parameter.annotation is inspect.Parameter.empty: #Don't convert since its already a string or if we don't know the type to convert to
-                args[index] = value
-                continue
-
-            try:
-                value = convert_string_to_type(value, target_type)
-
-            except Exception as e:
-                raise Exception(f"A call of the \"{func.__name__}\" function in \"{areaName}\"'s requirement, asks for a value of type {target_type}\nfor its argument \"{parameter.name}\" but its value \"{value}\" cannot be converted to {target_type} \nOriginal Error:'{e}'")
-
-            args[index] = value
-
 
 def ItemValue(state: CollectionState, player: int, valueCount: str):
     """When passed a string with this format: 'valueName:int',
@@ -403,6 +675,7 @@ def ItemValue(state: CollectionState, player: int, valueCount: str):
 
 
 # Two useful functions to make require work if an item is disabled instead of making it inaccessible
+@state_independent
 def OptOne(world: "ManualWorld", item: str, items_counts: Optional[dict] = None):
     """Check if the passed item (with or without ||) is enabled, then this returns |item:count|
     where count is clamped to the maximum number of said item in the itempool.\n
@@ -410,8 +683,10 @@ def OptOne(world: "ManualWorld", item: str, items_counts: Optional[dict] = None)
     """
     if item == "":
         return "" #Skip this function if item is left blank
+    category_counts = None
     if not items_counts:
         items_counts = world.get_item_counts(only_progression=True)
+        category_counts = world.get_progression_category_counts()
 
     require_type = 'item'
 
@@ -431,8 +706,10 @@ def OptOne(world: "ManualWorld", item: str, items_counts: Optional[dict] = None)
     if require_type == 'category':
         if item_count.isnumeric():
             #Only loop if we can use the result to clamp
-            category_items = [item for item in world.item_name_to_item.values() if "category" in item and item_name in item["category"]]
-            category_items_counts = sum([items_counts.get(category_item["name"], 0) for category_item in category_items])
+            if category_counts is not None:
+                category_items_counts = category_counts.get(item_name, 0)
+            else:
+                category_items_counts = sum(items_counts.get(name, 0) for name in world.category_item_names.get(item_name, ()))
             item_count = clamp(int(item_count), 0, category_items_counts)
         return f"|@{item_name}:{item_count}|"
     elif require_type == 'item':
@@ -442,6 +719,7 @@ def OptOne(world: "ManualWorld", item: str, items_counts: Optional[dict] = None)
         return f"|{item_name}:{item_count}|"
 
 # OptAll check the passed require string and loop every item to check if they're enabled,
+@state_independent
 def OptAll(world: "ManualWorld", requires: str):
     """Check the passed require string and loop every item to check if they're enabled,
     then returns the require string with items counts adjusted using OptOne\n
@@ -475,14 +753,17 @@ def canReachLocation(state: CollectionState, player: int, location: str):
         return True
     return False
 
+@state_independent
 def YamlEnabled(multiworld: MultiWorld, player: int, param: str) -> bool:
     """Is a yaml option enabled?"""
     return is_option_enabled(multiworld, player, param)
 
+@state_independent
 def YamlDisabled(multiworld: MultiWorld, player: int, param: str) -> bool:
     """Is a yaml option disabled?"""
     return not is_option_enabled(multiworld, player, param)
 
+@state_independent
 def YamlCompare(world: "ManualWorld", multiworld: MultiWorld, state: CollectionState, player: int, args: str, skipCache: bool = False) -> bool:
     """Is a yaml option's value compared using {comparator} to the requested value
     \nFormat it like {YamlCompare(OptionName==value)}
@@ -1,7 +1,6 @@
-from base64 import b64encode
 import logging
 import os
-import json
+from collections import ChainMap
 from typing import Callable, Optional, Counter
 import webbrowser
 
@@ -12,22 +11,22 @@ from worlds.LauncherComponents import Component, SuffixIdentifier, components, T
 from .Data import item_table, location_table, region_table, category_table
 from .Game import game_name, filler_item_name, starting_items
 from .Meta import world_description, world_webworld, enable_region_diagram
-from .Locations import location_id_to_name, location_name_to_id, location_name_to_location, location_name_groups, victory_names
-from .Items import item_id_to_name, item_name_to_id, item_name_to_item, item_name_groups
+from .Locations import location_id_to_name, location_name_to_id, location_name_to_location, location_name_groups, region_locations, victory_names
+from .Items import item_id_to_name, item_name_to_id, item_name_to_item, item_name_groups, category_item_names
 from .DataValidation import runGenerationDataValidation, runPreFillDataValidation
 
 from .Regions import create_regions
-from .Items import ManualItem
+from .Items import ManualItem, ManualItemPool
 from .Rules import set_rules
 from .Options import manual_options_data
 from .Helpers import is_item_enabled, get_option_value, get_items_for_player, resolve_yaml_option, format_state_prog_items_key, ProgItemsCat
 
-from BaseClasses import CollectionState, ItemClassification, Item
+from BaseClasses import CollectionState, ItemClassification, Item, Location
 from Options import PerGameCommonOptions
 from worlds.AutoWorld import World
 
 from .hooks.World import \
-    hook_get_filler_item_name, before_create_regions, after_create_regions, \
+    hook_get_filler_item_name, before_create_regions, hook_get_location_names_to_keep, after_create_regions, \
     before_create_items_all, before_create_items_starting, before_create_items_filler, after_create_items, \
     before_create_item, after_create_item, \
     before_set_rules, after_set_rules, \
@@ -36,6 +35,11 @@ from .hooks.World import \
     before_extend_hint_information, after_extend_hint_information, \
     after_collect_item, after_remove_item
 from .hooks.Data import hook_interpret_slot_data
+from .Profiling import profile_stage, profile_hooks, count_rule_calls, write_profile_next_to_spoiler
+from .ManualFile import write_apmanual_file
+
+# Only does something when enable_generation_profiling is set in meta.json
+profile_hooks(globals(), f"{__name__}.hooks.World")
 
 class ManualWorld(World):
     __doc__ = world_description
@@ -55,22 +59,36 @@ class ManualWorld(World):
     item_name_to_id = item_name_to_id
     item_name_to_item = item_name_to_item
     item_name_groups = item_name_groups
+    category_item_names = category_item_names
 
     filler_item_name = filler_item_name
 
     item_counts: dict[int, Counter[str]] = {}
     item_counts_progression: dict[int, Counter[str]] = {}
+    category_counts_progression: Optional[Counter[str]] = None # this world's own, set by create_items
     start_inventory = {}
 
     location_id_to_name = location_id_to_name
     location_name_to_id = location_name_to_id
     location_name_to_location = location_name_to_location
     location_name_groups = location_name_groups
+    region_locations = region_locations
     victory_names = victory_names
 
     # UT (the universal-est of trackers) can now generate without a YAML
     ut_can_gen_without_yaml = False  # Temporary disable until we fix the bugs with it
 
+    # Per stage timings, allocations and access rule calls, only recorded when enable_generation_profiling is set in meta.json
+    generation_profile: Optional[dict] = None
+    _profiled_stage: Optional[str] = None
+
+    # Categories disabled for this player by the yaml options, computed on first use by Helpers.get_disabled_categories
+    disabled_categories: Optional[frozenset[str]] = None
+    known_categories: frozenset[str] = frozenset()
+
+    # This player's classification flags per item name, over the shared item_name_to_item. Created on first use by override_item_classification
+    item_classification_overlay: Optional[dict[str, dict[str, Optional[bool]]]] = None
+
     def get_filler_item_name(self) -> str:
         return hook_get_filler_item_name(self, self.multiworld, self.player) or self.filler_item_name
 
@@ -86,6 +104,9 @@ class ManualWorld(World):
                 regen = True
 
         regen = hook_interpret_slot_data(self, self.player, slot_data) or regen
+        if regen:
+            # the options changed, so the disabled categories have to be computed again
+            self.disabled_categories = None
         return regen
 
     @classmethod
@@ -93,10 +114,12 @@ class ManualWorld(World):
         runGenerationDataValidation(cls)
 
 
+    @profile_stage("create_regions")
     def create_regions(self):
         before_create_regions(self, self.multiworld, self.player)
 
-        create_regions(self, self.multiworld, self.player)
+        location_names_to_keep = hook_get_location_names_to_keep(self, self.multiworld, self.player)
+        create_regions(self, self.multiworld, self.player, location_names_to_keep)
 
         location_game_complete = self.multiworld.get_location(victory_names[get_option_value(self.multiworld, self.player, 'goal')], self.player)
         location_game_complete.address = None
@@ -109,6 +132,7 @@ class ManualWorld(World):
 
         after_create_regions(self, self.multiworld, self.player)
 
+    @profile_stage("create_items")
     def create_items(self):
         # Generate item pool
         pool: list[Item] = []
@@ -196,6 +220,8 @@ class ManualWorld(World):
         items_started: list[Item] = []
 
         if starting_items:
+            indexed_pool = ManualItemPool(pool)
+
             for starting_item_block in starting_items:
                 if not resolve_yaml_option(self.multiworld, self.player, starting_item_block):
                     continue
@@ -208,16 +234,15 @@ class ManualWorld(World):
                         continue
 
                 # start with the full pool of items
-                items = pool
+                items = indexed_pool.to_list()
 
                 # if the setting lists specific item names, limit the items to just those
                 if "items" in starting_item_block:
-                    items = [item for item in pool if item.name in starting_item_block["items"]]
+                    items = indexed_pool.get_items(starting_item_block["items"])
 
                 # if the setting lists specific item categories, limit the items to ones that have any of those categories
                 if "item_categories" in starting_item_block:
-                    items_in_categories = [item["name"] for item in self.item_name_to_item.values() if "category" in item and len(set(starting_item_block["item_categories"]).intersection(item["category"])) > 0]
-                    items = [item for item in pool if item.name in items_in_categories]
+                    items = indexed_pool.get_items(name for category in starting_item_block["item_categories"] for name in self.category_item_names.get(category, ()))
 
                 self.random.shuffle(items)
 
@@ -228,7 +253,9 @@ class ManualWorld(World):
                 for starting_item in items:
                     items_started.append(starting_item)
                     self.multiworld.push_precollected(starting_item)
-                    pool.remove(starting_item)
+                    indexed_pool.remove(starting_item)
+
+            pool = indexed_pool.to_list()
 
         self.start_inventory = {i.name: items_started.count(i) for i in items_started}
 
@@ -243,11 +270,16 @@ class ManualWorld(World):
         real_pool = pool + items_started
         self.item_counts[self.player] = self.get_item_counts(pool=real_pool)
         self.item_counts_progression[self.player] = self.get_item_counts(pool=real_pool, only_progression=True)
+        self.category_counts_progression = Counter({category: sum(self.item_counts_progression[self.player].get(name, 0) for name in names)
+                                                    for category, names in self.category_item_names.items()})
 
     def create_item(self, name: str, class_override: Optional['ItemClassification']=None) -> Item:
         name = before_create_item(name, self, self.multiworld, self.player)
 
         item = self.item_name_to_item[name]
+        if self.item_classification_overlay and name in self.item_classification_overlay:
+            item = ChainMap(self.item_classification_overlay[name], item)
+
         if class_override is not None:
             classification = class_override
         else:
@@ -290,6 +322,7 @@ class ManualWorld(World):
         after_remove_item(self, state, change, item)
         return change
 
+    @profile_stage("set_rules")
     def set_rules(self):
         before_set_rules(self, self.multiworld, self.player)
 
@@ -297,6 +330,9 @@ class ManualWorld(World):
 
         after_set_rules(self, self.multiworld, self.player)
 
+        count_rule_calls(self, self.multiworld, self.player)
+
+    @profile_stage("generate_basic")
     def generate_basic(self):
         before_generate_basic(self, self.multiworld, self.player)
 
@@ -311,7 +347,7 @@ class ManualWorld(World):
                 forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if i["name"] in manual_location["dont_place_item"]])
 
             if manual_location.get("dont_place_item_category"):
-                forbidden_item_names.extend([i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["dont_place_item_category"])])
+                forbidden_item_names.extend([name for category in manual_location["dont_place_item_category"] for name in self.category_item_names.get(category, ())])
 
             if forbidden_item_names:
                 forbid_items_for_player(location, set(forbidden_item_names), self.player)
@@ -319,6 +355,9 @@ class ManualWorld(World):
         # Handle specific item placements using fill_restrictive
         manual_locations_with_placements = {location['name']: location for location in location_name_to_location.values() if "place_item" in location or "place_item_category" in location}
         locations_with_placements = [l for l in self.multiworld.get_unfilled_locations(player=self.player) if l.name in manual_locations_with_placements.keys()]
+        # index this player's part of the multiworld item pool so placed items don't need a scan and a list.remove each
+        player_pool = ManualItemPool(item for item in self.multiworld.itempool if item.player == self.player) if locations_with_placements else None
+        placed_items: list[Item] = []
         for location in locations_with_placements:
             manual_location = manual_locations_with_placements[location.name]
             eligible_items = []
@@ -333,7 +372,7 @@ class ManualWorld(World):
                 place_messages.append('", "'.join(manual_location["place_item"]))
 
             if manual_location.get("place_item_category"):
-                eligible_item_names += [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["place_item_category"])]
+                eligible_item_names += [name for category in manual_location["place_item_category"] for name in self.category_item_names.get(category, ())]
                 place_messages.append('", "'.join(manual_location["place_item_category"]) + " category(ies)")
 
             # Second we check for forbidden items names
@@ -342,7 +381,7 @@ class ManualWorld(World):
                 forbid_messages.append('", "'.join(manual_location["dont_place_item"]) + ' items')
 
             if manual_location.get("dont_place_item_category"):
-                forbidden_item_names += [i["name"] for i in item_name_to_item.values() if "category" in i and set(i["category"]).intersection(manual_location["dont_place_item_category"])]
+                forbidden_item_names += [name for category in manual_location["dont_place_item_category"] for name in self.category_item_names.get(category, ())]
                 forbid_messages.append('", "'.join(manual_location["dont_place_item_category"]) + ' category(ies)')
 
             # If we forbid some names, check for those in the possible names and remove them
@@ -350,7 +389,7 @@ class ManualWorld(World):
                 eligible_item_names = [name for name in eligible_item_names if name not in forbidden_item_names]
 
             if eligible_item_names:
-                eligible_items = [item for item in self.multiworld.itempool if item.player == self.player and item.name in eligible_item_names]
+                eligible_items = player_pool.get_items(eligible_item_names)
 
             if len(eligible_items) == 0:
                 nl = "\n"
@@ -362,8 +401,11 @@ class ManualWorld(World):
             location.place_locked_item(item_to_place)
 
             # remove the item we're about to place from the pool so it isn't placed twice
-            self.multiworld.itempool.remove(item_to_place)
+            placed_items.append(player_pool.remove(item_to_place))
 
+        if placed_items:
+            placed_item_ids = {id(item) for item in placed_items}
+            self.multiworld.itempool[:] = [item for item in self.multiworld.itempool if id(item) not in placed_item_ids]
 
         after_generate_basic(self, self.multiworld, self.player)
 
@@ -372,10 +414,12 @@ class ManualWorld(World):
             from Utils import visualize_regions
             visualize_regions(self.multiworld.get_region("Menu", self.player), f"{self.game}_{self.player}.puml")
 
+    @profile_stage("pre_fill")
     def pre_fill(self):
         # DataValidation after all the hooks are done but before fill
         runPreFillDataValidation(self, self.multiworld)
 
+    @profile_stage("fill_slot_data")
     def fill_slot_data(self):
         slot_data = before_fill_slot_data({}, self, self.multiworld, self.player)
 
@@ -390,15 +434,17 @@ class ManualWorld(World):
 
         return slot_data
 
+    @profile_stage("generate_output")
     def generate_output(self, output_directory: str):
         data = self.client_data()
         filename = f"{self.multiworld.get_out_file_name_base(self.player)}.apmanual"
-        with open(os.path.join(output_directory, filename), 'wb') as f:
-            f.write(b64encode(bytes(json.dumps(data), 'utf-8')))
+        write_apmanual_file(os.path.join(output_directory, filename), data)
 
     def write_spoiler(self, spoiler_handle):
         before_write_spoiler(self, self.multiworld, spoiler_handle)
 
+        write_profile_next_to_spoiler(self, self.multiworld, self.player, spoiler_handle)
+
     def extend_hint_information(self, hint_data: dict[int, dict[int, str]]) -> None:
         before_extend_hint_information(hint_data, self, self.multiworld, self.player)
 
@@ -421,6 +467,32 @@ class ManualWorld(World):
     The maximum time a location/region's requirement can loop to check for functions\n
     One thing to remember is the more you loop the longer generation will take. So probably leave it as is unless you really needs it."""
 
+    location_rules_include_region_requires: bool = False
+    """Default: False\n
+    Whether the location rules also check their region's requires, on top of AP checking that the region is reachable.\n
+    Only needed if something calls the location access rules directly without checking the region first."""
+
+    def override_item_classification(self, item_name: str, **classification: Optional[bool]) -> None:
+        """Changes the classification flags create_item reads for an item (progression, progression_skip_balancing, useful, trap), for this player only.\n
+        The item_name_to_item shared by every player and generation is never modified, so players with different options can't affect each other.\n
+        A flag set to None is ignored as if the item didn't have it."""
+        if self.item_classification_overlay is None:
+            self.item_classification_overlay = {}
+
+        self.item_classification_overlay.setdefault(item_name, {}).update(classification)
+
+    def get_slot_item_table(self) -> dict[str, dict]:
+        """Returns item_name_to_item as this player sees it, with the flags from override_item_classification applied.\n
+        Overridden items get a copy of their record, where a flag overridden with None is removed."""
+        if not self.item_classification_overlay:
+            return self.item_name_to_item
+
+        items = dict(self.item_name_to_item)
+        for item_name, classification in self.item_classification_overlay.items():
+            record = {**items[item_name], **classification}
+            items[item_name] = {key: value for key, value in record.items() if key not in classification or value is not None}
+        return items
+
     def add_filler_items(self, item_pool, traps):
         Utils.deprecate("Use adjust_filler_items instead.")
         return self.adjust_filler_items(item_pool, traps)
@@ -448,14 +520,15 @@ class ManualWorld(World):
             # Filler is only assigned if the item doesn't have any other tags, so it only has to be covered by itself.
             # Skip Balancing is also not covered due to how it's only supported when paired with Progression.
             # As a result, these cover every possible combination can be removed.
-            fillers = [item for item in item_pool if item.classification == ItemClassification.filler]
-            traps = [item for item in item_pool if item.classification == ItemClassification.trap]
-            useful = [item for item in item_pool if item.classification == ItemClassification.useful]
+            indexed_pool = ManualItemPool(item_pool)
+            fillers = indexed_pool.get_items_by_classification(ItemClassification.filler)
+            traps = indexed_pool.get_items_by_classification(ItemClassification.trap)
+            useful = indexed_pool.get_items_by_classification(ItemClassification.useful)
             # Useful + Trap is classified separately so that it can have a unique priority ranking.
-            useful_traps = [item for item in item_pool if
-                            ItemClassification.progression not in item.classification
-                            and ItemClassification.useful in item.classification
-                            and ItemClassification.trap in item.classification]
+            useful_traps = indexed_pool.get_items_by_classification(*[classification for classification in indexed_pool.positions_by_classification if
+                                                                      ItemClassification.progression not in classification
+                                                                      and ItemClassification.useful in classification
+                                                                      and ItemClassification.trap in classification])
             self.random.shuffle(fillers)
             self.random.shuffle(traps)
             self.random.shuffle(useful)
@@ -473,7 +546,9 @@ class ManualWorld(World):
                 else:
                     logging.warning("Could not remove enough non-progression items from the pool.")
                     break
-                item_pool.remove(popped)
+                indexed_pool.remove(popped)
+
+            item_pool[:] = indexed_pool.to_list()
 
         return item_pool
 
@@ -499,17 +574,34 @@ class ManualWorld(World):
         else:
             return self.item_counts.get(player, Counter())
 
+    def get_progression_category_counts(self, player: Optional[int] = None) -> Counter[str]:
+        """Returns the player real progression item counts summed per item category.\n
+        This function will only work after create_items, before then an empty Counter is returned."""
+        world = self if player is None else self.multiworld.worlds[player]
+        return getattr(world, "category_counts_progression", None) or Counter()
+
+    def set_threshold_rule(self, location: Location, item_name: str, threshold: int) -> None:
+        """Sets the location access rule to `state.count(item_name) >= threshold` for this player."""
+        player = self.player
+        location.access_rule = lambda state: state.count(item_name, player) >= threshold
 
     def client_data(self):
+        # only what exists in this slot, the client falls back to the apworld's tables for anything else
+        slot_location_names = {location.name for location in self.multiworld.get_locations(self.player)}
+        slot_region_names = {region.name for region in self.multiworld.get_regions(self.player)}
+        locations = {name: location for name, location in self.location_name_to_location.items() if name in slot_location_names}
+        items = self.get_slot_item_table()
+        used_categories = {category for record in [*items.values(), *locations.values()] for category in record.get("category", [])}
+
         return {
             "game": self.game,
             'player_name': self.multiworld.get_player_name(self.player),
             'player_id': self.player,
-            'items': self.item_name_to_item,
-            'locations': self.location_name_to_location,
+            'items': items,
+            'locations': locations,
             # todo: extract connections out of multiworld.get_regions() instead, in case hooks have modified the regions.
-            'regions': region_table,
-            'categories': category_table
+            'regions': {name: region for name, region in region_table.items() if name in slot_region_names},
+            'categories': {name: category for name, category in category_table.items() if name in used_categories}
         }
 
 ###
@@ -3,6 +3,7 @@ def after_load_game_file(game_table: dict) -> dict:
     return game_table
 # called after the items.json file has been loaded, before any item loading or processing has occurred
 # if you need access to the items after processing to add ids, etc., you should use the hooks in World.py
+# the items are still plain dicts here, afterwards their lists of names (category, ...) become tuples that can't be changed in place
 def after_load_item_file(item_table: list) -> list:
     return item_table
 
@@ -13,6 +14,7 @@ def after_load_progressive_item_file(progressive_item_table: list) -> list:
 
 # called after the locations.json file has been loaded, before any location loading or processing has occurred
 # if you need access to the locations after processing to add ids, etc., you should use the hooks in World.py
+# the locations are still plain dicts here, afterwards their lists of names (category, ...) become tuples that can't be changed in place
 def after_load_location_file(location_table: list) -> list:
     return location_table
 
@@ -3,12 +3,15 @@ from worlds.AutoWorld import World
 from BaseClasses import MultiWorld, CollectionState, Item
 
 # Object classes from Manual -- extending AP core -- representing items and locations that are used in generation
-from ..Items import ManualItem
+from ..Items import ManualItem, ManualItemPool
 from ..Locations import ManualLocation
 
 # Raw JSON data from the Manual apworld, respectively:
 #          data/game.json, data/items.json, data/locations.json, data/regions.json
 #
+# The items and locations read like dicts, but their lists of names (category, place_item, ...) are shared tuples,
+# so item["category"].append("New Category") raises an AttributeError. Assign a new list instead:
+#          item["category"] = [*item["category"], "New Category"]
 from ..Data import game_table, item_table, location_table, region_table
 
 # These helper methods allow you to determine if an option has been set, or what its value is, for any player in the multiworld
@@ -29,6 +32,49 @@ import logging
 ## The fill_slot_data method will be used to send data to the Manual client for later use, like deathlink.
 ########################################################################################
 
+# Story mode opponents of every character, by stage. A stage lists every opponent that character can meet there in story mode.
+STORY_OPPONENTS: dict[str, dict[int, tuple[str, ...]]] = {
+    "Reimu": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Lyrica", "Tewi"), 4: ("Reisen", "Lyrica", "Tewi"), 5: ("Marisa", "Sakuya", "Youmu", "Reisen"), 6: ("Marisa", "Sakuya"), 7: ("Aya",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Marisa": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Youmu", "Reisen", "Lyrica", "Tewi"), 4: ("Youmu", "Reisen", "Lyrica", "Tewi"), 5: ("Reimu", "Sakuya", "Youmu", "Reisen"), 6: ("Reimu", "Sakuya"), 7: ("Aya",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Sakuya": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Youmu", "Reisen", "Lyrica"), 4: ("Reimu", "Marisa", "Youmu", "Reisen", "Lyrica"), 5: ("Reimu", "Marisa", "Youmu", "Reisen"), 6: ("Tewi",), 7: ("Medicine",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Youmu": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Reimu", "Marisa", "Lyrica", "Mystia", "Tewi"), 4: ("Reimu", "Marisa", "Reisen", "Lyrica", "Tewi"), 5: ("Reimu", "Marisa", "Reisen"), 6: ("Sakuya",), 7: ("Aya",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Reisen": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Lyrica", "Tewi"), 4: ("Reimu", "Marisa", "Youmu", "Lyrica", "Tewi"), 5: ("Reimu", "Marisa", "Youmu"), 6: ("Sakuya",), 7: ("Medicine",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Cirno": {1: ("Mystia",), 2: ("Lyrica",), 3: ("Marisa", "Sakuya", "Tewi"), 4: ("Reimu", "Marisa", "Sakuya", "Youmu", "Tewi"), 5: ("Reimu", "Marisa", "Sakuya", "Youmu", "Tewi"), 6: ("Reisen",), 7: ("Aya",), 8: ("Yuuka",), 9: ("Shikieiki",)},
+    "Lyrica": {1: ("Cirno",), 2: ("Mystia", "Tewi"), 3: ("Reisen", "Mystia", "Tewi"), 4: ("Reimu", "Marisa", "Sakuya", "Reisen", "Tewi"), 5: ("Reimu", "Marisa", "Sakuya"), 6: ("Youmu",), 7: ("Aya",), 8: ("Yuuka",), 9: ("Shikieiki",)},
+    "Merlin": {1: ("Cirno",), 2: ("Mystia", "Tewi"), 3: ("Reisen", "Mystia", "Tewi"), 4: ("Reimu", "Marisa", "Sakuya", "Reisen", "Tewi"), 5: ("Reimu", "Marisa", "Sakuya"), 6: ("Youmu",), 7: ("Aya",), 8: ("Yuuka",), 9: ("Shikieiki",)},
+    "Lunasa": {1: ("Cirno",), 2: ("Mystia", "Tewi"), 3: ("Reisen", "Mystia", "Tewi"), 4: ("Reimu", "Marisa", "Sakuya", "Reisen", "Tewi"), 5: ("Reimu", "Marisa", "Sakuya"), 6: ("Youmu",), 7: ("Aya",), 8: ("Yuuka",), 9: ("Shikieiki",)},
+    "Mystia": {1: ("Cirno",), 2: ("Lyrica", "Tewi"), 3: ("Youmu", "Reisen", "Lyrica", "Tewi"), 4: ("Youmu", "Reisen", "Lyrica", "Tewi"), 5: ("Marisa", "Sakuya"), 6: ("Reimu",), 7: ("Medicine",), 8: ("Yuuka",), 9: ("Shikieiki",)},
+    "Tewi": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Mystia"), 3: ("Sakuya", "Lyrica"), 4: ("Marisa", "Youmu", "Lyrica"), 5: ("Reimu", "Marisa", "Sakuya", "Youmu"), 6: ("Reisen",), 7: ("Medicine",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Aya": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Reimu", "Sakuya", "Lyrica", "Tewi"), 4: ("Reimu", "Sakuya", "Youmu", "Reisen", "Tewi"), 5: ("Reimu", "Sakuya", "Youmu", "Reisen", "Tewi"), 6: ("Marisa",), 7: ("Medicine",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Medicine": {1: ("Lyrica", "Mystia"), 2: ("Lyrica", "Mystia"), 3: ("Tewi",), 4: ("Reimu", "Marisa", "Reisen"), 5: ("Reimu", "Marisa", "Reisen"), 6: ("Sakuya",), 7: ("Yuuka",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Yuuka": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Marisa", "Sakuya", "Youmu", "Reisen", "Lyrica", "Tewi"), 4: ("Marisa", "Sakuya", "Youmu", "Reisen", "Tewi"), 5: ("Marisa", "Sakuya", "Youmu", "Reisen"), 6: ("Reimu",), 7: ("Aya",), 8: ("Komachi",), 9: ("Shikieiki",)},
+    "Komachi": {1: ("Cirno",), 2: ("Reisen", "Tewi"), 3: ("Sakuya",), 4: ("Youmu", "Reisen", "Tewi"), 5: ("Youmu", "Reisen", "Tewi"), 6: ("Marisa",), 7: ("Yuuka",), 8: ("Reimu",), 9: ("Shikieiki",)},
+    "Shikieiki": {1: ("Cirno", "Mystia"), 2: ("Cirno", "Lyrica", "Mystia"), 3: ("Youmu", "Reisen", "Lyrica", "Tewi"), 4: ("Youmu", "Reisen", "Tewi"), 5: ("Sakuya", "Youmu", "Reisen"), 6: ("Marisa",), 7: ("Aya",), 8: ("Komachi",), 9: ("Reimu",)}
+}
+STORY_STAGES = range(1, 10)
+
+def compile_story_opponents(story_opponents: dict[str, dict[int, tuple[str, ...]]]) -> dict[str, tuple[tuple[str, ...], ...]]:
+    """Turns the story opponent table into one tuple of candidates per stage for every character, in stage order"""
+    candidates = {}
+    for p1, stages in story_opponents.items():
+        missing_stages = [stage for stage in STORY_STAGES if not stages.get(stage)]
+        if missing_stages:
+            raise ValueError(f"{p1} has no story opponents for stage {', '.join(str(stage) for stage in missing_stages)}")
+        candidates[p1] = tuple(stages[stage] for stage in STORY_STAGES)
+    return candidates
+
+STORY_OPPONENT_CANDIDATES = compile_story_opponents(STORY_OPPONENTS)
+
+def get_story_matchups(p1: str, opponent_order: list[str]) -> list[str]:
+    """Picks one story opponent per stage for p1, each the first of that stage's candidates in opponent_order that wasn't picked for an earlier stage"""
+    position = {opponent: index for index, opponent in enumerate(opponent_order)}
+    matchups = []
+    for candidates in STORY_OPPONENT_CANDIDATES[p1]:
+        remaining = [opponent for opponent in candidates if opponent not in matchups]
+        if remaining:
+            matchups.append(min(remaining, key=position.__getitem__))
+    return matchups
+
 # Use this function to change the valid filler items to be created to replace item links or starting items.
 # Default value is the `filler_item_name` from game.json
 def hook_get_filler_item_name(world: World, multiworld: MultiWorld, player: int) -> str | bool:
@@ -36,10 +82,6 @@ def hook_get_filler_item_name(world: World, multiworld: MultiWorld, player: int)
 
 # Called before regions and locations are created. Not clear why you'd want this, but it's here. Victory location is included, but Victory event is not placed yet.
 def before_create_regions(world: World, multiworld: MultiWorld, player: int):
-    pass
-
-# Called after regions and locations are created, in case you want to see or modify that information. Victory location is included.
-def after_create_regions(world: World, multiworld: MultiWorld, player: int):
 
     # Getting option values
     game_mode = get_option_value(multiworld, player, "game_mode")
@@ -140,285 +182,27 @@ def after_create_regions(world: World, multiworld: MultiWorld, player: int):
                 world.character_matchups = char_mu_random
             else:
                 # Imitate matchups from story mode if match_random_opponents option is disabled
-                story_opponents = {}
-                def story_opps():
-                    world.character_matchups[p1].append(sm)
-                    story_opponents[p1].remove(sm)
-
                 for p1 in e_char:
-                    world.character_matchups[p1] = []
-                    story_opponents[p1] = characters.copy()
-                    world.random.shuffle(story_opponents[p1])
-                    for stage in range (1, 10):
-                        for sm in story_opponents[p1]:
-                            match stage:
-                                # Stage 1 Opponents
-                                case 1 if p1 != "Cirno" and p1 != "Lyrica" and p1 != "Merlin" and p1 != "Lunasa" and p1 != "Mystia" and p1 != "Medicine" and p1 != "Komachi":
-                                    if sm == "Cirno" or sm == "Mystia":
-                                        story_opps()
-                                        break
-                                case 1 if p1 == "Cirno":
-                                    if sm == "Mystia":
-                                        story_opps()
-                                        break
-                                case 1 if p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa" or p1 == "Mystia" or p1 == "Komachi":
-                                    if sm == "Cirno":
-                                        story_opps()
-                                        break
-                                case 1 if p1 == "Medicine":
-                                    if sm == "Mystia" or sm == "Lyrica":
-                                        story_opps()
-                                        break
-                                # Stage 2 Opponents
-                                case 2 if p1 != "Cirno" and p1 != "Lyrica" and p1 != "Merlin" and p1 != "Lunasa" and p1 != "Mystia" and p1 != "Tewi" and p1 != "Medicine" and p1 != "Komachi":
-                                    if sm == "Cirno" or sm == "Mystia" or sm == "Lyrica":
-                                        story_opps()
-                                        break
-                                case 2 if p1 == "Cirno":
-                                    if sm == "Lyrica":
-                                        story_opps()
-                                        break
-                                case 2 if p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa":
-                                    if sm == "Mystia" or sm == "Tewi":
-                                        story_opps()
-                                        break
-                                case 2 if p1 == "Mystia":
-                                    if sm == "Tewi" or sm == "Lyrica":
-                                        story_opps()
-                                        break
-                                case 2 if p1 == "Tewi":
-                                    if sm == "Cirno" or sm == "Mystia":
-                                        story_opps()
-                                        break
-                                case 2 if p1 == "Medicine":
-                                    if sm == "Mystia" or sm == "Lyrica":
-                                        story_opps()
-                                        break
-                                case 2 if p1 == "Komachi":
-                                    if sm == "Tewi" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                # Stage 3 Opponents
-                                case 3 if p1 == "Reimu" or p1 == "Reisen":
-                                    if sm == "Lyrica" or sm == "Tewi":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Marisa" or p1 == "Mystia" or p1 == "Shikieiki":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Reisen" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Sakuya":
-                                    if sm == "Lyrica" or sm == "Youmu" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Youmu":
-                                    if sm == "Mystia" or sm == "Lyrica" or sm == "Tewi" or sm == "Reimu" or sm == "Marisa":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Cirno":
-                                    if sm == "Marisa" or sm == "Sakuya" or sm == "Tewi":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa":
-                                    if sm == "Mystia" or sm == "Tewi" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Tewi":
-                                    if sm == "Sakuya" or sm == "Lyrica":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Aya":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Reimu" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Medicine":
-                                    if sm == "Tewi":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Yuuka":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Marisa" or sm == "Sakuya" or sm == "Youmu" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 3 if p1 == "Komachi":
-                                    if sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                # Stage 4 Opponents
-                                case 4 if p1 == "Reimu":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Marisa" or p1 == "Mystia":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Reisen" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Sakuya":
-                                    if sm == "Lyrica" or sm == "Youmu" or sm == "Reisen" or sm == "Reimu" or sm == "Marisa":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Youmu":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Reimu" or sm == "Marisa" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Reisen":
-                                    if sm == "Lyrica" or sm == "Tewi" or sm == "Reimu" or sm == "Marisa" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Cirno":
-                                    if sm == "Marisa" or sm == "Sakuya" or sm == "Tewi" or sm == "Reimu" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa":
-                                    if sm == "Tewi" or sm == "Reisen" or sm == "Reimu" or sm == "Marisa" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Tewi":
-                                    if sm == "Lyrica" or sm == "Marisa" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Aya":
-                                    if sm == "Tewi" or sm == "Reimu" or sm == "Sakuya" or sm == "Youmu" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Medicine":
-                                    if sm == "Reimu" or sm == "Marisa" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Yuuka":
-                                    if sm == "Tewi" or sm == "Marisa" or sm == "Sakuya" or sm == "Youmu" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 4 if p1 == "Komachi" or p1 == "Shikieiki":
-                                    if sm == "Tewi" or sm == "Reisen" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                # Stage 5 Opponents
-                                case 5 if p1 == "Reimu" or p1 == "Yuuka":
-                                    if sm == "Reisen" or sm == "Youmu" or sm == "Marisa" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Marisa":
-                                    if sm == "Reisen" or sm == "Youmu" or sm == "Reimu" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Sakuya":
-                                    if sm == "Youmu" or sm == "Reisen" or sm == "Reimu" or sm == "Marisa":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Youmu" or p1 == "Medicine":
-                                    if sm == "Reimu" or sm == "Marisa" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Reisen":
-                                    if sm == "Reimu" or sm == "Marisa" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Cirno":
-                                    if sm == "Marisa" or sm == "Sakuya" or sm == "Tewi" or sm == "Reimu" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa":
-                                    if sm == "Reimu" or sm == "Marisa" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Mystia":
-                                    if sm == "Marisa" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Tewi":
-                                    if sm == "Sakuya" or sm == "Marisa" or sm == "Youmu" or sm == "Reimu":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Aya":
-                                    if sm == "Tewi" or sm == "Reimu" or sm == "Sakuya" or sm == "Youmu" or sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Komachi":
-                                    if sm == "Tewi" or sm == "Reisen" or sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 5 if p1 == "Shikieiki":
-                                    if sm == "Youmu" or sm == "Reisen" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                # Stage 6 Opponents
-                                case 6 if p1 == "Reimu":
-                                    if sm == "Marisa" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Marisa":
-                                    if sm == "Reimu" or sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Sakuya":
-                                    if sm == "Tewi":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Youmu" or p1 == "Reisen" or p1 == "Medicine":
-                                    if sm == "Sakuya":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Cirno" or p1 == "Tewi":
-                                    if sm == "Reisen":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa":
-                                    if sm == "Youmu":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Mystia" or p1 == "Yuuka":
-                                    if sm == "Reimu":
-                                        story_opps()
-                                        break
-                                case 6 if p1 == "Aya" or p1 == "Komachi" or p1 == "Shikieiki":
-                                    if sm == "Marisa":
-                                        story_opps()
-                                        break
-                                # Stage 7 Opponents
-                                case 7 if p1 != "Sakuya" and p1 != "Reisen" and p1 != "Mystia" and p1 != "Tewi" and p1 != "Aya" and p1 != "Medicine" and p1 != "Komachi":
-                                    if sm == "Aya":
-                                        story_opps()
-                                        break
-                                case 7 if p1 == "Sakuya" or p1 == "Reisen" or p1 == "Mystia" or p1 == "Tewi" or p1 == "Aya":
-                                    if sm == "Medicine":
-                                        story_opps()
-                                        break
-                                case 7 if p1 == "Medicine" or p1 == "Komachi":
-                                    if sm == "Yuuka":
-                                        story_opps()
-                                        break
-                                # Stage 8 Opponents
-                                case 8 if p1 != "Cirno" and p1 != "Lyrica" and p1 != "Merlin" and p1 != "Lunasa" and p1 != "Mystia" and p1 != "Komachi":
-                                    if sm == "Komachi":
-                                        story_opps()
-                                        break
-                                case 8 if p1 == "Cirno" or p1 == "Lyrica" or p1 == "Merlin" or p1 == "Lunasa" or p1 == "Mystia":
-                                    if sm == "Yuuka":
-                                        story_opps()
-                                        break
-                                case 8 if p1 == "Komachi":
-                                    if sm == "Reimu":
-                                        story_opps()
-                                        break
-                                # Stage 9 Opponents
-                                case 9 if p1 != "Shikieiki":
-                                    if sm == "Shikieiki":
-                                        story_opps()
-                                        break
-                                case 9 if p1 == "Shikieiki":
-                                    if sm == "Reimu":
-                                        story_opps()
-                                        break
+                    opponent_order = characters.copy()
+                    world.random.shuffle(opponent_order)
+                    world.character_matchups[p1] = get_story_matchups(p1, opponent_order)
 
     # in_pool_characters stays as list of player enabled characters if enabled characters is not more than random_enabled_characters
     if len(world.e_char) <= random_enabled_characters or random_enabled_characters == 0: world.in_pool_characters = e_char
 
-    # Choosing locations not to remove
-    locationNamesToKeep: list[str] = ["Incident Resolved"] # List of location names
+# Called after before_create_regions, before any location objects exist. Return the set of location names to create for this player,
+# or None to create every enabled location. Victory locations are always created, so the goal can be chosen from them.
+def hook_get_location_names_to_keep(world: World, multiworld: MultiWorld, player: int) -> set[str] | None:
+    game_mode = get_option_value(multiworld, player, "game_mode")
+    character_items = get_option_value(multiworld, player, "character_items")
+    match_base_time = get_option_value(multiworld, player, "match_base_time")
+
+    # Choosing locations to create
+    locationNamesToKeep: set[str] = {"Incident Resolved"} # Set of location names
 
     if not game_mode:
         for p1 in world.in_pool_characters:
-            for i in range(1, 10): locationNamesToKeep.append(f"[{p1}] Stage {i}")
+            for i in range(1, 10): locationNamesToKeep.add(f"[{p1}] Stage {i}")
     else:
         p2mu = {}
 
@@ -438,22 +222,21 @@ def after_create_regions(world: World, multiworld: MultiWorld, player: int):
         for p1 in world.in_pool_characters:
             p2mu[p1 + "_m1p2"], p2mu[p1 + "_m2p2"], p2mu[p1 + "_m3p2"], p2mu[p1 + "_m4p2"] = world.character_matchups[p1][:4]
             p2mu[p1 + "_m5p2"], p2mu[p1 + "_m6p2"], p2mu[p1 + "_m7p2"], p2mu[p1 + "_m8p2"], p2mu[p1 + "_m9p2"] = world.character_matchups[p1][4:]
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m1p2"]} - {time1}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m2p2"]} - {time1}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m3p2"]} - {time2}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m4p2"]} - {time2}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m5p2"]} - {time3}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m6p2"]} - {time3}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m7p2"]} - {time4}")
-            locationNamesToKeep.append(f"[{p1}] VS {p2mu[p1 + "_m8p2"]} - {time4}")
-            locationNamesToKeep.append(f"[{p1}] Finale: VS {p2mu[p1 + "_m9p2"]} - {time5}")
-
-    # Add your code here to calculate which locations to remove
-    for region in multiworld.regions:
-        if region.player == player:
-            for location in list(region.locations):
-                if location.name not in locationNamesToKeep:
-                    region.locations.remove(location)
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m1p2"]} - {time1}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m2p2"]} - {time1}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m3p2"]} - {time2}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m4p2"]} - {time2}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m5p2"]} - {time3}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m6p2"]} - {time3}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m7p2"]} - {time4}")
+            locationNamesToKeep.add(f"[{p1}] VS {p2mu[p1 + "_m8p2"]} - {time4}")
+            locationNamesToKeep.add(f"[{p1}] Finale: VS {p2mu[p1 + "_m9p2"]} - {time5}")
+
+    return locationNamesToKeep
+
+# Called after regions and locations are created, in case you want to see or modify that information. Victory location is included.
+def after_create_regions(world: World, multiworld: MultiWorld, player: int):
+    pass
 
 # This hook allows you to access the item names & counts before the items are created. Use this to increase/decrease the amount of a specific item in the pool
 # Valid item_config key/values:
@@ -492,11 +275,11 @@ def before_create_items_starting(item_pool: list, world: World, multiworld: Mult
             else:
                 itemNamesToRemove.append(f"-1 Minute - {p1}")
 
-    for itemName in itemNamesToRemove:
-        item = next(i for i in item_pool if i.name == itemName)
-        item_pool.remove(item)
+    # ManualItemPool finds each item by name instead of scanning the whole pool for every removal
+    indexed_pool = ManualItemPool(item_pool)
+    indexed_pool.remove_names(itemNamesToRemove)
 
-    return item_pool
+    return indexed_pool.to_list()
 
 # The item pool after starting items are processed but before filler is added, in case you want to see the raw item pool at that stage
 def before_create_items_filler(item_pool: list, world: World, multiworld: MultiWorld, player: int) -> list:
@@ -508,11 +291,11 @@ def before_create_items_filler(item_pool: list, world: World, multiworld: MultiW
     # Because multiple copies of an item can exist, you need to add an item name
     # to the list multiple times if you want to remove multiple copies of it.
 
-    for itemName in itemNamesToRemove:
-        item = next(i for i in item_pool if i.name == itemName)
-        item_pool.remove(item)
+    # ManualItemPool finds each item by name instead of scanning the whole pool for every removal
+    indexed_pool = ManualItemPool(item_pool)
+    indexed_pool.remove_names(itemNamesToRemove)
 
-    return item_pool
+    return indexed_pool.to_list()
 
     # Some other useful hook options:
 
@@ -589,82 +372,82 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             s7reimu = multiworld.get_location("[Reimu] Stage 7", player)
             s8reimu = multiworld.get_location("[Reimu] Stage 8", player)
             s9reimu = multiworld.get_location("[Reimu] Stage 9", player)
-            s6reimu.access_rule = lambda state: (state.count("+1 Life - Reimu", world.player) >= s6access)
-            s7reimu.access_rule = lambda state: (state.count("+1 Life - Reimu", world.player) >= s7access)
-            s8reimu.access_rule = lambda state: (state.count("+1 Life - Reimu", world.player) >= s8access)
-            s9reimu.access_rule = lambda state: (state.count("+1 Life - Reimu", world.player) >= s9access)
+            world.set_threshold_rule(s6reimu, "+1 Life - Reimu", s6access)
+            world.set_threshold_rule(s7reimu, "+1 Life - Reimu", s7access)
+            world.set_threshold_rule(s8reimu, "+1 Life - Reimu", s8access)
+            world.set_threshold_rule(s9reimu, "+1 Life - Reimu", s9access)
         if "Marisa" in world.in_pool_characters:
             s6marisa = multiworld.get_location("[Marisa] Stage 6", player)
             s7marisa = multiworld.get_location("[Marisa] Stage 7", player)
             s8marisa = multiworld.get_location("[Marisa] Stage 8", player)
             s9marisa = multiworld.get_location("[Marisa] Stage 9", player)
-            s6marisa.access_rule = lambda state: (state.count("+1 Life - Marisa", world.player) >= s6access)
-            s7marisa.access_rule = lambda state: (state.count("+1 Life - Marisa", world.player) >= s7access)
-            s8marisa.access_rule = lambda state: (state.count("+1 Life - Marisa", world.player) >= s8access)
-            s9marisa.access_rule = lambda state: (state.count("+1 Life - Marisa", world.player) >= s9access)
+            world.set_threshold_rule(s6marisa, "+1 Life - Marisa", s6access)
+            world.set_threshold_rule(s7marisa, "+1 Life - Marisa", s7access)
+            world.set_threshold_rule(s8marisa, "+1 Life - Marisa", s8access)
+            world.set_threshold_rule(s9marisa, "+1 Life - Marisa", s9access)
         if "Sakuya" in world.in_pool_characters:
             s6sakuya = multiworld.get_location("[Sakuya] Stage 6", player)
             s7sakuya = multiworld.get_location("[Sakuya] Stage 7", player)
             s8sakuya = multiworld.get_location("[Sakuya] Stage 8", player)
             s9sakuya = multiworld.get_location("[Sakuya] Stage 9", player)
-            s6sakuya.access_rule = lambda state: (state.count("+1 Life - Sakuya", world.player) >= s6access)
-            s7sakuya.access_rule = lambda state: (state.count("+1 Life - Sakuya", world.player) >= s7access)
-            s8sakuya.access_rule = lambda state: (state.count("+1 Life - Sakuya", world.player) >= s8access)
-            s9sakuya.access_rule = lambda state: (state.count("+1 Life - Sakuya", world.player) >= s9access)
+            world.set_threshold_rule(s6sakuya, "+1 Life - Sakuya", s6access)
+            world.set_threshold_rule(s7sakuya, "+1 Life - Sakuya", s7access)
+            world.set_threshold_rule(s8sakuya, "+1 Life - Sakuya", s8access)
+            world.set_threshold_rule(s9sakuya, "+1 Life - Sakuya", s9access)
         if "Youmu" in world.in_pool_characters:
             s6youmu = multiworld.get_location("[Youmu] Stage 6", player)
             s7youmu = multiworld.get_location("[Youmu] Stage 7", player)
             s8youmu = multiworld.get_location("[Youmu] Stage 8", player)
             s9youmu = multiworld.get_location("[Youmu] Stage 9", player)
-            s6youmu.access_rule = lambda state: (state.count("+1 Life - Youmu", world.player) >= s6access)
-            s7youmu.access_rule = lambda state: (state.count("+1 Life - Youmu", world.player) >= s7access)
-            s8youmu.access_rule = lambda state: (state.count("+1 Life - Youmu", world.player) >= s8access)
-            s9youmu.access_rule = lambda state: (state.count("+1 Life - Youmu", world.player) >= s9access)
+            world.set_threshold_rule(s6youmu, "+1 Life - Youmu", s6access)
+            world.set_threshold_rule(s7youmu, "+1 Life - Youmu", s7access)
+            world.set_threshold_rule(s8youmu, "+1 Life - Youmu", s8access)
+            world.set_threshold_rule(s9youmu, "+1 Life - Youmu", s9access)
         if "Reisen" in world.in_pool_characters:
             s6reisen = multiworld.get_location("[Reisen] Stage 6", player)
             s7reisen = multiworld.get_location("[Reisen] Stage 7", player)
             s8reisen = multiworld.get_location("[Reisen] Stage 8", player)
             s9reisen = multiworld.get_location("[Reisen] Stage 9", player)
-            s6reisen.access_rule = lambda state: (state.count("+1 Life - Reisen", world.player) >= s6access)
-            s7reisen.access_rule = lambda state: (state.count("+1 Life - Reisen", world.player) >= s7access)
-            s8reisen.access_rule = lambda state: (state.count("+1 Life - Reisen", world.player) >= s8access)
-            s9reisen.access_rule = lambda state: (state.count("+1 Life - Reisen", world.player) >= s9access)
+            world.set_threshold_rule(s6reisen, "+1 Life - Reisen", s6access)
+            world.set_threshold_rule(s7reisen, "+1 Life - Reisen", s7access)
+            world.set_threshold_rule(s8reisen, "+1 Life - Reisen", s8access)
+            world.set_threshold_rule(s9reisen, "+1 Life - Reisen", s9access)
         if "Cirno" in world.in_pool_characters:
             s6cirno = multiworld.get_location("[Cirno] Stage 6", player)
             s7cirno = multiworld.get_location("[Cirno] Stage 7", player)
             s8cirno = multiworld.get_location("[Cirno] Stage 8", player)
             s9cirno = multiworld.get_location("[Cirno] Stage 9", player)
-            s6cirno.access_rule = lambda state: (state.count("+1 Life - Cirno", world.player) >= s6access)
-            s7cirno.access_rule = lambda state: (state.count("+1 Life - Cirno", world.player) >= s7access)
-            s8cirno.access_rule = lambda state: (state.count("+1 Life - Cirno", world.player) >= s8access)
-            s9cirno.access_rule = lambda state: (state.count("+1 Life - Cirno", world.player) >= s9access)
+            world.set_threshold_rule(s6cirno, "+1 Life - Cirno", s6access)
+            world.set_threshold_rule(s7cirno, "+1 Life - Cirno", s7access)
+            world.set_threshold_rule(s8cirno, "+1 Life - Cirno", s8access)
+            world.set_threshold_rule(s9cirno, "+1 Life - Cirno", s9access)
         if "Lyrica" in world.in_pool_characters:
             s6lyrica = multiworld.get_location("[Lyrica] Stage 6", player)
             s7lyrica = multiworld.get_location("[Lyrica] Stage 7", player)
             s8lyrica = multiworld.get_location("[Lyrica] Stage 8", player)
             s9lyrica = multiworld.get_location("[Lyrica] Stage 9", player)
-            s6lyrica.access_rule = lambda state: (state.count("+1 Life - Lyrica", world.player) >= s6access)
-            s7lyrica.access_rule = lambda state: (state.count("+1 Life - Lyrica", world.player) >= s7access)
-            s8lyrica.access_rule = lambda state: (state.count("+1 Life - Lyrica", world.player) >= s8access)
-            s9lyrica.access_rule = lambda state: (state.count("+1 Life - Lyrica", world.player) >= s9access)
+            world.set_threshold_rule(s6lyrica, "+1 Life - Lyrica", s6access)
+            world.set_threshold_rule(s7lyrica, "+1 Life - Lyrica", s7access)
+            world.set_threshold_rule(s8lyrica, "+1 Life - Lyrica", s8access)
+            world.set_threshold_rule(s9lyrica, "+1 Life - Lyrica", s9access)
         if "Mystia" in world.in_pool_characters:
             s6mystia = multiworld.get_location("[Mystia] Stage 6", player)
             s7mystia = multiworld.get_location("[Mystia] Stage 7", player)
             s8mystia = multiworld.get_location("[Mystia] Stage 8", player)
             s9mystia = multiworld.get_location("[Mystia] Stage 9", player)
-            s6mystia.access_rule = lambda state: (state.count("+1 Life - Mystia", world.player) >= s6access)
-            s7mystia.access_rule = lambda state: (state.count("+1 Life - Mystia", world.player) >= s7access)
-            s8mystia.access_rule = lambda state: (state.count("+1 Life - Mystia", world.player) >= s8access)
-            s9mystia.access_rule = lambda state: (state.count("+1 Life - Mystia", world.player) >= s9access)
+            world.set_threshold_rule(s6mystia, "+1 Life - Mystia", s6access)
+            world.set_threshold_rule(s7mystia, "+1 Life - Mystia", s7access)
+            world.set_threshold_rule(s8mystia, "+1 Life - Mystia", s8access)
+            world.set_threshold_rule(s9mystia, "+1 Life - Mystia", s9access)
         if "Tewi" in world.in_pool_characters:
             s6tewi = multiworld.get_location("[Tewi] Stage 6", player)
             s7tewi = multiworld.get_location("[Tewi] Stage 7", player)
             s8tewi = multiworld.get_location("[Tewi] Stage 8", player)
             s9tewi = multiworld.get_location("[Tewi] Stage 9", player)
-            s6tewi.access_rule = lambda state: (state.count("+1 Life - Tewi", world.player) >= s6access)
-            s7tewi.access_rule = lambda state: (state.count("+1 Life - Tewi", world.player) >= s7access)
-            s8tewi.access_rule = lambda state: (state.count("+1 Life - Tewi", world.player) >= s8access)
-            s9tewi.access_rule = lambda state: (state.count("+1 Life - Tewi", world.player) >= s9access)
+            world.set_threshold_rule(s6tewi, "+1 Life - Tewi", s6access)
+            world.set_threshold_rule(s7tewi, "+1 Life - Tewi", s7access)
+            world.set_threshold_rule(s8tewi, "+1 Life - Tewi", s8access)
+            world.set_threshold_rule(s9tewi, "+1 Life - Tewi", s9access)
         if "Aya" in world.in_pool_characters:
             s6aya = multiworld.get_location("[Aya] Stage 6", player)
             s7aya = multiworld.get_location("[Aya] Stage 7", player)
@@ -676,10 +459,10 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
                 s8aya.access_rule = lambda state: True
                 s9aya.access_rule = lambda state: True
             else:
-                s6aya.access_rule = lambda state: (state.count("+1 Life - Aya", world.player) >= s6access)
-                s7aya.access_rule = lambda state: (state.count("+1 Life - Aya", world.player) >= s7access)
-                s8aya.access_rule = lambda state: (state.count("+1 Life - Aya", world.player) >= s8access)
-                s9aya.access_rule = lambda state: (state.count("+1 Life - Aya", world.player) >= s9access)
+                world.set_threshold_rule(s6aya, "+1 Life - Aya", s6access)
+                world.set_threshold_rule(s7aya, "+1 Life - Aya", s7access)
+                world.set_threshold_rule(s8aya, "+1 Life - Aya", s8access)
+                world.set_threshold_rule(s9aya, "+1 Life - Aya", s9access)
         if "Medicine" in world.in_pool_characters:
             s6medicine = multiworld.get_location("[Medicine] Stage 6", player)
             s7medicine = multiworld.get_location("[Medicine] Stage 7", player)
@@ -691,37 +474,37 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
                 s8medicine.access_rule = lambda state: True
                 s9medicine.access_rule = lambda state: True
             else:
-                s6medicine.access_rule = lambda state: (state.count("+1 Life - Medicine", world.player) >= s6access)
-                s7medicine.access_rule = lambda state: (state.count("+1 Life - Medicine", world.player) >= s7access)
-                s8medicine.access_rule = lambda state: (state.count("+1 Life - Medicine", world.player) >= s8access)
-                s9medicine.access_rule = lambda state: (state.count("+1 Life - Medicine", world.player) >= s9access)
+                world.set_threshold_rule(s6medicine, "+1 Life - Medicine", s6access)
+                world.set_threshold_rule(s7medicine, "+1 Life - Medicine", s7access)
+                world.set_threshold_rule(s8medicine, "+1 Life - Medicine", s8access)
+                world.set_threshold_rule(s9medicine, "+1 Life - Medicine", s9access)
         if "Yuuka" in world.in_pool_characters:
             s6yuuka = multiworld.get_location("[Yuuka] Stage 6", player)
             s7yuuka = multiworld.get_location("[Yuuka] Stage 7", player)
             s8yuuka = multiworld.get_location("[Yuuka] Stage 8", player)
             s9yuuka = multiworld.get_location("[Yuuka] Stage 9", player)
-            s6yuuka.access_rule = lambda state: (state.count("+1 Life - Yuuka", world.player) >= s6access)
-            s7yuuka.access_rule = lambda state: (state.count("+1 Life - Yuuka", world.player) >= s7access)
-            s8yuuka.access_rule = lambda state: (state.count("+1 Life - Yuuka", world.player) >= s8access)
-            s9yuuka.access_rule = lambda state: (state.count("+1 Life - Yuuka", world.player) >= s9access)
+            world.set_threshold_rule(s6yuuka, "+1 Life - Yuuka", s6access)
+            world.set_threshold_rule(s7yuuka, "+1 Life - Yuuka", s7access)
+            world.set_threshold_rule(s8yuuka, "+1 Life - Yuuka", s8access)
+            world.set_threshold_rule(s9yuuka, "+1 Life - Yuuka", s9access)
         if "Komachi" in world.in_pool_characters:
             s6komachi = multiworld.get_location("[Komachi] Stage 6", player)
             s7komachi = multiworld.get_location("[Komachi] Stage 7", player)
             s8komachi = multiworld.get_location("[Komachi] Stage 8", player)
             s9komachi = multiworld.get_location("[Komachi] Stage 9", player)
-            s6komachi.access_rule = lambda state: (state.count("+1 Life - Komachi", world.player) >= s6access)
-            s7komachi.access_rule = lambda state: (state.count("+1 Life - Komachi", world.player) >= s7access)
-            s8komachi.access_rule = lambda state: (state.count("+1 Life - Komachi", world.player) >= s8access)
-            s9komachi.access_rule = lambda state: (state.count("+1 Life - Komachi", world.player) >= s9access)
+            world.set_threshold_rule(s6komachi, "+1 Life - Komachi", s6access)
+            world.set_threshold_rule(s7komachi, "+1 Life - Komachi", s7access)
+            world.set_threshold_rule(s8komachi, "+1 Life - Komachi", s8access)
+            world.set_threshold_rule(s9komachi, "+1 Life - Komachi", s9access)
         if "Shikieiki" in world.in_pool_characters:
             s6shikieiki = multiworld.get_location("[Shikieiki] Stage 6", player)
             s7shikieiki = multiworld.get_location("[Shikieiki] Stage 7", player)
             s8shikieiki = multiworld.get_location("[Shikieiki] Stage 8", player)
             s9shikieiki = multiworld.get_location("[Shikieiki] Stage 9", player)
-            s6shikieiki.access_rule = lambda state: (state.count("+1 Life - Shikieiki", world.player) >= s6access)
-            s7shikieiki.access_rule = lambda state: (state.count("+1 Life - Shikieiki", world.player) >= s7access)
-            s8shikieiki.access_rule = lambda state: (state.count("+1 Life - Shikieiki", world.player) >= s8access)
-            s9shikieiki.access_rule = lambda state: (state.count("+1 Life - Shikieiki", world.player) >= s9access)
+            world.set_threshold_rule(s6shikieiki, "+1 Life - Shikieiki", s6access)
+            world.set_threshold_rule(s7shikieiki, "+1 Life - Shikieiki", s7access)
+            world.set_threshold_rule(s8shikieiki, "+1 Life - Shikieiki", s8access)
+            world.set_threshold_rule(s9shikieiki, "+1 Life - Shikieiki", s9access)
 
     # Match Mode access rules
     if game_mode == 1:
@@ -764,15 +547,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7reimu = multiworld.get_location(f"[Reimu] VS {m7p2} - {time4}", player)
             m8reimu = multiworld.get_location(f"[Reimu] VS {m8p2} - {time4}", player)
             m9reimu = multiworld.get_location(f"[Reimu] Finale: VS {m9p2} - {time5}", player)
-            m1reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m1access)
-            m2reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m1access)
-            m3reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m2access)
-            m4reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m2access)
-            m5reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m3access)
-            m6reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m3access)
-            m7reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m4access)
-            m8reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m4access)
-            m9reimu.access_rule = lambda state: (state.count("-1 Minute - Reimu", world.player) >= m5access)
+            world.set_threshold_rule(m1reimu, "-1 Minute - Reimu", m1access)
+            world.set_threshold_rule(m2reimu, "-1 Minute - Reimu", m1access)
+            world.set_threshold_rule(m3reimu, "-1 Minute - Reimu", m2access)
+            world.set_threshold_rule(m4reimu, "-1 Minute - Reimu", m2access)
+            world.set_threshold_rule(m5reimu, "-1 Minute - Reimu", m3access)
+            world.set_threshold_rule(m6reimu, "-1 Minute - Reimu", m3access)
+            world.set_threshold_rule(m7reimu, "-1 Minute - Reimu", m4access)
+            world.set_threshold_rule(m8reimu, "-1 Minute - Reimu", m4access)
+            world.set_threshold_rule(m9reimu, "-1 Minute - Reimu", m5access)
         if "Marisa" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Marisa"]
             m1marisa = multiworld.get_location(f"[Marisa] VS {m1p2} - {time1}", player)
@@ -784,15 +567,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7marisa = multiworld.get_location(f"[Marisa] VS {m7p2} - {time4}", player)
             m8marisa = multiworld.get_location(f"[Marisa] VS {m8p2} - {time4}", player)
             m9marisa = multiworld.get_location(f"[Marisa] Finale: VS {m9p2} - {time5}", player)
-            m1marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m1access)
-            m2marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m1access)
-            m3marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m2access)
-            m4marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m2access)
-            m5marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m3access)
-            m6marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m3access)
-            m7marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m4access)
-            m8marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m4access)
-            m9marisa.access_rule = lambda state: (state.count("-1 Minute - Marisa", world.player) >= m5access)
+            world.set_threshold_rule(m1marisa, "-1 Minute - Marisa", m1access)
+            world.set_threshold_rule(m2marisa, "-1 Minute - Marisa", m1access)
+            world.set_threshold_rule(m3marisa, "-1 Minute - Marisa", m2access)
+            world.set_threshold_rule(m4marisa, "-1 Minute - Marisa", m2access)
+            world.set_threshold_rule(m5marisa, "-1 Minute - Marisa", m3access)
+            world.set_threshold_rule(m6marisa, "-1 Minute - Marisa", m3access)
+            world.set_threshold_rule(m7marisa, "-1 Minute - Marisa", m4access)
+            world.set_threshold_rule(m8marisa, "-1 Minute - Marisa", m4access)
+            world.set_threshold_rule(m9marisa, "-1 Minute - Marisa", m5access)
         if "Sakuya" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Sakuya"]
             m1sakuya = multiworld.get_location(f"[Sakuya] VS {m1p2} - {time1}", player)
@@ -804,15 +587,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7sakuya = multiworld.get_location(f"[Sakuya] VS {m7p2} - {time4}", player)
             m8sakuya = multiworld.get_location(f"[Sakuya] VS {m8p2} - {time4}", player)
             m9sakuya = multiworld.get_location(f"[Sakuya] Finale: VS {m9p2} - {time5}", player)
-            m1sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m1access)
-            m2sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m1access)
-            m3sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m2access)
-            m4sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m2access)
-            m5sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m3access)
-            m6sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m3access)
-            m7sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m4access)
-            m8sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m4access)
-            m9sakuya.access_rule = lambda state: (state.count("-1 Minute - Sakuya", world.player) >= m5access)
+            world.set_threshold_rule(m1sakuya, "-1 Minute - Sakuya", m1access)
+            world.set_threshold_rule(m2sakuya, "-1 Minute - Sakuya", m1access)
+            world.set_threshold_rule(m3sakuya, "-1 Minute - Sakuya", m2access)
+            world.set_threshold_rule(m4sakuya, "-1 Minute - Sakuya", m2access)
+            world.set_threshold_rule(m5sakuya, "-1 Minute - Sakuya", m3access)
+            world.set_threshold_rule(m6sakuya, "-1 Minute - Sakuya", m3access)
+            world.set_threshold_rule(m7sakuya, "-1 Minute - Sakuya", m4access)
+            world.set_threshold_rule(m8sakuya, "-1 Minute - Sakuya", m4access)
+            world.set_threshold_rule(m9sakuya, "-1 Minute - Sakuya", m5access)
         if "Youmu" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Youmu"]
             m1youmu = multiworld.get_location(f"[Youmu] VS {m1p2} - {time1}", player)
@@ -824,15 +607,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7youmu = multiworld.get_location(f"[Youmu] VS {m7p2} - {time4}", player)
             m8youmu = multiworld.get_location(f"[Youmu] VS {m8p2} - {time4}", player)
             m9youmu = multiworld.get_location(f"[Youmu] Finale: VS {m9p2} - {time5}", player)
-            m1youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m1access)
-            m2youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m1access)
-            m3youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m2access)
-            m4youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m2access)
-            m5youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m3access)
-            m6youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m3access)
-            m7youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m4access)
-            m8youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m4access)
-            m9youmu.access_rule = lambda state: (state.count("-1 Minute - Youmu", world.player) >= m5access)
+            world.set_threshold_rule(m1youmu, "-1 Minute - Youmu", m1access)
+            world.set_threshold_rule(m2youmu, "-1 Minute - Youmu", m1access)
+            world.set_threshold_rule(m3youmu, "-1 Minute - Youmu", m2access)
+            world.set_threshold_rule(m4youmu, "-1 Minute - Youmu", m2access)
+            world.set_threshold_rule(m5youmu, "-1 Minute - Youmu", m3access)
+            world.set_threshold_rule(m6youmu, "-1 Minute - Youmu", m3access)
+            world.set_threshold_rule(m7youmu, "-1 Minute - Youmu", m4access)
+            world.set_threshold_rule(m8youmu, "-1 Minute - Youmu", m4access)
+            world.set_threshold_rule(m9youmu, "-1 Minute - Youmu", m5access)
         if "Reisen" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Reisen"]
             m1reisen = multiworld.get_location(f"[Reisen] VS {m1p2} - {time1}", player)
@@ -844,15 +627,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7reisen = multiworld.get_location(f"[Reisen] VS {m7p2} - {time4}", player)
             m8reisen = multiworld.get_location(f"[Reisen] VS {m8p2} - {time4}", player)
             m9reisen = multiworld.get_location(f"[Reisen] Finale: VS {m9p2} - {time5}", player)
-            m1reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m1access)
-            m2reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m1access)
-            m3reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m2access)
-            m4reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m2access)
-            m5reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m3access)
-            m6reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m3access)
-            m7reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m4access)
-            m8reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m4access)
-            m9reisen.access_rule = lambda state: (state.count("-1 Minute - Reisen", world.player) >= m5access)
+            world.set_threshold_rule(m1reisen, "-1 Minute - Reisen", m1access)
+            world.set_threshold_rule(m2reisen, "-1 Minute - Reisen", m1access)
+            world.set_threshold_rule(m3reisen, "-1 Minute - Reisen", m2access)
+            world.set_threshold_rule(m4reisen, "-1 Minute - Reisen", m2access)
+            world.set_threshold_rule(m5reisen, "-1 Minute - Reisen", m3access)
+            world.set_threshold_rule(m6reisen, "-1 Minute - Reisen", m3access)
+            world.set_threshold_rule(m7reisen, "-1 Minute - Reisen", m4access)
+            world.set_threshold_rule(m8reisen, "-1 Minute - Reisen", m4access)
+            world.set_threshold_rule(m9reisen, "-1 Minute - Reisen", m5access)
         if "Cirno" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Cirno"]
             m1cirno = multiworld.get_location(f"[Cirno] VS {m1p2} - {time1}", player)
@@ -864,15 +647,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7cirno = multiworld.get_location(f"[Cirno] VS {m7p2} - {time4}", player)
             m8cirno = multiworld.get_location(f"[Cirno] VS {m8p2} - {time4}", player)
             m9cirno = multiworld.get_location(f"[Cirno] Finale: VS {m9p2} - {time5}", player)
-            m1cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m1access)
-            m2cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m1access)
-            m3cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m2access)
-            m4cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m2access)
-            m5cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m3access)
-            m6cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m3access)
-            m7cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m4access)
-            m8cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m4access)
-            m9cirno.access_rule = lambda state: (state.count("-1 Minute - Cirno", world.player) >= m5access)
+            world.set_threshold_rule(m1cirno, "-1 Minute - Cirno", m1access)
+            world.set_threshold_rule(m2cirno, "-1 Minute - Cirno", m1access)
+            world.set_threshold_rule(m3cirno, "-1 Minute - Cirno", m2access)
+            world.set_threshold_rule(m4cirno, "-1 Minute - Cirno", m2access)
+            world.set_threshold_rule(m5cirno, "-1 Minute - Cirno", m3access)
+            world.set_threshold_rule(m6cirno, "-1 Minute - Cirno", m3access)
+            world.set_threshold_rule(m7cirno, "-1 Minute - Cirno", m4access)
+            world.set_threshold_rule(m8cirno, "-1 Minute - Cirno", m4access)
+            world.set_threshold_rule(m9cirno, "-1 Minute - Cirno", m5access)
         if "Lyrica" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Lyrica"]
             m1lyrica = multiworld.get_location(f"[Lyrica] VS {m1p2} - {time1}", player)
@@ -884,15 +667,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7lyrica = multiworld.get_location(f"[Lyrica] VS {m7p2} - {time4}", player)
             m8lyrica = multiworld.get_location(f"[Lyrica] VS {m8p2} - {time4}", player)
             m9lyrica = multiworld.get_location(f"[Lyrica] Finale: VS {m9p2} - {time5}", player)
-            m1lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m1access)
-            m2lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m1access)
-            m3lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m2access)
-            m4lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m2access)
-            m5lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m3access)
-            m6lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m3access)
-            m7lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m4access)
-            m8lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m4access)
-            m9lyrica.access_rule = lambda state: (state.count("-1 Minute - Lyrica", world.player) >= m5access)
+            world.set_threshold_rule(m1lyrica, "-1 Minute - Lyrica", m1access)
+            world.set_threshold_rule(m2lyrica, "-1 Minute - Lyrica", m1access)
+            world.set_threshold_rule(m3lyrica, "-1 Minute - Lyrica", m2access)
+            world.set_threshold_rule(m4lyrica, "-1 Minute - Lyrica", m2access)
+            world.set_threshold_rule(m5lyrica, "-1 Minute - Lyrica", m3access)
+            world.set_threshold_rule(m6lyrica, "-1 Minute - Lyrica", m3access)
+            world.set_threshold_rule(m7lyrica, "-1 Minute - Lyrica", m4access)
+            world.set_threshold_rule(m8lyrica, "-1 Minute - Lyrica", m4access)
+            world.set_threshold_rule(m9lyrica, "-1 Minute - Lyrica", m5access)
         if "Merlin" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Merlin"]
             m1merlin = multiworld.get_location(f"[Merlin] VS {m1p2} - {time1}", player)
@@ -904,15 +687,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7merlin = multiworld.get_location(f"[Merlin] VS {m7p2} - {time4}", player)
             m8merlin = multiworld.get_location(f"[Merlin] VS {m8p2} - {time4}", player)
             m9merlin = multiworld.get_location(f"[Merlin] Finale: VS {m9p2} - {time5}", player)
-            m1merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m1access)
-            m2merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m1access)
-            m3merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m2access)
-            m4merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m2access)
-            m5merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m3access)
-            m6merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m3access)
-            m7merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m4access)
-            m8merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m4access)
-            m9merlin.access_rule = lambda state: (state.count("-1 Minute - Merlin", world.player) >= m5access)
+            world.set_threshold_rule(m1merlin, "-1 Minute - Merlin", m1access)
+            world.set_threshold_rule(m2merlin, "-1 Minute - Merlin", m1access)
+            world.set_threshold_rule(m3merlin, "-1 Minute - Merlin", m2access)
+            world.set_threshold_rule(m4merlin, "-1 Minute - Merlin", m2access)
+            world.set_threshold_rule(m5merlin, "-1 Minute - Merlin", m3access)
+            world.set_threshold_rule(m6merlin, "-1 Minute - Merlin", m3access)
+            world.set_threshold_rule(m7merlin, "-1 Minute - Merlin", m4access)
+            world.set_threshold_rule(m8merlin, "-1 Minute - Merlin", m4access)
+            world.set_threshold_rule(m9merlin, "-1 Minute - Merlin", m5access)
         if "Lunasa" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Lunasa"]
             m1lunasa = multiworld.get_location(f"[Lunasa] VS {m1p2} - {time1}", player)
@@ -924,15 +707,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7lunasa = multiworld.get_location(f"[Lunasa] VS {m7p2} - {time4}", player)
             m8lunasa = multiworld.get_location(f"[Lunasa] VS {m8p2} - {time4}", player)
             m9lunasa = multiworld.get_location(f"[Lunasa] Finale: VS {m9p2} - {time5}", player)
-            m1lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m1access)
-            m2lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m1access)
-            m3lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m2access)
-            m4lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m2access)
-            m5lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m3access)
-            m6lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m3access)
-            m7lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m4access)
-            m8lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m4access)
-            m9lunasa.access_rule = lambda state: (state.count("-1 Minute - Lunasa", world.player) >= m5access)
+            world.set_threshold_rule(m1lunasa, "-1 Minute - Lunasa", m1access)
+            world.set_threshold_rule(m2lunasa, "-1 Minute - Lunasa", m1access)
+            world.set_threshold_rule(m3lunasa, "-1 Minute - Lunasa", m2access)
+            world.set_threshold_rule(m4lunasa, "-1 Minute - Lunasa", m2access)
+            world.set_threshold_rule(m5lunasa, "-1 Minute - Lunasa", m3access)
+            world.set_threshold_rule(m6lunasa, "-1 Minute - Lunasa", m3access)
+            world.set_threshold_rule(m7lunasa, "-1 Minute - Lunasa", m4access)
+            world.set_threshold_rule(m8lunasa, "-1 Minute - Lunasa", m4access)
+            world.set_threshold_rule(m9lunasa, "-1 Minute - Lunasa", m5access)
         if "Mystia" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Mystia"]
             m1mystia = multiworld.get_location(f"[Mystia] VS {m1p2} - {time1}", player)
@@ -944,15 +727,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7mystia = multiworld.get_location(f"[Mystia] VS {m7p2} - {time4}", player)
             m8mystia = multiworld.get_location(f"[Mystia] VS {m8p2} - {time4}", player)
             m9mystia = multiworld.get_location(f"[Mystia] Finale: VS {m9p2} - {time5}", player)
-            m1mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m1access)
-            m2mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m1access)
-            m3mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m2access)
-            m4mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m2access)
-            m5mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m3access)
-            m6mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m3access)
-            m7mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m4access)
-            m8mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m4access)
-            m9mystia.access_rule = lambda state: (state.count("-1 Minute - Mystia", world.player) >= m5access)
+            world.set_threshold_rule(m1mystia, "-1 Minute - Mystia", m1access)
+            world.set_threshold_rule(m2mystia, "-1 Minute - Mystia", m1access)
+            world.set_threshold_rule(m3mystia, "-1 Minute - Mystia", m2access)
+            world.set_threshold_rule(m4mystia, "-1 Minute - Mystia", m2access)
+            world.set_threshold_rule(m5mystia, "-1 Minute - Mystia", m3access)
+            world.set_threshold_rule(m6mystia, "-1 Minute - Mystia", m3access)
+            world.set_threshold_rule(m7mystia, "-1 Minute - Mystia", m4access)
+            world.set_threshold_rule(m8mystia, "-1 Minute - Mystia", m4access)
+            world.set_threshold_rule(m9mystia, "-1 Minute - Mystia", m5access)
         if "Tewi" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Tewi"]
             m1tewi = multiworld.get_location(f"[Tewi] VS {m1p2} - {time1}", player)
@@ -964,15 +747,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7tewi = multiworld.get_location(f"[Tewi] VS {m7p2} - {time4}", player)
             m8tewi = multiworld.get_location(f"[Tewi] VS {m8p2} - {time4}", player)
             m9tewi = multiworld.get_location(f"[Tewi] Finale: VS {m9p2} - {time5}", player)
-            m1tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m1access)
-            m2tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m1access)
-            m3tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m2access)
-            m4tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m2access)
-            m5tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m3access)
-            m6tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m3access)
-            m7tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m4access)
-            m8tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m4access)
-            m9tewi.access_rule = lambda state: (state.count("-1 Minute - Tewi", world.player) >= m5access)
+            world.set_threshold_rule(m1tewi, "-1 Minute - Tewi", m1access)
+            world.set_threshold_rule(m2tewi, "-1 Minute - Tewi", m1access)
+            world.set_threshold_rule(m3tewi, "-1 Minute - Tewi", m2access)
+            world.set_threshold_rule(m4tewi, "-1 Minute - Tewi", m2access)
+            world.set_threshold_rule(m5tewi, "-1 Minute - Tewi", m3access)
+            world.set_threshold_rule(m6tewi, "-1 Minute - Tewi", m3access)
+            world.set_threshold_rule(m7tewi, "-1 Minute - Tewi", m4access)
+            world.set_threshold_rule(m8tewi, "-1 Minute - Tewi", m4access)
+            world.set_threshold_rule(m9tewi, "-1 Minute - Tewi", m5access)
         if "Aya" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Aya"]
             m1aya = multiworld.get_location(f"[Aya] VS {m1p2} - {time1}", player)
@@ -995,15 +778,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
                 m8aya.access_rule = lambda state: True
                 m9aya.access_rule = lambda state: True
             else:
-                m1aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m1access)
-                m2aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m1access)
-                m3aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m2access)
-                m4aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m2access)
-                m5aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m3access)
-                m6aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m3access)
-                m7aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m4access)
-                m8aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m4access)
-                m9aya.access_rule = lambda state: (state.count("-1 Minute - Aya", world.player) >= m5access)
+                world.set_threshold_rule(m1aya, "-1 Minute - Aya", m1access)
+                world.set_threshold_rule(m2aya, "-1 Minute - Aya", m1access)
+                world.set_threshold_rule(m3aya, "-1 Minute - Aya", m2access)
+                world.set_threshold_rule(m4aya, "-1 Minute - Aya", m2access)
+                world.set_threshold_rule(m5aya, "-1 Minute - Aya", m3access)
+                world.set_threshold_rule(m6aya, "-1 Minute - Aya", m3access)
+                world.set_threshold_rule(m7aya, "-1 Minute - Aya", m4access)
+                world.set_threshold_rule(m8aya, "-1 Minute - Aya", m4access)
+                world.set_threshold_rule(m9aya, "-1 Minute - Aya", m5access)
         if "Medicine" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Medicine"]
             m1medicine = multiworld.get_location(f"[Medicine] VS {m1p2} - {time1}", player)
@@ -1026,15 +809,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
                 m8medicine.access_rule = lambda state: True
                 m9medicine.access_rule = lambda state: True
             else:
-                m1medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m1access)
-                m2medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m1access)
-                m3medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m2access)
-                m4medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m2access)
-                m5medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m3access)
-                m6medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m3access)
-                m7medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m4access)
-                m8medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m4access)
-                m9medicine.access_rule = lambda state: (state.count("-1 Minute - Medicine", world.player) >= m5access)
+                world.set_threshold_rule(m1medicine, "-1 Minute - Medicine", m1access)
+                world.set_threshold_rule(m2medicine, "-1 Minute - Medicine", m1access)
+                world.set_threshold_rule(m3medicine, "-1 Minute - Medicine", m2access)
+                world.set_threshold_rule(m4medicine, "-1 Minute - Medicine", m2access)
+                world.set_threshold_rule(m5medicine, "-1 Minute - Medicine", m3access)
+                world.set_threshold_rule(m6medicine, "-1 Minute - Medicine", m3access)
+                world.set_threshold_rule(m7medicine, "-1 Minute - Medicine", m4access)
+                world.set_threshold_rule(m8medicine, "-1 Minute - Medicine", m4access)
+                world.set_threshold_rule(m9medicine, "-1 Minute - Medicine", m5access)
         if "Yuuka" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Yuuka"]
             m1yuuka = multiworld.get_location(f"[Yuuka] VS {m1p2} - {time1}", player)
@@ -1046,15 +829,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7yuuka = multiworld.get_location(f"[Yuuka] VS {m7p2} - {time4}", player)
             m8yuuka = multiworld.get_location(f"[Yuuka] VS {m8p2} - {time4}", player)
             m9yuuka = multiworld.get_location(f"[Yuuka] Finale: VS {m9p2} - {time5}", player)
-            m1yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m1access)
-            m2yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m1access)
-            m3yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m2access)
-            m4yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m2access)
-            m5yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m3access)
-            m6yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m3access)
-            m7yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m4access)
-            m8yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m4access)
-            m9yuuka.access_rule = lambda state: (state.count("-1 Minute - Yuuka", world.player) >= m5access)
+            world.set_threshold_rule(m1yuuka, "-1 Minute - Yuuka", m1access)
+            world.set_threshold_rule(m2yuuka, "-1 Minute - Yuuka", m1access)
+            world.set_threshold_rule(m3yuuka, "-1 Minute - Yuuka", m2access)
+            world.set_threshold_rule(m4yuuka, "-1 Minute - Yuuka", m2access)
+            world.set_threshold_rule(m5yuuka, "-1 Minute - Yuuka", m3access)
+            world.set_threshold_rule(m6yuuka, "-1 Minute - Yuuka", m3access)
+            world.set_threshold_rule(m7yuuka, "-1 Minute - Yuuka", m4access)
+            world.set_threshold_rule(m8yuuka, "-1 Minute - Yuuka", m4access)
+            world.set_threshold_rule(m9yuuka, "-1 Minute - Yuuka", m5access)
         if "Komachi" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Komachi"]
             m1komachi = multiworld.get_location(f"[Komachi] VS {m1p2} - {time1}", player)
@@ -1066,15 +849,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7komachi = multiworld.get_location(f"[Komachi] VS {m7p2} - {time4}", player)
             m8komachi = multiworld.get_location(f"[Komachi] VS {m8p2} - {time4}", player)
             m9komachi = multiworld.get_location(f"[Komachi] Finale: VS {m9p2} - {time5}", player)
-            m1komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m1access)
-            m2komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m1access)
-            m3komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m2access)
-            m4komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m2access)
-            m5komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m3access)
-            m6komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m3access)
-            m7komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m4access)
-            m8komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m4access)
-            m9komachi.access_rule = lambda state: (state.count("-1 Minute - Komachi", world.player) >= m5access)
+            world.set_threshold_rule(m1komachi, "-1 Minute - Komachi", m1access)
+            world.set_threshold_rule(m2komachi, "-1 Minute - Komachi", m1access)
+            world.set_threshold_rule(m3komachi, "-1 Minute - Komachi", m2access)
+            world.set_threshold_rule(m4komachi, "-1 Minute - Komachi", m2access)
+            world.set_threshold_rule(m5komachi, "-1 Minute - Komachi", m3access)
+            world.set_threshold_rule(m6komachi, "-1 Minute - Komachi", m3access)
+            world.set_threshold_rule(m7komachi, "-1 Minute - Komachi", m4access)
+            world.set_threshold_rule(m8komachi, "-1 Minute - Komachi", m4access)
+            world.set_threshold_rule(m9komachi, "-1 Minute - Komachi", m5access)
         if "Shikieiki" in world.in_pool_characters:
             m1p2, m2p2, m3p2, m4p2, m5p2, m6p2, m7p2, m8p2, m9p2 = world.character_matchups["Shikieiki"]
             m1shikieiki = multiworld.get_location(f"[Shikieiki] VS {m1p2} - {time1}", player)
@@ -1086,15 +869,15 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
             m7shikieiki = multiworld.get_location(f"[Shikieiki] VS {m7p2} - {time4}", player)
             m8shikieiki = multiworld.get_location(f"[Shikieiki] VS {m8p2} - {time4}", player)
             m9shikieiki = multiworld.get_location(f"[Shikieiki] Finale: VS {m9p2} - {time5}", player)
-            m1shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m1access)
-            m2shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m1access)
-            m3shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m2access)
-            m4shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m2access)
-            m5shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m3access)
-            m6shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m3access)
-            m7shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m4access)
-            m8shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m4access)
-            m9shikieiki.access_rule = lambda state: (state.count("-1 Minute - Shikieiki", world.player) >= m5access)
+            world.set_threshold_rule(m1shikieiki, "-1 Minute - Shikieiki", m1access)
+            world.set_threshold_rule(m2shikieiki, "-1 Minute - Shikieiki", m1access)
+            world.set_threshold_rule(m3shikieiki, "-1 Minute - Shikieiki", m2access)
+            world.set_threshold_rule(m4shikieiki, "-1 Minute - Shikieiki", m2access)
+            world.set_threshold_rule(m5shikieiki, "-1 Minute - Shikieiki", m3access)
+            world.set_threshold_rule(m6shikieiki, "-1 Minute - Shikieiki", m3access)
+            world.set_threshold_rule(m7shikieiki, "-1 Minute - Shikieiki", m4access)
+            world.set_threshold_rule(m8shikieiki, "-1 Minute - Shikieiki", m4access)
+            world.set_threshold_rule(m9shikieiki, "-1 Minute - Shikieiki", m5access)
 
     def Example_Rule(state: CollectionState) -> bool:
         # Calculated rules take a CollectionState object and return a boolean
@@ -1116,16 +899,13 @@ def after_set_rules(world: World, multiworld: MultiWorld, player: int):
 def before_create_item(item_name: str, world: World, multiworld: MultiWorld, player: int) -> str:
 
     # Aya and Medicine's resource items are classified as "useful" if ayamedi_progression option is false
+    # Only for this player, the item table itself is shared by every player and generation
     ayamedi_progression = get_option_value(multiworld, player, "ayamedi_progression")
     item_from_table = world.item_name_to_item.get(item_name)
 
     if "AyaMedi" in set(item_from_table.get('category', [])):
         if not ayamedi_progression:
-            item_from_table['useful'] = True
-            
-            for removing_classification in ['progression', 'progression_skip_balancing']:
-                if removing_classification in item_from_table.keys():
-                    del item_from_table[removing_classification]
+            world.override_item_classification(item_name, useful=True, progression=None, progression_skip_balancing=None)
     return item_name
 
 # The item that was created is provided after creation, in case you want to modify the item
@@ -0,0 +1,191 @@
+"""Generation benchmark across the option matrix of this Manual world.
+
+Run it from an Archipelago source checkout, it doesn't need network access:
+    python -m worlds.manual_touhoupofv_uni.manual_benchmark --output benchmark.json
+Then compare the results of two commits with:
+    python -m worlds.manual_touhoupofv_uni.manual_benchmark --compare before.json after.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from worlds.AutoWorld import call_all
+
+from . import ManualWorld
+from .manual_test import ManualTest
+from .Meta import enable_generation_profiling
+from .Profiling import profile_stage, profile_hooks
+
+PROFILED_STAGES = ["create_regions", "create_items", "set_rules", "generate_basic", "pre_fill", "fill_slot_data", "generate_output"]
+ALL_CHARACTERS = 16 # random_enabled_characters uses 0 for "every enabled character"
+
+
+class ManualBenchmarkCase(ManualTest):
+    run_default_tests = False
+
+    # not a test_ method, so WorldTestBase.world_setup doesn't skip it and test runners don't collect it
+    def run_benchmark(self) -> None:
+        pass
+
+
+def option_matrix(character_counts: Iterable[int]) -> Iterator[dict[str, int]]:
+    for game_mode, character_items, characters, ayamedi_progression in itertools.product((0, 1), (1, 0), character_counts, (1, 0)):
+        for match_random_opponents in ((0, 1) if game_mode else (0,)):
+            yield {
+                "game_mode": game_mode,
+                "character_items": character_items,
+                "match_random_opponents": match_random_opponents,
+                "random_enabled_characters": 0 if characters >= ALL_CHARACTERS else characters,
+                "ayamedi_progression": ayamedi_progression,
+                # keep the goal reachable when only a few characters are in the pool
+                "endings_required": min(3, characters)
+            }
+
+def install_profiling() -> Callable[[], None]:
+    """Profiles every ManualWorld stage and hook, returns the function that puts the originals back."""
+    if enable_generation_profiling: # already profiled through meta.json
+        return lambda: None
+
+    original_stages = {stage: ManualWorld.__dict__[stage] for stage in PROFILED_STAGES}
+    for stage, method in original_stages.items():
+        setattr(ManualWorld, stage, profile_stage(stage, enabled=True)(method))
+
+    world_module = sys.modules[ManualWorld.__module__]
+    original_hooks = profile_hooks(vars(world_module), f"{world_module.__name__}.hooks.World", enabled=True)
+
+    def uninstall() -> None:
+        for stage, method in original_stages.items():
+            setattr(ManualWorld, stage, method)
+        vars(world_module).update(original_hooks)
+
+    return uninstall
+
+def _count_rule_calls(world: ManualWorld) -> int:
+    rule_calls = world.generation_profile["rule_calls"]
+    return sum(rule_calls["locations"].values()) + sum(rule_calls["regions"].values())
+
+def run_generation(options: dict[str, int], seed: int, fill: bool = True) -> dict[str, Any]:
+    """Generates the world once, install_profiling() has to be active."""
+    from Fill import distribute_items_restrictive
+
+    case = ManualBenchmarkCase("run_benchmark")
+    case.options = options
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter(), tracemalloc.get_traced_memory()[0]
+
+    case.world_setup(seed)
+    world: ManualWorld = case.world
+
+    if fill:
+        fill_start = time.perf_counter(), tracemalloc.get_traced_memory()[0], _count_rule_calls(world)
+        distribute_items_restrictive(case.multiworld)
+        call_all(case.multiworld, "post_fill")
+        world.generation_profile["stages"]["fill"] = {
+            "calls": 1,
+            "seconds": time.perf_counter() - fill_start[0],
+            "allocated_bytes": tracemalloc.get_traced_memory()[0] - fill_start[1],
+            "rule_calls": _count_rule_calls(world) - fill_start[2]
+        }
+
+    world.fill_slot_data()
+    with tempfile.TemporaryDirectory() as output_directory:
+        world.generate_output(output_directory)
+
+    seconds, peak_bytes = time.perf_counter() - start[0], tracemalloc.get_traced_memory()[1] - start[1]
+    if started_tracing:
+        tracemalloc.stop()
+
+    return {
+        "options": options,
+        "seed": seed,
+        "seconds": seconds,
+        "peak_bytes": peak_bytes,
+        "locations": len(case.multiworld.get_locations(world.player)),
+        "stages": world.generation_profile["stages"],
+        "rule_calls": {
+            "locations": sum(world.generation_profile["rule_calls"]["locations"].values()),
+            "regions": sum(world.generation_profile["rule_calls"]["regions"].values())
+        }
+    }
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(character_counts: Iterable[int], seeds: Iterable[int], fill: bool = True) -> dict[str, Any]:
+    uninstall_profiling = install_profiling()
+    runs = []
+    try:
+        for options in option_matrix(character_counts):
+            for seed in seeds:
+                run = run_generation(options, seed, fill)
+                runs.append(run)
+                print(f"{json.dumps(options)} seed {seed}: {run['seconds']:.3f}s, peak {run['peak_bytes'] / 1024 / 1024:.1f} MiB")
+    finally:
+        uninstall_profiling()
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs
+    }
+
+def _run_key(run: dict[str, Any]) -> str:
+    return json.dumps(run["options"], sort_keys=True) + f" seed {run['seed']}"
+
+def compare(before: dict[str, Any], after: dict[str, Any]) -> None:
+    before_runs = {_run_key(run): run for run in before["runs"]}
+    total_before = total_after = 0.0
+
+    for run in after["runs"]:
+        key = _run_key(run)
+        if key not in before_runs:
+            continue
+
+        previous = before_runs[key]
+        total_before += previous["seconds"]
+        total_after += run["seconds"]
+        print(f"{key}: {previous['seconds']:.3f}s -> {run['seconds']:.3f}s ({run['seconds'] / max(previous['seconds'], 1e-9):.2f}x), "
+              f"peak {previous['peak_bytes'] / 1024 / 1024:.1f} -> {run['peak_bytes'] / 1024 / 1024:.1f} MiB")
+
+    print(f"total: {total_before:.3f}s ({before.get('commit')}) -> {total_after:.3f}s ({after.get('commit')})")
+
+def main(args: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the generation of this Manual world across its option matrix.")
+    parser.add_argument("--output", default="manual_benchmark.json", help="where to write the json results")
+    parser.add_argument("--characters", default=",".join(str(count) for count in range(1, ALL_CHARACTERS + 1)),
+                        help="comma separated random_enabled_characters counts to run, from 1 to 16")
+    parser.add_argument("--seeds", type=int, default=1, help="how many seeds to run per option combination")
+    parser.add_argument("--no-fill", action="store_true", help="skip the item fill, only run the world's own stages")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files instead of running")
+    parsed = parser.parse_args(args)
+
+    if parsed.compare:
+        with open(parsed.compare[0], encoding="utf-8") as before, open(parsed.compare[1], encoding="utf-8") as after:
+            compare(json.load(before), json.load(after))
+        return
+
+    character_counts = [int(count) for count in parsed.characters.split(",")]
+    results = run_benchmark(character_counts, range(1, parsed.seeds + 1), not parsed.no_fill)
+
+    with open(parsed.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"Wrote {len(results['runs'])} runs to {parsed.output}")
+
+
+if __name__ == "__main__":
+    main()
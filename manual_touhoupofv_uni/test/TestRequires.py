@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from BaseClasses import CollectionState
+
+from ..manual_test import ManualTest
+from ..Rules import set_rules
+
+REIMU = "Character Unlock - Reimu"
+MARISA = "Character Unlock - Marisa"
+LIFE = "+1 Life - Reimu"
+
+# (requires, items collected, expected result), with every character enabled the pool has 14 characters and 7 of LIFE
+REQUIRES_CASES = [
+    (f"|{REIMU}|", {}, False),
+    (f"|{REIMU}|", {REIMU: 1}, True),
+    (f"|{LIFE}:3|", {LIFE: 2}, False),
+    (f"|{LIFE}:3|", {LIFE: 3}, True),
+    (f"|{LIFE}:50%|", {LIFE: 3}, False),
+    (f"|{LIFE}:50%|", {LIFE: 4}, True),
+    (f"|{LIFE}:half|", {LIFE: 3}, True),
+    (f"|{LIFE}:all|", {LIFE: 6}, False),
+    (f"|{LIFE}:all|", {LIFE: 7}, True),
+    ("|@Characters:2|", {REIMU: 1}, False),
+    ("|@Characters:2|", {REIMU: 1, MARISA: 1}, True),
+    ("|@Characters:50%|", {REIMU: 1, MARISA: 1}, False),
+    ("|@Characters|", {MARISA: 1}, True),
+    # a category without any item can never be fulfilled, even for a count of 0
+    ("|@No Such Category:0|", {REIMU: 1}, False),
+    (f"|{REIMU}| and |{MARISA}|", {REIMU: 1}, False),
+    (f"|{REIMU}| or |{MARISA}|", {MARISA: 1}, True),
+    (f"(|{REIMU}| and |{MARISA}|) or |{LIFE}:2|", {REIMU: 1, LIFE: 1}, False),
+    (f"(|{REIMU}| and |{MARISA}|) or |{LIFE}:2|", {REIMU: 1, LIFE: 2}, True),
+    (f"|{REIMU}| and (|{MARISA}| or (|{LIFE}:2| and |@Characters:1|))", {REIMU: 1, LIFE: 2}, True),
+    (f"|{REIMU}| AND (|{MARISA}| OR |{LIFE}:2|)", {MARISA: 1, LIFE: 2}, False),
+    (f"{{YamlEnabled(character_items)}} and |{REIMU}|", {REIMU: 1}, True),
+    (f"{{YamlDisabled(character_items)}} or |{REIMU}|", {}, False),
+    (f"{{YamlDisabled(character_items)}} or |{REIMU}|", {REIMU: 1}, True),
+    ("{ItemValue(Nothing:0)} and |@Characters:1|", {MARISA: 1}, True),
+]
+
+# requires that can't be compiled, with the exception they raise
+MALFORMED_REQUIRES = [
+    ("|@Characters:lots|", ValueError),
+    (f"|{LIFE}:some|", ValueError),
+    (f"|{REIMU}|) or (|{MARISA}|", KeyError),
+    (f"|{REIMU}| and", KeyError),
+    ("{NoSuchFunction()}", ValueError),
+]
+
+
+class TestRequires(ManualTest):
+    run_default_tests = False
+    options = {"random_enabled_characters": 0}
+
+    def compile_requires(self, requires: str):
+        """Runs set_rules for a single location with these requires and returns its access rule"""
+        world = self.multiworld.worlds[self.player]
+        location = self.multiworld.get_location("[Reimu] Stage 1", self.player)
+        with patch.object(world, "location_table", [{"name": location.name, "requires": requires}]):
+            set_rules(world, self.multiworld, self.player)
+        return location.access_rule
+
+    def get_state(self, items: dict[str, int]) -> CollectionState:
+        world = self.multiworld.worlds[self.player]
+        state = CollectionState(self.multiworld)
+        for name, count in items.items():
+            for _ in range(count):
+                world.collect(state, world.create_item(name))
+        return state
+
+    def test_requires_strings(self) -> None:
+        for requires, items, expected in REQUIRES_CASES:
+            with self.subTest(requires=requires, items=items):
+                self.assertEqual(self.compile_requires(requires)(self.get_state(items)), expected)
+
+    def test_malformed_requires_raise(self) -> None:
+        for requires, exception in MALFORMED_REQUIRES:
+            with self.subTest(requires=requires):
+                with self.assertRaises(exception):
+                    self.compile_requires(requires)
@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from ..hooks.World import STORY_OPPONENTS, STORY_OPPONENT_CANDIDATES, STORY_STAGES, compile_story_opponents, get_story_matchups
+
+# get_story_matchups of every character for the shuffles of random.Random(seed), as the old nested match block picked them,
+# so that a table edit changing the matchups of existing seeds doesn't go unnoticed
+GOLDEN_MATCHUPS = {
+    1: {
+        "Reimu": ["Cirno", "Lyrica", "Tewi", "Reisen", "Sakuya", "Marisa", "Aya", "Komachi", "Shikieiki"],
+        "Marisa": ["Cirno", "Mystia", "Youmu", "Tewi", "Sakuya", "Reimu", "Aya", "Komachi", "Shikieiki"],
+        "Sakuya": ["Cirno", "Mystia", "Reisen", "Marisa", "Youmu", "Tewi", "Medicine", "Komachi", "Shikieiki"],
+        "Youmu": ["Mystia", "Cirno", "Marisa", "Lyrica", "Reimu", "Sakuya", "Aya", "Komachi", "Shikieiki"],
+        "Reisen": ["Cirno", "Mystia", "Lyrica", "Marisa", "Reimu", "Sakuya", "Medicine", "Komachi", "Shikieiki"],
+        "Cirno": ["Mystia", "Lyrica", "Marisa", "Youmu", "Reimu", "Reisen", "Aya", "Yuuka", "Shikieiki"],
+        "Lyrica": ["Cirno", "Tewi", "Mystia", "Marisa", "Sakuya", "Youmu", "Aya", "Yuuka", "Shikieiki"],
+        "Merlin": ["Cirno", "Tewi", "Reisen", "Sakuya", "Marisa", "Youmu", "Aya", "Yuuka", "Shikieiki"],
+        "Lunasa": ["Cirno", "Tewi", "Reisen", "Marisa", "Sakuya", "Youmu", "Aya", "Yuuka", "Shikieiki"],
+        "Mystia": ["Cirno", "Lyrica", "Reisen", "Tewi", "Marisa", "Reimu", "Medicine", "Yuuka", "Shikieiki"],
+        "Tewi": ["Mystia", "Cirno", "Lyrica", "Marisa", "Youmu", "Reisen", "Medicine", "Komachi", "Shikieiki"],
+        "Aya": ["Mystia", "Lyrica", "Reimu", "Youmu", "Tewi", "Marisa", "Medicine", "Komachi", "Shikieiki"],
+        "Medicine": ["Lyrica", "Mystia", "Tewi", "Reimu", "Marisa", "Sakuya", "Yuuka", "Komachi", "Shikieiki"],
+        "Yuuka": ["Mystia", "Cirno", "Marisa", "Youmu", "Sakuya", "Reimu", "Aya", "Komachi", "Shikieiki"],
+        "Komachi": ["Cirno", "Reisen", "Sakuya", "Youmu", "Tewi", "Marisa", "Yuuka", "Reimu", "Shikieiki"],
+        "Shikieiki": ["Cirno", "Lyrica", "Youmu", "Tewi", "Sakuya", "Marisa", "Aya", "Komachi", "Reimu"],
+    },
+    2: {
+        "Reimu": ["Mystia", "Lyrica", "Tewi", "Reisen", "Youmu", "Sakuya", "Aya", "Komachi", "Shikieiki"],
+        "Marisa": ["Mystia", "Lyrica", "Youmu", "Tewi", "Sakuya", "Reimu", "Aya", "Komachi", "Shikieiki"],
+        "Sakuya": ["Mystia", "Lyrica", "Reisen", "Marisa", "Reimu", "Tewi", "Medicine", "Komachi", "Shikieiki"],
+        "Youmu": ["Cirno", "Lyrica", "Reimu", "Marisa", "Reisen", "Sakuya", "Aya", "Komachi", "Shikieiki"],
+        "Reisen": ["Mystia", "Lyrica", "Tewi", "Reimu", "Youmu", "Sakuya", "Medicine", "Komachi", "Shikieiki"],
+        "Cirno": ["Mystia", "Lyrica", "Marisa", "Reimu", "Youmu", "Reisen", "Aya", "Yuuka", "Shikieiki"],
+        "Lyrica": ["Cirno", "Mystia", "Reisen", "Tewi", "Marisa", "Youmu", "Aya", "Yuuka", "Shikieiki"],
+        "Merlin": ["Cirno", "Mystia", "Tewi", "Marisa", "Reimu", "Youmu", "Aya", "Yuuka", "Shikieiki"],
+        "Lunasa": ["Cirno", "Mystia", "Reisen", "Sakuya", "Marisa", "Youmu", "Aya", "Yuuka", "Shikieiki"],
+        "Mystia": ["Cirno", "Tewi", "Reisen", "Youmu", "Marisa", "Reimu", "Medicine", "Yuuka", "Shikieiki"],
+        "Tewi": ["Cirno", "Mystia", "Sakuya", "Marisa", "Youmu", "Reisen", "Medicine", "Komachi", "Shikieiki"],
+        "Aya": ["Cirno", "Lyrica", "Reimu", "Tewi", "Youmu", "Marisa", "Medicine", "Komachi", "Shikieiki"],
+        "Medicine": ["Mystia", "Lyrica", "Tewi", "Marisa", "Reisen", "Sakuya", "Yuuka", "Komachi", "Shikieiki"],
+        "Yuuka": ["Cirno", "Lyrica", "Sakuya", "Tewi", "Reisen", "Reimu", "Aya", "Komachi", "Shikieiki"],
+        "Komachi": ["Cirno", "Reisen", "Sakuya", "Youmu", "Tewi", "Marisa", "Yuuka", "Reimu", "Shikieiki"],
+        "Shikieiki": ["Cirno", "Mystia", "Lyrica", "Reisen", "Youmu", "Marisa", "Aya", "Komachi", "Reimu"],
+    },
+}
+
+
+class TestStoryOpponents(unittest.TestCase):
+    def test_candidates_are_other_characters(self) -> None:
+        for p1, candidates in STORY_OPPONENT_CANDIDATES.items():
+            with self.subTest(p1):
+                self.assertEqual(len(candidates), len(STORY_STAGES))
+                for stage_candidates in candidates:
+                    self.assertNotIn(p1, stage_candidates)
+                    self.assertTrue(set(stage_candidates) <= STORY_OPPONENTS.keys())
+
+    def test_missing_stage_is_rejected(self) -> None:
+        stages = dict(STORY_OPPONENTS["Reimu"])
+        del stages[9]
+        with self.assertRaises(ValueError):
+            compile_story_opponents({"Reimu": stages})
+
+    def test_matchups_only_pick_allowed_opponents(self) -> None:
+        characters = list(STORY_OPPONENTS)
+        rng = random.Random(0)
+        for _ in range(200):
+            for p1 in characters:
+                opponent_order = characters.copy()
+                rng.shuffle(opponent_order)
+                matchups = get_story_matchups(p1, opponent_order)
+
+                self.assertEqual(len(matchups), len(STORY_STAGES))
+                self.assertEqual(len(set(matchups)), len(matchups))
+                self.assertNotIn(p1, matchups)
+                for opponent, candidates in zip(matchups, STORY_OPPONENT_CANDIDATES[p1]):
+                    self.assertIn(opponent, candidates)
+
+    def test_matchups_of_existing_seeds(self) -> None:
+        characters = list(STORY_OPPONENTS)
+        for seed, expected in GOLDEN_MATCHUPS.items():
+            rng = random.Random(seed)
+            for p1 in characters:
+                opponent_order = characters.copy()
+                rng.shuffle(opponent_order)
+                with self.subTest(seed=seed, p1=p1):
+                    self.assertEqual(get_story_matchups(p1, opponent_order), expected[p1])